@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import the_listener  # noqa: E402
+
+
+@pytest.fixture
+def game():
+    the_listener.Colors.configure('mono')
+    game = the_listener.Game()
+    game.fast_mode = True
+    game.clock = the_listener.InstantClock()
+    return game
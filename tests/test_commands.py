@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize('hours', ['nan', 'inf', '-inf', '0', '-2'])
+def test_wait_rejects_non_finite_and_non_positive_hours(game, capsys, hours):
+    before = game.game_time
+    game.process_command(f'wait {hours}')
+    assert game.game_time == before
+    assert 'positive number of hours' in capsys.readouterr().out
+
+
+def test_wait_caps_duration(game, capsys):
+    before = game.game_time
+    game.process_command(f'wait {game.MAX_WAIT_HOURS + 1}')
+    assert game.game_time == before
+    assert 'at most' in capsys.readouterr().out
+
+
+def test_wait_advances_clock(game):
+    before = game.game_time
+    game.process_command('wait 2')
+    assert game.game_time == before + 120
+    assert game.day == 1
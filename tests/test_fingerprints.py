@@ -0,0 +1,43 @@
+from the_listener import SignalFingerprints
+
+
+def select_signal(game):
+    signal = game.generate_signal(1500.0, 80, 20)
+    game.scanned_signals = [signal]
+    game.current_signal = signal
+    game.rewind.record(game.capture_state())
+    return signal
+
+
+def test_resubmission_pays_less(game):
+    signal = select_signal(game)
+    game.process_command('decode')
+    game.process_command('submit')
+    first = game.player.credits
+    game.scanned_signals = [signal]
+    game.current_signal = signal
+    game.process_command('submit')
+    assert game.player.credits - first < signal.value
+
+
+def test_rewound_submission_pays_in_full_again(game):
+    select_signal(game)
+    game.process_command('decode')
+    game.process_command('submit')
+    paid = game.player.credits
+    game.process_command('rewind')
+    assert game.player.credits < paid
+    game.process_command('submit')
+    assert game.player.credits == paid
+
+
+def test_flushed_submissions_reach_the_bloom_filter():
+    fingerprints = SignalFingerprints()
+    fingerprint = bytes(range(16))
+    fingerprints.add(fingerprint)
+    assert fingerprints.seen(fingerprint) == 'recent'
+    fingerprints.truncate(0)
+    assert fingerprints.seen(fingerprint) is None
+    fingerprints.add(fingerprint)
+    fingerprints.flush()
+    assert fingerprints.seen(fingerprint) == 'probable'
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from the_listener import Game, TransmissionModel
+
+
+@pytest.fixture(scope='module')
+def model():
+    return TransmissionModel.compile({ctype: list(lines) for ctype, lines in Game.TRANSMISSIONS.items()})
+
+
+@pytest.mark.parametrize('ctype', sorted(Game.TRANSMISSIONS))
+def test_transmissions_are_varied_and_never_copy_a_corpus_line(model, ctype):
+    sources = {' '.join(line.split()) for line in Game.TRANSMISSIONS[ctype]}
+    outputs = [model.generate(ctype, random.Random(seed)) for seed in range(1000)]
+    assert not sources.intersection(outputs)
+    assert len(set(outputs)) >= 400
+
+
+@pytest.mark.parametrize('ctype', sorted(Game.TRANSMISSIONS))
+def test_transmissions_end_on_a_whole_sentence(model, ctype):
+    endings = {line.split()[-1] for line in Game.TRANSMISSIONS[ctype]}
+    for seed in range(200):
+        words = model.generate(ctype, random.Random(seed)).split()
+        assert words[-1] in endings or TransmissionModel.SENTENCE_END.search(words[-1])
+
+
+def test_same_seed_same_transmission_after_a_cache_round_trip(model):
+    reloaded = TransmissionModel.from_dict(model.to_dict())
+    for seed in range(50):
+        assert model.generate('voice', random.Random(seed)) == reloaded.generate('voice', random.Random(seed))
@@ -2,15 +2,45 @@
 """
 The Listener - A cosmic horror survival game
 """
+import time
+_STARTUP_MARKS = [("start", time.perf_counter())]
+
 import os
+import re
+import math
+import cmath
+import heapq
+import itertools
 import sys
 import random
-import time
-import shutil
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass, field, fields
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from enum import Enum
 
+_STARTUP_MARKS.append(("stdlib imports", time.perf_counter()))
+
+# Time to first prompt we aim for, measured from the first line of this module
+STARTUP_BUDGET_MS = 30.0
+
+def startup_mark(label: str):
+    """Record a named checkpoint on the way to the first prompt"""
+    _STARTUP_MARKS.append((label, time.perf_counter()))
+
+def startup_report() -> str:
+    """Format the recorded checkpoints as a timing breakdown"""
+    lines = ["Startup profile (ms, from module start):"]
+    for (_, previous), (label, stamp) in zip(_STARTUP_MARKS, _STARTUP_MARKS[1:]):
+        lines.append(f"  {label:<22}{(stamp - previous) * 1000:8.2f}")
+    total = (_STARTUP_MARKS[-1][1] - _STARTUP_MARKS[0][1]) * 1000
+    verdict = "within" if total <= STARTUP_BUDGET_MS else "OVER"
+    lines.append(f"  {'total':<22}{total:8.2f}  ({verdict} {STARTUP_BUDGET_MS:.0f} ms budget)")
+    return "\n".join(lines)
+
 class Colors:
     RED = '\033[91m'
     GREEN = '\033[92m'
@@ -26,6 +56,47 @@ class Colors:
     BLINK = '\033[5m'
     INVERT = '\033[7m'
     END = '\033[0m'
+    # Every code above, kept so mono mode can blank them and other modes restore them
+    CODES = {name: code for name, code in locals().items() if name.isupper()}
+    MODE = '16'
+    
+    @classmethod
+    def detect(cls, stream=None, environ=None) -> str:
+        """Best output mode for a stream: 'truecolor', '16' or 'mono'"""
+        stream = stream or sys.stdout
+        environ = os.environ if environ is None else environ
+        if environ.get('NO_COLOR'):
+            return 'mono'
+        isatty = getattr(stream, 'isatty', None)
+        if not (isatty and isatty()):
+            return 'mono'
+        term = environ.get('TERM', '')
+        if term in ('', 'dumb'):
+            return 'mono'
+        if environ.get('COLORTERM', '').lower() in ('truecolor', '24bit') or term.endswith('-direct'):
+            return 'truecolor'
+        return '16'
+
+    @classmethod
+    def configure(cls, mode: str):
+        """Switch every code at once; mono turns them all into empty strings"""
+        cls.MODE = mode
+        for name, code in cls.CODES.items():
+            setattr(cls, name, '' if mode == 'mono' else code)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def rgb(red: int, green: int, blue: int) -> str:
+        """24-bit foreground code, quantized to 32 levels per channel so nearby shades share a code"""
+        red, green, blue = (min(255, (channel + 4) & ~7) for channel in (red, green, blue))
+        return f'\033[38;2;{red};{green};{blue}m'
+
+    @staticmethod
+    def shade(base: str, color: Tuple[int, int, int], level: float) -> str:
+        """Color lit to a level from 0 to 1 in truecolor mode; the plain base color otherwise"""
+        if Colors.MODE != 'truecolor':
+            return base
+        return Colors.rgb(*(int(channel * level) for channel in color))
     
     @staticmethod
     def glitch():
@@ -42,6 +113,150 @@ class Colors:
         else:
             return Colors.RED
 
+    @staticmethod
+    def content(content_type: str) -> str:
+        """Color for decoded content of a given type"""
+        colors = {
+            "data_stream": Colors.CYAN,
+            "voice": Colors.YELLOW,
+            "coordinates": Colors.GREEN,
+            "blueprint": Colors.BLUE,
+            "warning": Colors.RED + Colors.BOLD,
+            "unknown": Colors.MAGENTA + Colors.BOLD
+        }
+        return colors.get(content_type, Colors.WHITE)
+
+class TextLayout:
+    """Display-width aware text layout that ignores SGR color codes"""
+    SGR_PATTERN = re.compile(r'\033\[[0-9;]*m')
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def char_width(char: str) -> int:
+        """Return the number of terminal columns a single character occupies"""
+        if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf', 'Cc'):
+            return 0
+        if unicodedata.east_asian_width(char) in ('W', 'F'):
+            return 2
+        return 1
+    
+    @staticmethod
+    def strip(text: str) -> str:
+        """Remove SGR escape sequences from text"""
+        if '\033' not in text:
+            return text
+        return TextLayout.SGR_PATTERN.sub('', text)
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def width(text: str) -> int:
+        """Return the display width of text, memoized per string"""
+        plain = TextLayout.strip(text)
+        if plain.isascii() and plain.isprintable():
+            return len(plain)
+        char_width = TextLayout.char_width
+        return sum(char_width(char) for char in plain)
+    
+    @staticmethod
+    def split_width(text: str, width: int) -> List[str]:
+        """Hard-break text into pieces no wider than width, keeping marks with their base"""
+        pieces = []
+        current = []
+        current_width = 0
+        pos = 0
+        while pos < len(text):
+            match = TextLayout.SGR_PATTERN.match(text, pos)
+            if match:
+                current.append(match.group())
+                pos = match.end()
+                continue
+            char = text[pos]
+            char_width = TextLayout.char_width(char)
+            if char_width and current_width + char_width > width and current_width:
+                pieces.append(''.join(current))
+                current = []
+                current_width = 0
+            current.append(char)
+            current_width += char_width
+            pos += 1
+        if current:
+            pieces.append(''.join(current))
+        return pieces
+    
+    @staticmethod
+    def carry_styles(lines: List[str]) -> List[str]:
+        """Close open styles at each line end and reopen them on the next line"""
+        result = []
+        active: List[str] = []
+        for line in lines:
+            prefix = ''.join(active)
+            for code in TextLayout.SGR_PATTERN.findall(line):
+                if code in (Colors.CODES['END'], '\033[m'):
+                    active = []
+                else:
+                    active.append(code)
+            suffix = Colors.END if active else ''
+            result.append(prefix + line + suffix)
+        return result
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def wrap(text: str, width: int) -> Tuple[str, ...]:
+        """Word-wrap text to a display width, preserving paragraphs and styles"""
+        lines = []
+        for paragraph in text.split('\n'):
+            words = paragraph.split()
+            if not words:
+                lines.append('')
+                continue
+            current = ''
+            current_width = 0
+            for word in words:
+                word_width = TextLayout.width(word)
+                if word_width > width:
+                    pieces = TextLayout.split_width(word, width)
+                    word = pieces.pop()
+                    word_width = TextLayout.width(word)
+                    for piece in pieces:
+                        if current:
+                            lines.append(current)
+                        current = ''
+                        current_width = 0
+                        lines.append(piece)
+                if not current:
+                    current = word
+                    current_width = word_width
+                elif current_width + 1 + word_width <= width:
+                    current += ' ' + word
+                    current_width += 1 + word_width
+                else:
+                    lines.append(current)
+                    current = word
+                    current_width = word_width
+            if current:
+                lines.append(current)
+        return tuple(TextLayout.carry_styles(lines))
+    
+    @staticmethod
+    def pad(text: str, width: int) -> str:
+        """Left-align text in a field of the given display width"""
+        return text + ' ' * max(0, width - TextLayout.width(text))
+    
+    @staticmethod
+    def center(text: str, width: int) -> str:
+        """Center text in a field of the given display width"""
+        spare = max(0, width - TextLayout.width(text))
+        left = spare // 2
+        return ' ' * left + text + ' ' * (spare - left)
+    
+    @staticmethod
+    def truncate(text: str, width: int) -> str:
+        """Cut text down to at most the given display width"""
+        if TextLayout.width(text) <= width:
+            return text
+        pieces = TextLayout.split_width(text, width)
+        return pieces[0] + Colors.END if pieces else ''
+
 class Direction(Enum):
     NORTH = 0
     EAST = 1
@@ -60,9 +275,28 @@ class Signal:
     content_type: str
     decoded_content: str
     value: int
+    seed: int = 0
+    effective_noise: Optional[int] = None
+    source: Optional['WavSegment'] = None
+    decoded: bool = False
+    lines_read: int = 0
+
+    @property
+    def working_noise(self) -> int:
+        """Noise level after the operator's filtering, if any was measured"""
+        return self.noise_level if self.effective_noise is None else self.effective_noise
+
+class Observable:
+    """Mixin for state dataclasses: any field change bumps a version counter"""
+    version = 0
+    
+    def __setattr__(self, name: str, value: Any):
+        if self.__dict__.get(name, Observable) != value:
+            self.__dict__['version'] = self.version + 1
+        self.__dict__[name] = value
 
 @dataclass
-class Player:
+class Player(Observable):
     x: int
     y: int
     direction: Direction
@@ -71,9 +305,9 @@ class Player:
     current_mode: GameMode
 
 @dataclass
-class Resources:
-    power: int
-    oxygen: int
+class Resources(Observable):
+    power: float
+    oxygen: float
     water_filters: int
     food_cartridges: int
     repair_parts: int
@@ -122,319 +356,3111 @@ class Station:
         tile = self.get_tile(x, y)
         return tile in [0, 2, 3, 4, 5]
 
-class Game:
-    def __init__(self):
-        self.player = Player(x=2, y=2, direction=Direction.NORTH, 
-                           credits=100, sanity=100, current_mode=GameMode.TERMINAL)
-        self.resources = Resources(power=100, oxygen=100, water_filters=10,
-                                  food_cartridges=10, repair_parts=5)
-        self.station = Station()
-        self.current_signal: Optional[Signal] = None
-        self.scanned_signals: List[Signal] = []
-        self.day = 1
-        self.running = True
-        self.discovered_signals = 0
-        self.glitch_chars = ['░', '▒', '▓', '█', '▄', '▀', '■', '□', '▪', '▫', '§', '¶', '†', '‡', '∴', '∵', '◊', '○', '●', '◘', '◙']
-        self.corruption_chars = ['§', 'µ', '¿', '¶', '†', '‡', '∞', '≈', '∴', '∵', '◊']
-        self.zalgo_marks = ['̃', '̀', '́', '̂', '̄', '̆', '̇', '̈', '̊', '̋', '̌', '̐', '̒']
-        self.light_flicker_frame = 0
-        self.terminal_history = []
-        self.max_history = 100
-        
-    def clear_screen(self):
-        """Clear screen - now just used for special effects"""
-        os.system('clear' if os.name != 'nt' else 'cls')
+@dataclass(eq=False)
+class LightSource:
+    x: int
+    y: int
+    radius: int
+    intensity: float
+    electric: bool = True
+    failing: bool = False
+    on: bool = True
+    # What this source currently adds to each tile in its footprint
+    output: float = 0.0
+    footprint: List[Tuple[int, float]] = field(default_factory=list)
+
+class LightMap:
+    """Per-tile light levels from station fixtures, updated only where a source changes"""
+    AMBIENT = 0.2
+    POWER_STEPS = 10
+    # tile: (radius, intensity, runs on station power)
+    FIXTURES = {
+        3: (3, 0.5, True),   # Terminal glow
+        4: (4, 0.8, False),  # Generator
+    }
+    CEILING_SPACING = 4
+    CEILING_LIGHT = (3, 0.5)
+    FAILING_CHANCE = 0.35
     
-    def get_terminal_size(self):
-        """Get terminal dimensions"""
-        size = shutil.get_terminal_size((80, 24))
-        return size.columns, size.lines
+    def __init__(self, station: Station, rng: random.Random):
+        self.station = station
+        self.width = len(station.layout[0])
+        self.height = len(station.layout)
+        self.levels = array('f', [self.AMBIENT]) * (self.width * self.height)
+        self.power_factor = 1.0
+        self.sources: List[LightSource] = []
+        half = self.CEILING_SPACING // 2
+        for y, row in enumerate(station.layout):
+            for x, tile in enumerate(row):
+                if tile in self.FIXTURES:
+                    radius, intensity, electric = self.FIXTURES[tile]
+                    self.sources.append(LightSource(x, y, radius, intensity, electric))
+                elif tile == 0 and x % self.CEILING_SPACING == half and y % self.CEILING_SPACING == half:
+                    radius, intensity = self.CEILING_LIGHT
+                    self.sources.append(LightSource(x, y, radius, intensity,
+                                                    failing=rng.random() < self.FAILING_CHANCE))
+        for source in self.sources:
+            source.footprint = self.footprint(source)
+            self.set_output(source, self.target(source))
 
-    def print_separator(self, char="═"):
-        cols, _ = self.get_terminal_size()
-        width = min(cols, 100)
-        print(Colors.GRAY + char * width + Colors.END)
+    def footprint(self, source: LightSource) -> List[Tuple[int, float]]:
+        """(tile index, weight) for every tile the source can see; walls are lit but cast shadows"""
+        tiles = []
+        for y in range(max(0, source.y - source.radius), min(self.height, source.y + source.radius + 1)):
+            for x in range(max(0, source.x - source.radius), min(self.width, source.x + source.radius + 1)):
+                distance = math.hypot(x - source.x, y - source.y)
+                if distance <= source.radius and self.visible(source.x, source.y, x, y):
+                    tiles.append((y * self.width + x, 1 - distance / (source.radius + 1)))
+        return tiles
 
-    def print_box_header(self, text: str):
-        cols, _ = self.get_terminal_size()
-        width = min(cols - 4, 96)
-        padding = (width - len(text)) // 2
-        print(Colors.CYAN + "╔" + "═" * width + "╗" + Colors.END)
-        print(Colors.CYAN + "║" + " " * padding + Colors.BOLD + text + Colors.END + Colors.CYAN + " " * (width - padding - len(text)) + "║" + Colors.END)
-        print(Colors.CYAN + "╚" + "═" * width + "╝" + Colors.END)
+    def visible(self, x0: int, y0: int, x1: int, y1: int) -> bool:
+        """Bresenham line with no wall strictly between the two tiles"""
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        step_x, step_y = (1 if x1 > x0 else -1), (1 if y1 > y0 else -1)
+        error = dx + dy
+        x, y = x0, y0
+        while (x, y) != (x1, y1):
+            twice = 2 * error
+            if twice >= dy:
+                error += dy
+                x += step_x
+            if twice <= dx:
+                error += dx
+                y += step_y
+            if (x, y) != (x1, y1) and self.station.get_tile(x, y) == 1:
+                return False
+        return True
 
-    def glitch_text(self, text: str) -> str:
-        """Apply glitch effects to text based on sanity"""
-        if self.player.sanity >= 70:
-            return text
-        
-        glitch_chance = (100 - self.player.sanity) / 200
-        result = []
-        
-        for char in text:
-            if random.random() < glitch_chance:
-                result.append(Colors.glitch() + random.choice(self.glitch_chars) + Colors.END)
-            else:
-                result.append(char)
-        
-        return ''.join(result)
+    def target(self, source: LightSource) -> float:
+        if not source.on:
+            return 0.0
+        return source.intensity * (self.power_factor if source.electric else 1.0)
 
-    def screen_flicker(self):
-        """Cause a brief visual glitch"""
-        if self.player.sanity < 40 and random.random() < 0.15:
-            self.clear_screen()
-            glitch_messages = [
-                "T̷H̴E̸Y̵ ̴A̶R̴E̷ ̸W̶A̶T̷C̸H̷I̶N̵G̴",
-                "░▒▓█ SIGNAL CORRUPTED █▓▒░",
-                "DO NOT TRUST THE CONSOLE",
-                "YOU ARE NOT ALONE",
-                "◊◊◊ LISTENING... LISTENING... ◊◊◊",
-                "ERROR: REALITY.SYS NOT FOUND"
-            ]
-            print("\n" * 10)
-            print(Colors.RED + Colors.BLINK + Colors.BOLD + random.choice(glitch_messages).center(70) + Colors.END)
-            print("\a")  # Bell sound
-            time.sleep(0.3)
-            self.clear_screen()
+    def set_output(self, source: LightSource, output: float):
+        """Apply the change in a source's output to its footprint only"""
+        delta = output - source.output
+        if not delta:
+            return
+        levels = self.levels
+        for index, weight in source.footprint:
+            levels[index] += delta * weight
+        source.output = output
 
-    def print_status(self):
-        # Check for screen flicker before drawing UI
-        self.screen_flicker()
-        
-        sanity_col = Colors.sanity_color(self.player.sanity)
-        power_col = Colors.sanity_color(self.resources.power)
-        o2_col = Colors.sanity_color(self.resources.oxygen)
-        
-        status_line = f"{Colors.BLUE}Day{Colors.END} {Colors.YELLOW}{self.day}{Colors.END} │ "
-        status_line += f"{Colors.BLUE}Credits{Colors.END} {Colors.YELLOW}{self.credits}{Colors.END} │ "
-        status_line += f"{Colors.BLUE}Sanity{Colors.END} {sanity_col}{self.player.sanity}%{Colors.END} │ "
-        status_line += f"{Colors.BLUE}Mode{Colors.END} {Colors.CYAN}{self.player.current_mode.value}{Colors.END}"
-        
-        resource_line = f"{Colors.BLUE}Power{Colors.END} {power_col}{self.resources.power}%{Colors.END} │ "
-        resource_line += f"{Colors.BLUE}O2{Colors.END} {o2_col}{self.resources.oxygen}%{Colors.END} │ "
-        resource_line += f"{Colors.BLUE}Supplies{Colors.END} {Colors.WHITE}W:{self.resources.water_filters} F:{self.resources.food_cartridges} R:{self.resources.repair_parts}{Colors.END}"
-        
-        print(self.glitch_text(status_line))
-        print(self.glitch_text(resource_line))
-        self.print_separator()
+    def level(self, x: int, y: int) -> float:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return min(1.0, self.levels[y * self.width + x])
+        return 0.0
 
-    @property
-    def credits(self):
-        return self.player.credits
+    def set_power(self, percent: float):
+        """Dim electric lights in steps as station power drains"""
+        factor = math.ceil(max(0.0, percent) / 100 * self.POWER_STEPS) / self.POWER_STEPS
+        if factor == self.power_factor:
+            return
+        self.power_factor = factor
+        for source in self.sources:
+            if source.electric:
+                self.set_output(source, self.target(source))
 
-    def generate_signal(self) -> Signal:
-        frequencies = [1420.4, 2800.0, 3300.5, 4500.2, 5200.8, 6100.3]
-        content_types = ["data_stream", "voice", "coordinates", "blueprint", "warning", "unknown"]
-        
-        freq = random.choice(frequencies)
-        strength = random.randint(20, 100)
-        noise = random.randint(10, 80)
-        ctype = random.choice(content_types)
-        
-        contents = {
-            "data_stream": self.generate_data_content(),
-            "voice": self.generate_voice_content(),
-            "coordinates": self.generate_coords_content(),
-            "blueprint": self.generate_blueprint_content(),
-            "warning": self.generate_warning_content(),
-            "unknown": self.generate_unknown_content()
-        }
-        
-        value = max(10, strength - noise // 2)
-        
-        return Signal(freq, strength, noise, ctype, contents[ctype], value)
+    def flicker(self, chance: float, rng: random.Random) -> List[LightSource]:
+        """Toggle failing lights at random and return the ones that just went out"""
+        went_out = []
+        for source in self.sources:
+            if source.failing and rng.random() < chance:
+                source.on = not source.on
+                self.set_output(source, self.target(source))
+                if not source.on:
+                    went_out.append(source)
+        return went_out
 
-    def generate_data_content(self) -> str:
-        data = [
-            "Binary sequence detected: 01001000 01000101 01001100 01010000",
-            "Telemetry data from Sector 7-G. All systems nominal. Wait... additional data appended.",
-            "Scientific log entry #4782: The readings are impossible. We shouldn't be seeing this.",
-            "Astronomical data corrupted. Stars in wrong positions. Constellations altered."
-        ]
-        return random.choice(data)
+@dataclass(eq=False, slots=True)
+class Entity:
+    kind: str
+    x: int
+    y: int
+    mobility: float = 0.0
+    cell: Tuple[int, int] = (0, 0)
 
-    def generate_voice_content(self) -> str:
-        voices = [
-            "[Static]... can you hear... [static]... they're coming... [signal lost]",
-            "Help us. We've been here so long. Don't let them find you.",
-            "Hello? Is anyone there? I'm trapped in... [interference]... observatory...",
-            "You shouldn't be listening. STOP. Turn it off. Turn it ALL off.",
-            "The void speaks to those who listen. Will you answer?",
-            "[Breathing sounds] ...behind you... [laughter] ...always watching..."
-        ]
-        return random.choice(voices)
+class SpatialHash:
+    """Uniform grid of buckets over station coordinates for constant-time proximity queries"""
+    def __init__(self, cell_size: int = 4):
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[int, int], set] = {}
 
-    def generate_coords_content(self) -> str:
-        coords = [
-            "Coordinates: 23h 17m 12s, -45° 32' 18\". Location: Unknown Deep Space.",
-            "Star chart detected. WARNING: Constellations do not match any known patterns.",
-            "Navigation data: Destination coordinates lead to empty space. Or do they?",
-            "Orbital mechanics data. Calculating trajectory... Impact in [REDACTED] days."
-        ]
-        return random.choice(coords)
+    def key(self, x: int, y: int) -> Tuple[int, int]:
+        return (x // self.cell_size, y // self.cell_size)
 
-    def generate_blueprint_content(self) -> str:
-        blueprints = [
-            "Schematic decoded: Unknown device. Purpose unclear. Materials: Available on station.",
-            "Construction plans for... something. The design hurts to look at.",
-            "Blueprint fragments: Assembly instructions in unknown language.",
-            "Technical diagram: Device components already in your storage room."
-        ]
-        return random.choice(blueprints)
+    def insert(self, entity: Entity):
+        entity.cell = self.key(entity.x, entity.y)
+        self.buckets.setdefault(entity.cell, set()).add(entity)
 
-    def generate_warning_content(self) -> str:
-        warnings = [
-            "ALERT: Containment breach detected at facility [COORDINATES DELETED]",
-            "EVACUATION NOTICE: All personnel must leave immediately. This is not a drill.",
-            "WARNING: Do not trust the signals. Do not trust the voices. Do not trust yourself.",
-            "EMERGENCY BROADCAST: If you receive this message, you are already dead."
-        ]
-        return random.choice(warnings)
+    def remove(self, entity: Entity):
+        bucket = self.buckets[entity.cell]
+        bucket.discard(entity)
+        if not bucket:
+            del self.buckets[entity.cell]
 
-    def generate_unknown_content(self) -> str:
-        unknown = [
-            "[INCOMPREHENSIBLE SOUNDS] ...ṫ̶̻h̵͉̔e̶̝̾ ̸̣̈v̶̰̈́o̵̰̅i̵̳̐d̶̰̈́ ̷̣̈́l̶̰̾i̸̦̓s̶̰̈́t̷̰̊e̵̬̊n̵̢̛s̶̰̈́...",
-            "Signal structure unknown. Origin: Beyond observable universe.",
-            "Content cannot be parsed. Your mind cannot process this information safely.",
-            "̸̱͝W̷̘̾Ë̵́͜ ̴̰̾A̷̘̾R̷̘͝E̵̬͝ ̵̝̾C̵̱͠O̷̰͝M̶̙͝I̷̱̾N̵̰̾G̶̱͝"
-        ]
-        return random.choice(unknown)
+    def moved(self, entity: Entity):
+        """Re-bucket after a position change; nothing to do while it stays inside its cell"""
+        key = self.key(entity.x, entity.y)
+        if key != entity.cell:
+            self.remove(entity)
+            entity.cell = key
+            self.buckets.setdefault(key, set()).add(entity)
 
-    def animate_loading(self, text: str, duration: float = 1.0):
-        """Animated loading text"""
-        steps = int(duration / 0.2)
-        for i in range(steps):
-            dots = "." * ((i % 3) + 1)
-            print(f"\r{Colors.CYAN}{text}{dots}   {Colors.END}", end='', flush=True)
-            time.sleep(0.2)
-        print()
+    def within(self, low_x: int, low_y: int, high_x: int, high_y: int) -> Iterator[Entity]:
+        """Entities inside an inclusive rectangle, visiting only the buckets it overlaps"""
+        size = self.cell_size
+        for cx in range(low_x // size, high_x // size + 1):
+            for cy in range(low_y // size, high_y // size + 1):
+                for entity in self.buckets.get((cx, cy), ()):
+                    if low_x <= entity.x <= high_x and low_y <= entity.y <= high_y:
+                        yield entity
 
-    def scan_command(self):
-        print(f"\n{Colors.CYAN}[SCANNING FREQUENCIES]{Colors.END}")
-        self.animate_loading("Scanning", 1.0)
-        
-        signal_count = random.randint(1, 3)
-        self.scanned_signals = [self.generate_signal() for _ in range(signal_count)]
-        
-        print(f"\n{Colors.GREEN}✓ Found {signal_count} signal(s):{Colors.END}")
-        for i, sig in enumerate(self.scanned_signals):
-            strength_col = Colors.GREEN if sig.strength > 60 else Colors.YELLOW if sig.strength > 30 else Colors.RED
-            noise_col = Colors.GREEN if sig.noise_level < 30 else Colors.YELLOW if sig.noise_level < 60 else Colors.RED
-            print(f"  {Colors.BOLD}[{i}]{Colors.END} Freq: {Colors.CYAN}{sig.frequency}{Colors.END} MHz │ "
-                  f"Strength: {strength_col}{sig.strength}%{Colors.END} │ "
-                  f"Noise: {noise_col}{sig.noise_level}%{Colors.END}")
-        
-        print(f"\n{Colors.DIM}Use 'analyze <index>' to examine a signal.{Colors.END}")
-        self.resources.power -= random.randint(1, 3)
+    def near(self, x: int, y: int, radius: int) -> Iterator[Entity]:
+        return self.within(x - radius, y - radius, x + radius, y + radius)
 
-    def analyze_command(self, args: List[str]):
-        if not args:
-            print(f"{Colors.YELLOW}Usage: analyze <signal_index>{Colors.END}")
-            return
-        
+    def along(self, x: int, y: int, dx: int, dy: int, length: int, width: int = 1) -> Iterator[Entity]:
+        """Line-of-sight candidates: entities in the strip width tiles either side of an axis-aligned ray"""
+        end_x, end_y = x + dx * length, y + dy * length
+        pad_x, pad_y = (0, width) if dx else (width, 0)
+        return self.within(min(x, end_x) - pad_x, min(y, end_y) - pad_y, max(x, end_x) + pad_x, max(y, end_y) + pad_y)
+
+class EntityWorld:
+    """Things that move around the station, indexed by a SpatialHash"""
+    KINDS = {
+        # kind: (glyph, Colors attribute, chance of stepping each tick)
+        'anomaly': ('Ж', 'MAGENTA', 0.7),
+        'drone': ('¤', 'CYAN', 0.4),
+        'item': ('*', 'YELLOW', 0.0),
+    }
+    STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    
+    def __init__(self, station: Station, cell_size: int = 4):
+        self.station = station
+        self.index = SpatialHash(cell_size)
+        self.mobile: List[Entity] = []
+        self.count = 0
+        self.floor = [(x, y) for y, row in enumerate(station.layout) for x, tile in enumerate(row) if tile == 0]
+        self.walkable = frozenset((x, y) for y, row in enumerate(station.layout) for x in range(len(row))
+                                  if station.is_walkable(x, y))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def spawn(self, kind: str, x: Optional[int] = None, y: Optional[int] = None) -> Entity:
+        """Add an entity, on a random floor tile unless a position is given"""
+        if x is None or y is None:
+            x, y = random.choice(self.floor)
+        entity = Entity(kind, x, y, self.KINDS[kind][2])
+        self.index.insert(entity)
+        if entity.mobility:
+            self.mobile.append(entity)
+        self.count += 1
+        return entity
+
+    def despawn(self, entity: Entity):
+        self.index.remove(entity)
+        if entity.mobility:
+            self.mobile.remove(entity)
+        self.count -= 1
+
+    def of_kind(self, kind: str) -> List[Entity]:
+        return [entity for bucket in self.index.buckets.values() for entity in bucket if entity.kind == kind]
+
+    def tick(self):
+        """Random-walk every mobile entity; the index is only touched when one crosses a bucket edge"""
+        walkable = self.walkable
+        steps = self.STEPS
+        moved = self.index.moved
+        rand = random.random
+        for entity in self.mobile:
+            if rand() < entity.mobility:
+                step_x, step_y = steps[int(rand() * 4)]
+                x, y = entity.x + step_x, entity.y + step_y
+                if (x, y) in walkable:
+                    entity.x, entity.y = x, y
+                    moved(entity)
+
+    def in_view(self, x: int, y: int, dx: int, dy: int, distance: int) -> List[Tuple[int, int, Entity]]:
+        """(forward, lateral, entity) for everything in the three lanes ahead, nearest first; lateral 1 is left"""
+        found = []
+        for entity in self.index.along(x, y, dx, dy, distance):
+            rel_x, rel_y = entity.x - x, entity.y - y
+            forward = rel_x * dx + rel_y * dy
+            if 1 <= forward <= distance:
+                found.append((forward, rel_y * dx - rel_x * dy, entity))
+        found.sort(key=lambda hit: hit[0])
+        return found
+
+class Clock:
+    """Real wall-clock time for animations and frame pacing"""
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @staticmethod
+    def named(spec: str) -> 'Clock':
+        """Build a clock from 'real', 'instant' or a speed-up such as '10x'"""
+        spec = spec.strip().lower()
+        if spec == 'real':
+            return Clock()
+        if spec == 'instant':
+            return InstantClock()
         try:
-            idx = int(args[0])
-            if idx < 0 or idx >= len(self.scanned_signals):
-                print(f"{Colors.RED}Invalid signal index. Available: 0-{len(self.scanned_signals)-1}{Colors.END}")
-                return
-            
-            self.current_signal = self.scanned_signals[idx]
-            print(f"\n{Colors.CYAN}[ANALYZING SIGNAL {idx}]{Colors.END}")
-            self.animate_loading("Analyzing", 1.0)
-            
-            print(f"\n{Colors.BLUE}Frequency:{Colors.END} {Colors.CYAN}{self.current_signal.frequency}{Colors.END} MHz")
-            
-            strength_col = Colors.GREEN if self.current_signal.strength > 60 else Colors.YELLOW if self.current_signal.strength > 30 else Colors.RED
-            print(f"{Colors.BLUE}Signal Strength:{Colors.END} {strength_col}{self.current_signal.strength}%{Colors.END}")
-            
-            noise_col = Colors.GREEN if self.current_signal.noise_level < 30 else Colors.YELLOW if self.current_signal.noise_level < 60 else Colors.RED
-            print(f"{Colors.BLUE}Noise Level:{Colors.END} {noise_col}{self.current_signal.noise_level}%{Colors.END}")
-            
-            type_col = Colors.YELLOW if self.current_signal.content_type in ["warning", "unknown"] else Colors.WHITE
-            print(f"{Colors.BLUE}Content Type:{Colors.END} {type_col}{self.current_signal.content_type.upper()}{Colors.END}")
-            
-            quality = 'CLEAN' if self.current_signal.noise_level < 30 else 'MODERATE' if self.current_signal.noise_level < 60 else 'POOR'
-            quality_col = Colors.GREEN if quality == 'CLEAN' else Colors.YELLOW if quality == 'MODERATE' else Colors.RED
-            print(f"\n{Colors.BLUE}Quality:{Colors.END} {quality_col}{quality}{Colors.END}")
-            
-            print(f"\n{Colors.DIM}Use 'decode' to extract the signal content.{Colors.END}")
-            
-            self.resources.power -= 2
-            
+            factor = float(spec.removesuffix('x'))
         except ValueError:
-            print(f"{Colors.RED}Invalid index. Must be a number.{Colors.END}")
+            factor = 0.0
+        if not factor > 0:
+            raise ValueError(f"unknown clock '{spec}'; use real, instant or a speed-up like 10x")
+        return ScaledClock(factor) if factor != 1 else Clock()
 
-    def decode_command(self):
-        if not self.current_signal:
-            print(f"{Colors.RED}No signal selected. Use 'analyze <index>' first.{Colors.END}")
+class ScaledClock(Clock):
+    """Wall-clock time running factor times faster"""
+    def __init__(self, factor: float):
+        self.factor = factor
+        self.origin = time.monotonic()
+
+    def now(self) -> float:
+        return self.origin + (time.monotonic() - self.origin) * self.factor
+
+    def sleep(self, seconds: float):
+        if seconds > 0:
+            time.sleep(seconds / self.factor)
+
+class InstantClock(Clock):
+    """Virtual time where sleeping only moves the clock forward"""
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def now(self) -> float:
+        return self.elapsed
+
+    def sleep(self, seconds: float):
+        self.elapsed += max(0.0, seconds)
+
+@dataclass(order=True)
+class ScheduledEvent:
+    due: float
+    seq: int
+    name: str = field(compare=False)
+    action: Callable[[], None] = field(compare=False)
+    interval: Optional[float] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+class EventScheduler:
+    """Priority queue of timed events on game-clock minutes"""
+    def __init__(self, now: float = 0.0):
+        self.now = now
+        self._queue: List[ScheduledEvent] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def schedule(self, delay: float, name: str, action: Callable[[], None],
+                 interval: Optional[float] = None) -> ScheduledEvent:
+        """Queue an action to fire after delay minutes, optionally repeating"""
+        return self.schedule_at(self.now + delay, name, action, interval)
+
+    def schedule_at(self, due: float, name: str, action: Callable[[], None],
+                    interval: Optional[float] = None) -> ScheduledEvent:
+        event = ScheduledEvent(due, next(self._seq), name, action, interval)
+        heapq.heappush(self._queue, event)
+        return event
+
+    def cancel(self, event: ScheduledEvent):
+        """Lazily cancel an event; it is discarded when it reaches the top"""
+        event.cancelled = True
+        event.interval = None
+
+    def snapshot(self) -> Tuple[Tuple[ScheduledEvent, float, int, Optional[float], bool], ...]:
+        """Pending events with the fields firing and cancelling change, for rewind"""
+        return tuple((event, event.due, event.seq, event.interval, event.cancelled) for event in self._queue)
+
+    def restore(self, snapshot: Tuple[Tuple[ScheduledEvent, float, int, Optional[float], bool], ...]):
+        self._queue = []
+        for event, due, seq, interval, cancelled in snapshot:
+            event.due, event.seq, event.interval, event.cancelled = due, seq, interval, cancelled
+            self._queue.append(event)
+        heapq.heapify(self._queue)
+
+    def pop_due(self, now: float) -> Iterator[ScheduledEvent]:
+        """Yield events due at or before now in time order, re-arming recurring ones"""
+        queue = self._queue
+        while queue and queue[0].due <= now:
+            event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            self.now = event.due
+            try:
+                yield event
+            finally:
+                # Recurring events go back in as the same object, so the caller's handle can still cancel them
+                if event.interval:
+                    event.due += event.interval
+                    event.seq = next(self._seq)
+                    heapq.heappush(queue, event)
+        self.now = max(self.now, now)
+
+    def advance(self, now: float) -> int:
+        """Fire every event due up to now and return how many ran"""
+        fired = 0
+        for event in self.pop_due(now):
+            event.action()
+            fired += 1
+        return fired
+
+class ResourceModel:
+    """Power and oxygen as rates over game time, integrated in closed form"""
+    # Extra (power, oxygen) drain per minute on top of the station baseline
+    ACTIVITY_LOADS = {
+        'idle': (0.0, 0.0),
+        'terminal': (0.1, 0.0),
+        'moving': (0.0, 0.5),
+        'resting': (0.0, -0.015),
+    }
+    
+    def __init__(self, generator_output: float = 0.05, base_load: float = 0.035,
+                 scrubber_draw: float = 0.02, scrubber_output: float = 0.03,
+                 breathing: float = 0.034):
+        # All rates are percentage points per game minute
+        self.generator_output = generator_output
+        self.base_load = base_load
+        self.scrubber_draw = scrubber_draw
+        self.scrubber_output = scrubber_output
+        self.breathing = breathing
+
+    def rates(self, activity: str = 'idle') -> Tuple[float, float, float]:
+        """Return (power rate, oxygen rate while powered, oxygen rate when dark)"""
+        power_load, oxygen_load = self.ACTIVITY_LOADS[activity]
+        power_rate = self.generator_output - self.base_load - self.scrubber_draw - power_load
+        oxygen_rate = self.scrubber_output - self.breathing - oxygen_load
+        return power_rate, oxygen_rate, -self.breathing - oxygen_load
+
+    @staticmethod
+    def clamp(value: float) -> float:
+        return min(100.0, max(0.0, value))
+
+    def powered_minutes(self, power: float, power_rate: float, minutes: float) -> float:
+        """How long within the span the scrubbers still have power"""
+        if power_rate >= 0:
+            return minutes if power > 0 or power_rate > 0 else 0.0
+        return min(minutes, power / -power_rate)
+
+    def advance(self, resources: Resources, minutes: float, activity: str = 'idle'):
+        """Move power and oxygen forward by any duration in constant time"""
+        if minutes <= 0:
             return
-        
-        print(f"\n{Colors.CYAN}[DECODING SIGNAL]{Colors.END}")
-        self.animate_loading("Decoding", 1.5)
-        
-        # Content color based on type
-        content_colors = {
-            "data_stream": Colors.CYAN,
-            "voice": Colors.YELLOW,
-            "coordinates": Colors.GREEN,
-            "blueprint": Colors.BLUE,
-            "warning": Colors.RED + Colors.BOLD,
-            "unknown": Colors.MAGENTA + Colors.BOLD
+        power_rate, oxygen_on, oxygen_off = self.rates(activity)
+        powered = self.powered_minutes(resources.power, power_rate, minutes)
+        resources.power = self.clamp(resources.power + power_rate * minutes)
+        # Oxygen is piecewise linear: scrubbers run until the power runs out
+        oxygen = self.clamp(resources.oxygen + oxygen_on * powered)
+        resources.oxygen = self.clamp(oxygen + oxygen_off * (minutes - powered))
+
+    def time_until_depleted(self, resources: Resources, activity: str = 'idle') -> Tuple[Optional[float], Optional[float]]:
+        """Return minutes until power and oxygen hit zero, or None if they never do"""
+        power_rate, oxygen_on, oxygen_off = self.rates(activity)
+        power_left = resources.power / -power_rate if power_rate < 0 else None
+        powered = power_left if power_left is not None else float('inf')
+        if oxygen_on < 0 and resources.oxygen / -oxygen_on <= powered:
+            return power_left, resources.oxygen / -oxygen_on
+        if power_left is None:
+            return None, None
+        oxygen_at_blackout = self.clamp(resources.oxygen + oxygen_on * power_left)
+        return power_left, power_left + oxygen_at_blackout / -oxygen_off
+
+class WaveformSynth:
+    """Synthetic sample stream for a signal, tuned so its carrier sits mid-capture"""
+    SAMPLE_RATE = 8192
+    CAPTURE_SPAN_MHZ = 10.0
+    SYMBOL_SAMPLES = 32
+    MODULATION_DEPTH = 0.3
+    
+    def __init__(self, signal: Signal):
+        self.signal = signal
+        self.low_mhz = signal.frequency - self.CAPTURE_SPAN_MHZ / 2
+
+    def baseband_hz(self, frequency_mhz: float) -> float:
+        """Map a sky frequency inside the capture to its baseband frequency"""
+        return (frequency_mhz - self.low_mhz) / self.CAPTURE_SPAN_MHZ * (self.SAMPLE_RATE / 2)
+
+    def frequency_mhz(self, baseband_hz: float) -> float:
+        return self.low_mhz + baseband_hz / (self.SAMPLE_RATE / 2) * self.CAPTURE_SPAN_MHZ
+
+    def symbols(self) -> Iterator[int]:
+        """Endless bit stream of the decoded content, used to key the carrier"""
+        payload = self.signal.decoded_content.encode('utf-8') or b'\0'
+        while True:
+            for byte in payload:
+                for bit in range(8):
+                    yield (byte >> bit) & 1
+
+    def chunks(self, total_samples: int = 32768, chunk_size: int = 512) -> Iterator[array]:
+        """Yield the capture as fixed-size float blocks, never holding more than one"""
+        rng = random.Random(self.signal.seed)
+        amplitude = self.signal.strength / 100
+        sigma = self.signal.noise_level / 100
+        step = 2 * math.pi * self.baseband_hz(self.signal.frequency) / self.SAMPLE_RATE
+        symbols = self.symbols()
+        symbol = next(symbols)
+        gauss = rng.gauss
+        sin = math.sin
+        depth = self.MODULATION_DEPTH
+        produced = 0
+        while produced < total_samples:
+            count = min(chunk_size, total_samples - produced)
+            block = array('f', bytes(4 * count))
+            for i in range(count):
+                n = produced + i
+                if n % self.SYMBOL_SAMPLES == 0:
+                    symbol = next(symbols)
+                envelope = amplitude * (1 - depth + 2 * depth * symbol)
+                block[i] = envelope * sin(step * n) + gauss(0.0, sigma)
+            produced += count
+            yield block
+
+@dataclass
+class WavSegment:
+    path: str
+    start: int
+    frames: int
+    sample_rate: int
+
+class WavCapture(WaveformSynth):
+    """Recorded WAV segment read in fixed-size chunks, mapped across the whole scan band"""
+    CHUNK_FRAMES = 4096
+    
+    def __init__(self, signal: Signal):
+        self.signal = signal
+        self.segment = signal.source
+        self.SAMPLE_RATE = self.segment.sample_rate
+        self.CAPTURE_SPAN_MHZ = BandModel.BAND_HIGH_MHZ - BandModel.BAND_LOW_MHZ
+        self.low_mhz = BandModel.BAND_LOW_MHZ
+
+    @staticmethod
+    def decode_frames(data: bytes, width: int, channels: int) -> array:
+        """Convert little-endian PCM bytes to floats in [-1, 1], keeping the first channel"""
+        if width == 1:
+            samples = array('f', ((b - 128) / 128 for b in data[::channels]))
+            return samples
+        if width == 3:
+            step = 3 * channels
+            scale = 1 / 8388608
+            return array('f', (int.from_bytes(data[i:i + 3], 'little', signed=True) * scale
+                               for i in range(0, len(data) - 2, step)))
+        raw = array('h' if width == 2 else 'i', data)
+        if sys.byteorder == 'big':
+            raw.byteswap()
+        scale = 1 / (1 << (8 * width - 1))
+        return array('f', (sample * scale for sample in raw[::channels]))
+
+    @staticmethod
+    def read_errors() -> Tuple[type, ...]:
+        """What reading a recording can raise: I/O, truncation and headers wave cannot parse"""
+        import wave
+        return (EOFError, OSError, ValueError, wave.Error)
+
+    @classmethod
+    def read_chunks(cls, path: str, start: int, frames: int) -> Iterator[array]:
+        """Stream a frame range of a WAV file without ever loading it whole"""
+        import wave
+        with wave.open(path, 'rb') as wav:
+            width = wav.getsampwidth()
+            channels = wav.getnchannels()
+            wav.setpos(start)
+            remaining = frames
+            while remaining > 0:
+                data = wav.readframes(min(cls.CHUNK_FRAMES, remaining))
+                if not data:
+                    break
+                remaining -= len(data) // (width * channels)
+                yield cls.decode_frames(data, width, channels)
+
+    def chunks(self, total_samples: Optional[int] = None, chunk_size: int = 512) -> Iterator[array]:
+        frames = self.segment.frames if total_samples is None else min(total_samples, self.segment.frames)
+        return self.read_chunks(self.segment.path, self.segment.start, frames)
+
+class WavLibrary:
+    """Directory of recordings with a cached header and segment index"""
+    INDEX_NAME = '.listener_index.json'
+    SEGMENT_SECONDS = 10
+    ANALYSIS_SAMPLES = 32768
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.index_path = os.path.join(directory, self.INDEX_NAME)
+        self.index: Dict[str, dict] = self.load_index()
+
+    def load_index(self) -> Dict[str, dict]:
+        import json
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        import json
+        temp_path = self.index_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            pass  # Read-only archives still work; they just get re-measured next session
+
+    def refresh(self) -> int:
+        """Index new or changed recordings, forget deleted ones; returns files read"""
+        seen = set()
+        read = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith('.wav') or not entry.is_file():
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                cached = self.index.get(entry.name)
+                if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                    continue
+                read += 1
+                try:
+                    self.index[entry.name] = self.measure_file(entry.path, stat)
+                except WavCapture.read_errors() as e:
+                    # Remembered like a good file, so it is only re-read once it changes
+                    reason = str(e) or type(e).__name__
+                    self.index[entry.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                              'error': reason, 'segments': []}
+                    print(f"{Colors.YELLOW}⚠ Skipping {entry.name}: {reason}{Colors.END}")
+        for name in set(self.index) - seen:
+            del self.index[name]
+        if read or len(seen) != len(self.index):
+            self.save_index()
+        return read
+
+    def measure_file(self, path: str, stat: os.stat_result) -> dict:
+        """Read the header and measure every segment of one recording"""
+        import wave
+        with wave.open(path, 'rb') as wav:
+            rate = wav.getframerate()
+            total = wav.getnframes()
+        segment_frames = rate * self.SEGMENT_SECONDS
+        segments = []
+        for start in range(0, total, segment_frames):
+            frames = min(segment_frames, total - start)
+            if frames < SpectrumAnalyzer.FFT_SIZE:
+                break
+            segments.append(self.measure_segment(path, start, frames, rate))
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'rate': rate,
+                'frames': total, 'segments': segments}
+
+    def measure_segment(self, path: str, start: int, frames: int, rate: int) -> dict:
+        """Strength from RMS level, noise and carrier from the spectrum"""
+        total = 0.0
+        count = 0
+        for chunk in WavCapture.read_chunks(path, start, frames):
+            total += sum(sample * sample for sample in chunk)
+            count += len(chunk)
+        rms_db = 10 * math.log10(max(total / max(count, 1), 1e-12))
+        analyzer = SpectrumAnalyzer(sample_rate=rate)
+        report = analyzer.measure(WavCapture.read_chunks(path, start, min(frames, self.ANALYSIS_SAMPLES)))
+        span = BandModel.BAND_HIGH_MHZ - BandModel.BAND_LOW_MHZ
+        frequency = BandModel.BAND_LOW_MHZ + report.peak_hz / (rate / 2) * span
+        return {
+            'start': start,
+            'frames': frames,
+            'strength': max(5, min(100, round(100 + 2 * rms_db))),
+            'noise': max(5, min(95, round(50 - 2.5 * report.snr_db))),
+            'frequency': round(frequency, 1),
         }
+
+    def segments(self) -> Iterator[Tuple[WavSegment, dict]]:
+        for name, entry in sorted(self.index.items()):
+            path = os.path.join(self.directory, name)
+            for measured in entry['segments']:
+                yield WavSegment(path, measured['start'], measured['frames'], entry['rate']), measured
+
+def measure_signal(signal: Signal) -> 'SpectrumReport':
+    """Demodulate one signal's samples; module-level so process pools can pickle it"""
+    capture = WavCapture(signal) if signal.source else WaveformSynth(signal)
+    return SpectrumAnalyzer(sample_rate=capture.SAMPLE_RATE).measure(capture.chunks())
+
+class AmbientAudio:
+    """Station ambience mixed from precomputed wavetables and streamed to a WAV file or pipe"""
+    SAMPLE_RATE = 8000
+    BLOCK_FRAMES = 512
+    LEAD_BLOCKS = 4
+    HUM_HZ = 50
+    BREATH_SECONDS = 4
+    TONE_HZ = (300, 1800)
+    # Peak share of full scale per layer; together they can never clip
+    LEVELS = {'hum': 0.22, 'breath': 0.18, 'tone': 0.22, 'static': 0.18, 'cue': 0.15}
+    FULL_SCALE = 32767
+    
+    def __init__(self, state: Callable[[], Tuple[float, Optional[Signal]]], clock: Optional[Clock] = None,
+                 seed: int = 0):
+        self.state = state
+        # Audio plays in real time whatever clock the game runs on
+        self.clock = clock or Clock()
+        rng = random.Random(seed)
+        rate = self.SAMPLE_RATE
+        self.sine = array('f', [math.sin(2 * math.pi * i / rate) for i in range(rate)])
+        self.noise = array('f', [rng.uniform(-1.0, 1.0) for _ in range(rate)])
+        # name: (table repeated past one block so any phase is a single slice, period, phase)
+        self.layers: Dict[str, Tuple[array, int, int]] = {}
+        self.set_layer('breath', self.breath_table())
+        self.knock = self.knock_table()
+        self.cue_at: Optional[int] = None
+        self.tuned: Tuple[Any, ...] = ()
+        self.writer = None
+        self.stream = None
+        self.thread = None
+        self.stopping = False
+
+    def set_layer(self, name: str, table: array):
+        _, _, phase = self.layers.get(name, (None, 0, 0))
+        repeats = 1 + -(-self.BLOCK_FRAMES // len(table))
+        self.layers[name] = (table * repeats, len(table), phase % len(table))
+
+    def scaled(self, samples: Iterable[float], level: float) -> array:
+        scale = level * self.FULL_SCALE
+        return array('f', (sample * scale for sample in samples))
+
+    def breath_table(self) -> array:
+        """Low-passed vent noise swelling in and out over one breath"""
+        length = self.BREATH_SECONDS * self.SAMPLE_RATE
+        noise, rate = self.noise, self.SAMPLE_RATE
+        smoothed, table = 0.0, []
+        for i in range(length):
+            smoothed += 0.05 * (noise[i % rate] - smoothed)
+            table.append(smoothed * math.sin(math.pi * i / length) ** 2)
+        peak = max(map(abs, table)) or 1.0
+        return self.scaled((sample / peak for sample in table), self.LEVELS['breath'])
+
+    def knock_table(self) -> array:
+        """Three slow, decaying thuds on the hull"""
+        rate, hz = self.SAMPLE_RATE, 70
+        table = array('f', bytes(4 * int(1.5 * rate)))
+        for start in (0, rate // 2, rate):
+            for i in range(rate // 4):
+                table[start + i] = self.sine[(i * hz) % rate] * math.exp(-i / (rate / 25))
+        return self.scaled(table, self.LEVELS['cue'])
+
+    def retune(self):
+        """Rebuild the tables that depend on station state, only when that state changes"""
+        power, signal = self.state()
+        power_step = math.ceil(max(0.0, power) / 10)
+        tuning = (power_step, id(signal), signal and (signal.frequency, signal.strength, signal.working_noise))
+        if tuning == self.tuned:
+            return
+        self.tuned = tuning
+        rate = self.SAMPLE_RATE
+        period = rate // self.HUM_HZ
+        hum = ((self.sine[(i * self.HUM_HZ) % rate] + 0.5 * self.sine[(2 * i * self.HUM_HZ) % rate]
+                + 0.25 * self.sine[(3 * i * self.HUM_HZ) % rate]) / 1.75 for i in range(period))
+        self.set_layer('hum', self.scaled(hum, self.LEVELS['hum'] * power_step / 10))
+        if signal is None:
+            self.layers.pop('tone', None)
+            self.layers.pop('static', None)
+            return
+        low, high = self.TONE_HZ
+        position = (signal.frequency - BandModel.BAND_LOW_MHZ) / (BandModel.BAND_HIGH_MHZ - BandModel.BAND_LOW_MHZ)
+        hz = low + int((high - low) * min(1.0, max(0.0, position)))
+        self.set_layer('tone', self.scaled((self.sine[(i * hz) % rate] for i in range(rate)),
+                                           self.LEVELS['tone'] * signal.strength / 100))
+        self.set_layer('static', self.scaled(self.noise, self.LEVELS['static'] * signal.working_noise / 100))
+
+    def cue(self):
+        self.cue_at = 0
+
+    def block(self) -> bytes:
+        """Mix the next fixed-size block of 16-bit mono PCM"""
+        self.retune()
+        frames = self.BLOCK_FRAMES
+        slices = []
+        for name, (table, period, phase) in self.layers.items():
+            slices.append(table[phase:phase + frames])
+            self.layers[name] = (table, period, (phase + frames) % period)
+        if self.cue_at is not None:
+            cue = self.knock[self.cue_at:self.cue_at + frames]
+            slices.append(cue + array('f', bytes(4 * (frames - len(cue)))))
+            self.cue_at = self.cue_at + frames if self.cue_at + frames < len(self.knock) else None
+        samples = array('h', [int(sum(mixed)) for mixed in zip(*slices)])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        return samples.tobytes()
+
+    def open(self, path: str):
+        """Start a WAV stream; FIFOs and other unseekable targets get an open-ended header"""
+        import wave
+        self.stream = open(path, 'wb')
+        self.writer = wave.open(self.stream, 'wb')
+        self.writer.setnchannels(1)
+        self.writer.setsampwidth(2)
+        self.writer.setframerate(self.SAMPLE_RATE)
+        if not self.stream.seekable():
+            # Readers of a pipe play until EOF instead of trusting the length
+            self.writer.setnframes(0x7FFFFFFF // 2 - 36)
+
+    def start(self):
+        import threading
+        self.thread = threading.Thread(target=self.run, name='ambient-audio', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Write blocks in real time, a few blocks ahead of the listener"""
+        seconds = self.BLOCK_FRAMES / self.SAMPLE_RATE
+        deadline = self.clock.now() - self.LEAD_BLOCKS * seconds
+        try:
+            while not self.stopping:
+                self.writer.writeframesraw(self.block())
+                self.stream.flush()
+                deadline += seconds
+                self.clock.sleep(deadline - self.clock.now())
+        except OSError:
+            pass  # The player went away or the disk filled; the game carries on silent
+
+    def close(self):
+        self.stopping = True
+        if self.thread:
+            self.thread.join()
+        try:
+            self.writer.close()
+        except OSError:
+            pass  # A pipe cannot have its length patched in
+        self.stream.close()
+
+class FilterStage:
+    """One in-place processing step of a FilterPipeline"""
+    kind = 'stage'
+    
+    def __init__(self):
+        self.elapsed = 0.0
+        self.samples = 0
+
+    def configure(self, synth: WaveformSynth):
+        """Reset state and derive coefficients for a particular capture"""
+
+    def process(self, block: memoryview):
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return self.kind
+
+    def cost_ns(self) -> float:
+        """Measured cost per sample in nanoseconds"""
+        return self.elapsed / self.samples * 1e9 if self.samples else 0.0
+
+class BiquadStage(FilterStage):
+    """RBJ cookbook bandpass or notch centred on a sky frequency"""
+    def __init__(self, center_mhz: float, width_mhz: float, notch: bool = False):
+        super().__init__()
+        if width_mhz <= 0:
+            raise ValueError("width must be positive")
+        self.kind = 'notch' if notch else 'bandpass'
+        self.center_mhz = center_mhz
+        self.width_mhz = width_mhz
+        self.notch = notch
+        self.coefficients = (1.0, 0.0, 0.0, 0.0, 0.0)
+        self.in_band = True
+        self.state = [0.0, 0.0, 0.0, 0.0]
+
+    def configure(self, synth: WaveformSynth):
+        nyquist = synth.SAMPLE_RATE / 2
+        center = synth.baseband_hz(self.center_mhz)
+        width = self.width_mhz / synth.CAPTURE_SPAN_MHZ * nyquist
+        self.state = [0.0, 0.0, 0.0, 0.0]
+        self.in_band = 0 < center < nyquist
+        if not self.in_band:
+            # Centre outside this capture: a bandpass passes nothing, a notch everything
+            self.coefficients = (1.0, 0.0, 0.0, 0.0, 0.0) if self.notch else (0.0, 0.0, 0.0, 0.0, 0.0)
+            return
+        w0 = 2 * math.pi * center / synth.SAMPLE_RATE
+        alpha = math.sin(w0) / (2 * center / width)
+        a0 = 1 + alpha
+        a1 = -2 * math.cos(w0) / a0
+        a2 = (1 - alpha) / a0
+        if self.notch:
+            b0, b1, b2 = 1 / a0, -2 * math.cos(w0) / a0, 1 / a0
+        else:
+            b0, b1, b2 = alpha / a0, 0.0, -alpha / a0
+        self.coefficients = (b0, b1, b2, a1, a2)
+
+    def process(self, block: memoryview):
+        b0, b1, b2, a1, a2 = self.coefficients
+        x1, x2, y1, y2 = self.state
+        for i in range(len(block)):
+            x0 = block[i]
+            y0 = b0 * x0 + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+            block[i] = y0
+            x2, x1 = x1, x0
+            y2, y1 = y1, y0
+        self.state = [x1, x2, y1, y2]
+
+    def describe(self) -> str:
+        return f"{self.kind} {self.center_mhz:g} MHz ±{self.width_mhz / 2:g}"
+
+class MovingAverageStage(FilterStage):
+    """Boxcar smoothing over the last n samples"""
+    kind = 'average'
+    
+    def __init__(self, taps: int = 3):
+        super().__init__()
+        if taps < 1:
+            raise ValueError("taps must be at least 1")
+        self.taps = int(taps)
+        self.history = array('f', bytes(4 * self.taps))
+        self.position = 0
+        self.total = 0.0
+
+    def configure(self, synth: WaveformSynth):
+        self.history = array('f', bytes(4 * self.taps))
+        self.position = 0
+        self.total = 0.0
+
+    def process(self, block: memoryview):
+        history = self.history
+        taps = self.taps
+        position = self.position
+        total = self.total
+        for i in range(len(block)):
+            sample = block[i]
+            total += sample - history[position]
+            history[position] = sample
+            position = (position + 1) % taps
+            block[i] = total / taps
+        self.position = position
+        self.total = total
+
+    def describe(self) -> str:
+        return f"average {self.taps} taps"
+
+class AgcStage(FilterStage):
+    """Automatic gain control that steers the envelope toward a target level"""
+    kind = 'agc'
+    
+    def __init__(self, target: float = 0.5, rate: float = 0.01):
+        super().__init__()
+        self.target = target
+        self.rate = rate
+        self.envelope = target
+
+    def configure(self, synth: WaveformSynth):
+        self.envelope = self.target
+
+    def process(self, block: memoryview):
+        envelope = self.envelope
+        target = self.target
+        rate = self.rate
+        for i in range(len(block)):
+            sample = block[i]
+            envelope += rate * (abs(sample) - envelope)
+            block[i] = sample * target / max(envelope, 1e-6)
+        self.envelope = envelope
+
+    def describe(self) -> str:
+        return f"agc target {self.target:g}"
+
+class FilterPipeline:
+    """Ordered filter stages applied in place to each sample block as it streams past"""
+    STAGE_TYPES = {
+        'bandpass': lambda center, width: BiquadStage(center, width),
+        'notch': lambda center, width: BiquadStage(center, width, notch=True),
+        'average': lambda taps=3: MovingAverageStage(int(taps)),
+        'agc': lambda target=0.5: AgcStage(target),
+    }
+    
+    def __init__(self):
+        self.stages: List[FilterStage] = []
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def add(self, kind: str, *params: float) -> FilterStage:
+        factory = self.STAGE_TYPES[kind]
+        stage = factory(*params)
+        self.stages.append(stage)
+        return stage
+
+    def run(self, chunks: Iterable[array], synth: WaveformSynth) -> Iterator[array]:
+        """Filter each block in place and pass it on; nothing is copied between stages"""
+        for stage in self.stages:
+            stage.configure(synth)
+        clock = time.perf_counter
+        for chunk in chunks:
+            view = memoryview(chunk)
+            for stage in self.stages:
+                started = clock()
+                stage.process(view)
+                stage.elapsed += clock() - started
+                stage.samples += len(view)
+            yield chunk
+
+@dataclass
+class SpectrumReport:
+    peak_hz: float
+    snr_db: float
+    noise_floor_db: float
+    frames: int
+    bin_hz: float
+
+class SpectrumAnalyzer:
+    """Welch-averaged power spectrum over a stream of sample blocks"""
+    FFT_SIZE = 512
+    
+    def __init__(self, fft_size: int = FFT_SIZE, sample_rate: int = WaveformSynth.SAMPLE_RATE,
+                 use_numpy: bool = True):
+        if fft_size & (fft_size - 1):
+            raise ValueError("fft_size must be a power of two")
+        self.fft_size = fft_size
+        self.sample_rate = sample_rate
+        self.use_numpy = use_numpy
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def numpy():
+        """Import NumPy on first use; None if it isn't installed"""
+        try:
+            import numpy
+        except ImportError:
+            return None
+        return numpy
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def plan(size: int) -> Tuple[List[int], List[List[complex]], List[float]]:
+        """Bit-reversal order, per-stage twiddles and Hann window for a transform size"""
+        bits = size.bit_length() - 1
+        order = [int(format(i, f'0{bits}b')[::-1], 2) for i in range(size)]
+        stages = []
+        half = 1
+        while half < size:
+            stages.append([cmath.exp(-1j * math.pi * k / half) for k in range(half)])
+            half *= 2
+        window = [0.5 - 0.5 * math.cos(2 * math.pi * i / size) for i in range(size)]
+        return order, stages, window
+
+    @staticmethod
+    def fft(values: List[float]) -> List[complex]:
+        """Iterative radix-2 FFT of a power-of-two length sequence"""
+        size = len(values)
+        order, stages, _ = SpectrumAnalyzer.plan(size)
+        data = [complex(values[i]) for i in order]
+        half = 1
+        for twiddles in stages:
+            span = half * 2
+            for start in range(0, size, span):
+                for k, twiddle in enumerate(twiddles):
+                    top = start + k
+                    t = twiddle * data[top + half]
+                    data[top + half] = data[top] - t
+                    data[top] += t
+            half = span
+        return data
+
+    def frames(self, chunks: Iterable[array]) -> Iterator[array]:
+        """Re-block arbitrary chunk sizes into fft_size frames in constant memory"""
+        size = self.fft_size
+        pending = array('f')
+        for chunk in chunks:
+            pending.extend(chunk)
+            while len(pending) >= size:
+                yield pending[:size]
+                del pending[:size]
+
+    def power_spectrum(self, chunks: Iterable[array]) -> Tuple[List[float], int]:
+        """Average |X(k)|^2 over every frame; returns (bins 0..N/2, frame count)"""
+        size = self.fft_size
+        bins = size // 2 + 1
+        window = self.plan(size)[2]
+        np = self.numpy() if self.use_numpy else None
+        if np is not None:
+            np_window = np.array(window, dtype=np.float32)
+            total = np.zeros(bins)
+        else:
+            total = [0.0] * bins
+        count = 0
+        for frame in self.frames(chunks):
+            if np is not None:
+                spectrum = np.fft.rfft(np.frombuffer(frame, dtype=np.float32) * np_window)
+                total += spectrum.real ** 2 + spectrum.imag ** 2
+            else:
+                spectrum = self.fft([x * w for x, w in zip(frame, window)])
+                for k in range(bins):
+                    value = spectrum[k]
+                    total[k] += value.real * value.real + value.imag * value.imag
+            count += 1
+        if count == 0:
+            return [0.0] * bins, 0
+        return [float(p) / count for p in total], count
+
+    def measure(self, chunks: Iterable[array]) -> SpectrumReport:
+        """Find the strongest tone and its SNR against the median noise floor"""
+        spectrum, frames = self.power_spectrum(chunks)
+        bin_hz = self.sample_rate / self.fft_size
+        # Ignore DC when looking for the carrier
+        peak = max(range(1, len(spectrum)), key=spectrum.__getitem__)
+        floor = max(sorted(spectrum)[len(spectrum) // 2], 1e-12)
+        # The Hann window spreads a tone over neighbouring bins
+        lobe = range(max(1, peak - 2), min(len(spectrum), peak + 3))
+        signal_power = sum(spectrum[k] - floor for k in lobe)
+        noise_power = floor * (len(spectrum) - len(lobe))
+        snr = 10 * math.log10(max(signal_power, 1e-12) / noise_power)
+        return SpectrumReport(peak * bin_hz, snr, 10 * math.log10(floor), frames, bin_hz)
+
+class BandModel:
+    """Wideband view of the scan band, producing one FFT row per frame"""
+    BAND_LOW_MHZ = 1420.4
+    BAND_HIGH_MHZ = 6100.3
+    
+    def __init__(self, columns: int, emitters: List[Tuple[float, float]], noise: float, seed: int = 0):
+        self.columns = columns
+        # At least two FFT bins per column so pooling never leaves gaps
+        self.fft_size = 1 << max(6, (2 * columns - 1).bit_length())
+        self.emitters = emitters
+        self.noise = noise
+        self.rng = random.Random(seed)
+        bins = self.fft_size // 2
+        self.column_bins = [(c * bins // columns, max(c * bins // columns + 1, (c + 1) * bins // columns))
+                            for c in range(columns)]
+
+    def column_mhz(self, column: float) -> float:
+        return self.BAND_LOW_MHZ + column / self.columns * (self.BAND_HIGH_MHZ - self.BAND_LOW_MHZ)
+
+    def cycles_per_sample(self, frequency_mhz: float) -> float:
+        position = (frequency_mhz - self.BAND_LOW_MHZ) / (self.BAND_HIGH_MHZ - self.BAND_LOW_MHZ)
+        return position * 0.5
+
+    def rows(self) -> Iterator[List[float]]:
+        """Endless stream of per-column power in dB, one row per FFT frame"""
+        size = self.fft_size
+        window = SpectrumAnalyzer.plan(size)[2]
+        rng = self.rng
+        tones = [(2 * math.pi * self.cycles_per_sample(freq), strength) for freq, strength in self.emitters]
+        while True:
+            frame = [rng.gauss(0.0, self.noise) for _ in range(size)]
+            for omega, strength in tones:
+                # Slow fading so the traces shimmer like a real band
+                amplitude = strength * rng.uniform(0.6, 1.0)
+                phase = rng.uniform(0, 2 * math.pi)
+                for n in range(size):
+                    frame[n] += amplitude * math.sin(omega * n + phase)
+            spectrum = SpectrumAnalyzer.fft([x * w for x, w in zip(frame, window)])
+            power = [abs(value) ** 2 for value in spectrum[:size // 2]]
+            yield [10 * math.log10(max(max(power[lo:hi]), 1e-12)) for lo, hi in self.column_bins]
+
+class ChannelSweep:
+    """The scan band as thousands of narrow channels, swept in order and wrapping around"""
+    CHANNELS = 4096
+    OCCUPANCY = 0.002
+    BEACON_OCCUPANCY = 0.05
+    
+    def __init__(self, beacons: Iterable[float] = (), seed: int = 0):
+        self.rng = random.Random(seed)
+        self.cursor = 0
+        self.width_mhz = (BandModel.BAND_HIGH_MHZ - BandModel.BAND_LOW_MHZ) / self.CHANNELS
+        # Interference floor climbs towards the band edges
+        self.floor = bytes(10 + int(40 * (2 * c / (self.CHANNELS - 1) - 1) ** 4) for c in range(self.CHANNELS))
+        # Emitters cluster around the known beacons
+        self.occupancy = array('d', [self.OCCUPANCY]) * self.CHANNELS
+        for mhz in beacons:
+            center = self.channel_of(mhz)
+            for channel in range(max(0, center - 3), min(self.CHANNELS, center + 4)):
+                self.occupancy[channel] = self.BEACON_OCCUPANCY
+
+    def channel_mhz(self, channel: int) -> float:
+        return BandModel.BAND_LOW_MHZ + (channel + 0.5) * self.width_mhz
+
+    def channel_of(self, mhz: float) -> int:
+        return min(self.CHANNELS - 1, max(0, int((mhz - BandModel.BAND_LOW_MHZ) / self.width_mhz)))
+
+    def sweep(self, count: int) -> Iterator[Tuple[int, int, int]]:
+        """Visit the next count channels, yielding (channel, strength, noise) as each detection is made"""
+        rng = self.rng
+        floor, occupancy = self.floor, self.occupancy
+        for _ in range(count):
+            channel = self.cursor
+            self.cursor = (channel + 1) % self.CHANNELS
+            if rng.random() < occupancy[channel]:
+                noise = min(100, floor[channel] + rng.randint(0, 20))
+                strength = rng.randint(20, 100)
+                if strength > noise:
+                    yield channel, strength, noise
+
+class DetectionIndex:
+    """Best detection per sweep channel, under a max segment tree for best-in-band queries"""
+    EMPTY = -math.inf
+    
+    def __init__(self, channels: int):
+        self.size = 1 << max(0, (channels - 1).bit_length())
+        # Leaves hold each channel's SNR, inner nodes the max of their children
+        self.snr = array('d', [self.EMPTY]) * (2 * self.size)
+        self.signals: Dict[int, Signal] = {}
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def update(self, channel: int, snr_db: float):
+        snr = self.snr
+        node = channel + self.size
+        snr[node] = snr_db
+        node >>= 1
+        while node:
+            snr[node] = max(snr[2 * node], snr[2 * node + 1])
+            node >>= 1
+
+    def add(self, channel: int, snr_db: float, signal: Signal):
+        """Index a detection unless its channel already holds a stronger undecoded one"""
+        held = self.signals.get(channel)
+        if held is not None and not held.decoded and self.snr[channel + self.size] >= snr_db:
+            return
+        self.signals[channel] = signal
+        self.update(channel, snr_db)
+
+    def remove(self, channel: int):
+        del self.signals[channel]
+        self.update(channel, self.EMPTY)
+
+    def strongest(self, low: int, high: int) -> Optional[int]:
+        """Channel with the highest SNR in [low, high], in O(log channels)"""
+        snr = self.snr
+        best, node = self.EMPTY, None
+        lo, hi = max(0, low) + self.size, min(self.size - 1, high) + self.size + 1
+        while lo < hi:
+            if lo & 1:
+                if snr[lo] > best:
+                    best, node = snr[lo], lo
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if snr[hi] > best:
+                    best, node = snr[hi], hi
+            lo >>= 1
+            hi >>= 1
+        if node is None:
+            return None
+        # The winning node lies wholly inside the range; follow the max down to its leaf
+        while node < self.size:
+            node = 2 * node if snr[2 * node] == best else 2 * node + 1
+        return node - self.size
+
+    def best(self, low: int = 0, high: Optional[int] = None) -> Optional[Signal]:
+        """Strongest signal in the channel range that has not been decoded yet"""
+        high = self.size - 1 if high is None else high
+        while (channel := self.strongest(low, high)) is not None:
+            signal = self.signals[channel]
+            if not signal.decoded:
+                return signal
+            # Decoded since it was indexed; drop it lazily
+            self.remove(channel)
+        return None
+
+class TransmissionModel:
+    """Word-level Markov chain per content type, compiled into flat integer tables"""
+    ORDER = 2
+    START = 0
+    END = 1
+    BREAK = 2
+    MAX_TOKENS = 40
+    ATTEMPTS = 12
+    FORMAT = 2
+    # Words that close a sentence; after one, the next sentence may come from any line of the type
+    SENTENCE_END = re.compile(r'[.?!]$')
+    
+    def __init__(self, order: int = ORDER):
+        self.order = order
+        self.vocab: List[str] = ['<s>', '</s>', '<p>']
+        self.types: Dict[str, int] = {}
+        self.states: Dict[Tuple[int, ...], int] = {}
+        # State i's successors are successors[offsets[i]:offsets[i + 1]], picked by cumulative count
+        self.offsets = array('I', [0])
+        self.successors = array('I')
+        self.cumulative = array('I')
+        # Source lines as generate() would spell them, so verbatim copies can be drawn again
+        self.sources: Dict[str, List[str]] = {}
+
+    @cached_property
+    def sentence_ends(self) -> set:
+        return {token for token, word in enumerate(self.vocab) if self.SENTENCE_END.search(word)}
+
+    @classmethod
+    def compile(cls, corpora: Dict[str, List[str]], order: int = ORDER) -> 'TransmissionModel':
+        model = cls(order)
+        token_ids = {word: i for i, word in enumerate(model.vocab)}
+        counts: Dict[Tuple[int, ...], Dict[int, int]] = {}
         
-        content_col = content_colors.get(self.current_signal.content_type, Colors.WHITE)
-        
-        print(f"\n{Colors.CYAN}╔{'═' * 68}╗{Colors.END}")
-        print(f"{Colors.CYAN}║{Colors.END} {Colors.BOLD}DECODED CONTENT{Colors.END}" + " " * 52 + f"{Colors.CYAN}║{Colors.END}")
-        print(f"{Colors.CYAN}╠{'═' * 68}╣{Colors.END}")
-        
-        # Apply glitch to decoded content at low sanity
-        decoded = self.glitch_text(self.current_signal.decoded_content)
-        
-        # Wrap text to fit in box
-        max_width = 66
-        words = decoded.split()
-        lines = []
-        current_line = ""
+        def count(type_id: int, context: Tuple[int, ...], token: int):
+            successors = counts.setdefault((type_id, *context), {})
+            successors[token] = successors.get(token, 0) + 1
         
-        for word in words:
-            if len(current_line) + len(word) + 1 <= max_width:
-                current_line += word + " "
+        for type_id, (ctype, lines) in enumerate(sorted(corpora.items())):
+            model.types[ctype] = type_id
+            model.sources[ctype] = [' '.join(line.split()) for line in lines]
+            for line in lines:
+                context = (model.START,) * order
+                words = line.split()
+                for i, word in enumerate(words):
+                    if word not in token_ids:
+                        token_ids[word] = len(model.vocab)
+                        model.vocab.append(word)
+                    count(type_id, context, token_ids[word])
+                    context = (*context[1:], token_ids[word])
+                    # An ellipsis the line carries on from in lower case is not a sentence break
+                    following = words[i + 1] if i + 1 < len(words) else ''
+                    if cls.SENTENCE_END.search(word) and not following[:1].islower():
+                        context = (model.BREAK,) * order
+                count(type_id, context, model.END)
+        for key, successors in counts.items():
+            model.states[key] = len(model.states)
+            total = 0
+            for token, count_ in successors.items():
+                total += count_
+                model.successors.append(token)
+                model.cumulative.append(total)
+            model.offsets.append(len(model.successors))
+        return model
+
+    @staticmethod
+    def corpus_hash(corpora: Dict[str, List[str]], order: int) -> str:
+        import hashlib
+        import json
+        payload = json.dumps([TransmissionModel.FORMAT, order, corpora], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def cache_dir() -> str:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(base, 'the_listener')
+
+    @classmethod
+    def load(cls, corpora: Dict[str, List[str]], order: int = ORDER) -> 'TransmissionModel':
+        """Compiled tables from the on-disk cache, compiling and caching them on a miss"""
+        import json
+        path = os.path.join(cls.cache_dir(), f"markov-{cls.corpus_hash(corpora, order)}.json")
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass
+        model = cls.compile(corpora, order)
+        try:
+            os.makedirs(cls.cache_dir(), exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(model.to_dict(), f, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            pass  # An unwritable cache only costs a recompile next launch
+        return model
+
+    def to_dict(self) -> dict:
+        keys = sorted(self.states, key=self.states.get)
+        return {
+            'order': self.order, 'vocab': self.vocab, 'types': self.types,
+            'states': [value for key in keys for value in key],
+            'offsets': self.offsets.tolist(), 'successors': self.successors.tolist(),
+            'cumulative': self.cumulative.tolist(), 'sources': self.sources,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TransmissionModel':
+        model = cls(data['order'])
+        model.vocab = data['vocab']
+        model.types = data['types']
+        width = model.order + 1
+        flat = data['states']
+        model.states = {tuple(flat[i:i + width]): i // width for i in range(0, len(flat), width)}
+        model.offsets = array('I', data['offsets'])
+        model.successors = array('I', data['successors'])
+        model.cumulative = array('I', data['cumulative'])
+        model.sources = data['sources']
+        return model
+
+    def generate(self, ctype: str, rng: random.Random) -> str:
+        """One transmission for a content type; the same rng state always gives the same text"""
+        sources = self.sources[ctype]
+        fallback = None
+        for _ in range(self.ATTEMPTS):
+            text = self.draw(ctype, rng)
+            if text is None or text in sources:
+                continue
+            # Only the opening of a corpus line is a copy too, but better than a whole one
+            if any(source.startswith(text) for source in sources):
+                fallback = fallback or text
+                continue
+            return text
+        # A type whose lines share no words can only repeat them
+        return fallback or rng.choice(sources)
+
+    def draw(self, ctype: str, rng: random.Random) -> Optional[str]:
+        """One walk of the chain, or None if it repeated a sentence or ran out of tokens before an ending"""
+        type_id = self.types[ctype]
+        sentence_ends = self.sentence_ends
+        context = (self.START,) * self.order
+        words = []
+        sentences = set()
+        start = 0
+        for _ in range(self.MAX_TOKENS):
+            state = self.states.get((type_id, *context))
+            if state is None:
+                break
+            lo, hi = self.offsets[state], self.offsets[state + 1]
+            pick = int(rng.random() * self.cumulative[hi - 1])
+            token = self.successors[bisect_right(self.cumulative, pick, lo, hi)]
+            if token == self.END:
+                return ' '.join(words)
+            words.append(self.vocab[token])
+            if token in sentence_ends:
+                # A transmission stuck saying the same sentence over reads as a glitch in the chain
+                sentence = tuple(words[start:])
+                if sentence in sentences:
+                    return None
+                sentences.add(sentence)
+                start = len(words)
+                context = (self.BREAK,) * self.order
             else:
-                lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            lines.append(current_line.strip())
-        
+                context = (*context[1:], token)
+        return None
+
+class CommandError(Exception):
+    """Raised when command arguments fail to parse"""
+
+@dataclass
+class CommandParam:
+    name: str
+    type: Callable[[str], Any] = str
+    optional: bool = False
+    choices: Optional[Tuple[str, ...]] = None
+    variadic: bool = False
+
+    def parse(self, raw: str) -> Any:
+        if self.choices:
+            raw = raw.lower()
+        if self.choices and raw not in self.choices:
+            raise CommandError(f"Invalid {self.name}. Use: {' or '.join(self.choices)}")
+        try:
+            return self.type(raw)
+        except ValueError:
+            kind = "a number" if self.type in (int, float) else f"a valid {self.name}"
+            raise CommandError(f"Invalid {self.name}. Must be {kind}.")
+
+@dataclass
+class CommandSpec:
+    name: str
+    handler: Callable[..., None]
+    summary: str
+    section: str
+    params: Tuple[CommandParam, ...] = ()
+    aliases: Tuple[str, ...] = ()
+    terminal_only: bool = False
+    minutes: float = 0
+    activity: str = 'idle'
+    recorded: bool = True
+
+    def usage(self) -> str:
+        parts = ['/'.join((self.name,) + self.aliases)]
+        for param in self.params:
+            label = '|'.join(param.choices) if param.choices else param.name
+            if param.variadic:
+                label += '...'
+            parts.append(f"[{label}]" if param.optional else f"<{label}>")
+        return ' '.join(parts)
+
+    def parse(self, args: List[str]) -> List[Any]:
+        """Convert raw words into handler arguments"""
+        variadic = bool(self.params) and self.params[-1].variadic
+        if len(args) > len(self.params) and not variadic:
+            raise CommandError(f"Too many arguments for '{self.name}'.")
+        values = []
+        for i, param in enumerate(self.params):
+            if param.variadic:
+                values.append([param.parse(raw) for raw in args[i:]])
+            elif i < len(args):
+                values.append(param.parse(args[i]))
+            elif param.optional:
+                values.append(None)
+            else:
+                raise CommandError(f"Missing {param.name}.")
+        return values
+
+class CommandTrie:
+    """Prefix tree over command names for abbreviation and completion"""
+    def __init__(self):
+        self.root: Dict[Optional[str], Any] = {}
+
+    def insert(self, word: str):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[None] = word
+
+    def complete(self, prefix: str) -> List[str]:
+        """Return every inserted word starting with prefix, sorted"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        words = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is None:
+                    words.append(child)
+                else:
+                    stack.append(child)
+        return sorted(words)
+
+class CellGrid:
+    """Screen cells of the exploration view: a glyph, an SGR style and a surface kind each"""
+    EMPTY = 0
+    WALL = 1
+    FEATURE = 2
+    CORRUPT = 3
+    ENTITY = 4
+    
+    def __init__(self, cols: int):
+        self.cols = cols
+        self.chars: List[List[str]] = []
+        self.styles: List[List[str]] = []
+        self.kinds: List[bytearray] = []
+        # (row, distance, wall width, centre gap, perspective) for each row of the wall band
+        self.slices: List[Tuple[int, int, int, int, float]] = []
+
+    def add_row(self, cells: List[Tuple[str, str, int]]):
+        cells = cells[:self.cols] + [(' ', '', self.EMPTY)] * (self.cols - len(cells))
+        chars, styles, kinds = zip(*cells)
+        self.chars.append(list(chars))
+        self.styles.append(list(styles))
+        self.kinds.append(bytearray(kinds))
+
+    @property
+    def rows(self) -> int:
+        return len(self.chars)
+
+    def lines(self) -> Iterator[str]:
+        """Each row as text, emitting escapes only where the style changes"""
+        for chars, styles in zip(self.chars, self.styles):
+            parts = []
+            current = ''
+            for char, style in zip(chars, styles):
+                if style != current:
+                    parts.append(Colors.END + style if current else style)
+                    current = style
+                parts.append(char)
+            if current:
+                parts.append(Colors.END)
+            yield ''.join(parts)
+
+class ScreenEffect:
+    """One post-processing pass over a finished CellGrid"""
+    name = ''
+    budget_ms = 1.0
+    
+    def __init__(self):
+        self.enabled = True
+        self.cost_ms = 0.0
+        self.debt_ms = 0.0
+        self.runs = 0
+        self.skipped = 0
+
+    def active(self, game: 'Game') -> bool:
+        return True
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        raise NotImplementedError
+
+class FlickerEffect(ScreenEffect):
+    """Failing lights drop walls and fixtures one shade"""
+    name = 'flicker'
+    budget_ms = 1.0
+    SHADE_DOWN = {'█': '▓', '▓': '▒', '▒': '░', '#': '▒'}
+    
+    def active(self, game: 'Game') -> bool:
+        return game.lights_dimmed and game.player.sanity <= 60
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        shade = self.SHADE_DOWN
+        for chars, kinds in zip(grid.chars, grid.kinds):
+            if not any(kinds):
+                continue
+            for x, kind in enumerate(kinds):
+                if kind and chars[x] in shade:
+                    chars[x] = shade[chars[x]]
+
+class CorruptionEffect(ScreenEffect):
+    """Wall glyphs and screen edges replaced by corruption symbols"""
+    name = 'corruption'
+    budget_ms = 2.0
+    
+    def active(self, game: 'Game') -> bool:
+        return game.player.sanity < 70
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        sanity = game.player.sanity
+        chance = (100 - sanity) / 400
+        walls = [(y, x) for y, kinds in enumerate(grid.kinds) if CellGrid.WALL in kinds
+                 for x, kind in enumerate(kinds) if kind == CellGrid.WALL]
+        # Draw the number of hits instead of rolling once per cell
+        hits = int(len(walls) * chance + random.random())
+        targets = random.sample(walls, min(hits, len(walls)))
+        if sanity < 50:
+            last = grid.cols - 1
+            targets += [(y, x) for y in range(grid.rows) for x in (0, last) if random.random() < 0.1]
+        for y, x in targets:
+            grid.chars[y][x] = random.choice(game.corruption_chars)
+            grid.styles[y][x] = Colors.RED
+            grid.kinds[y][x] = CellGrid.CORRUPT
+
+class ChromaticEffect(ScreenEffect):
+    """Wall colors break up, and at very low sanity whole rows slip sideways"""
+    name = 'chromatic'
+    budget_ms = 2.0
+    
+    def active(self, game: 'Game') -> bool:
+        return game.player.sanity <= 50
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        palette = (Colors.RED, Colors.MAGENTA, Colors.CYAN)
+        for styles, kinds in zip(grid.styles, grid.kinds):
+            if CellGrid.WALL not in kinds:
+                continue
+            colors = iter(random.choices(palette, k=kinds.count(CellGrid.WALL)))
+            for x, kind in enumerate(kinds):
+                if kind == CellGrid.WALL:
+                    styles[x] = next(colors)
+        if game.player.sanity < 30:
+            for y in range(grid.rows):
+                if random.random() < 0.05:
+                    shift = random.choice((1, 2))
+                    grid.styles[y][shift:] = grid.styles[y][:-shift]
+
+class ZalgoEffect(ScreenEffect):
+    """Combining marks stacked on corrupted cells"""
+    name = 'zalgo'
+    budget_ms = 1.0
+    
+    def active(self, game: 'Game') -> bool:
+        return game.player.sanity < 30
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        for chars, kinds in zip(grid.chars, grid.kinds):
+            if CellGrid.CORRUPT not in kinds:
+                continue
+            for x, kind in enumerate(kinds):
+                if kind == CellGrid.CORRUPT and random.random() < 0.3:
+                    chars[x] += random.choice(game.zalgo_marks)
+
+class VignetteEffect(ScreenEffect):
+    """Tunnel vision: the screen border dims as sanity falls, and goes dark below 20"""
+    name = 'vignette'
+    budget_ms = 1.0
+    
+    def active(self, game: 'Game') -> bool:
+        return game.player.sanity < 70
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def mask(cols: int, rows: int, level: int) -> Tuple[Tuple[int, int, bool], ...]:
+        """(row, col, blackout) for every affected cell; depends only on size and sanity level"""
+        reach = level / 10 * 0.35
+        cells = []
+        for y in range(rows):
+            ny = (2 * y + 1) / rows - 1
+            for x in range(cols):
+                nx = (2 * x + 1) / cols - 1
+                edge = max(abs(nx), abs(ny))
+                if edge > 1 - reach:
+                    cells.append((y, x, level >= 8 and edge > 1 - reach / 3))
+        return tuple(cells)
+
+    def apply(self, grid: CellGrid, game: 'Game'):
+        level = min(10, (70 - game.player.sanity) * 10 // 70 + 1)
+        for y, x, blackout in self.mask(grid.cols, grid.rows, level):
+            if blackout and grid.kinds[y][x] != CellGrid.CORRUPT:
+                grid.chars[y][x] = ' '
+            grid.styles[y][x] = Colors.DIM
+
+class EffectsPipeline:
+    """Ordered screen effects, each run at most once per frame within its own time budget"""
+    def __init__(self, effects: Iterable[ScreenEffect]):
+        self.effects: Dict[str, ScreenEffect] = {effect.name: effect for effect in effects}
+
+    def run(self, grid: CellGrid, game: 'Game'):
+        clock = time.perf_counter
+        for effect in self.effects.values():
+            if not effect.enabled or not effect.active(game):
+                continue
+            # A pass that overran its budget sits out frames until the overrun is paid back
+            if effect.debt_ms > 0:
+                effect.debt_ms -= effect.budget_ms
+                effect.skipped += 1
+                continue
+            started = clock()
+            effect.apply(grid, game)
+            cost = (clock() - started) * 1000
+            effect.cost_ms = cost if not effect.runs else 0.8 * effect.cost_ms + 0.2 * cost
+            effect.runs += 1
+            effect.debt_ms += max(0.0, cost - effect.budget_ms)
+
+class Scrollback:
+    """Fixed-capacity ring of output lines, with text and SGR styles stored separately"""
+    CSI_PATTERN = re.compile(r'\033\[[0-9;?]*[A-Za-z]')
+    CSI_PATTERN_SPLIT = re.compile(r'(\033\[[0-9;?]*[A-Za-z])')
+    MAX_LINE = 512
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.texts: List[str] = [''] * capacity
+        # (offset, escape sequence) pairs per line; sequences are interned, unstyled lines hold None
+        self.styles: List[Optional[Tuple[Tuple[int, str], ...]]] = [None] * capacity
+        self.total = 0
+        self.partial = ''
+        self.suspended = 0
+        self.joined: Tuple[int, str, array] = (-1, '', array('I'))
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def clear(self):
+        self.texts = [''] * self.capacity
+        self.styles = [None] * self.capacity
+        self.total = 0
+        self.partial = ''
+
+    def feed(self, data: str):
+        """Record written text, completing a line at each newline"""
+        if self.suspended:
+            return
+        lines = (self.partial + data).split('\n')
+        self.partial = lines.pop()[-4 * self.MAX_LINE:]
         for line in lines:
-            padding = max_width - len(line)
-            print(f"{Colors.CYAN}║{Colors.END} {content_col}{line}{Colors.END}{' ' * padding} {Colors.CYAN}║{Colors.END}")
+            self.append(line)
+
+    def append(self, raw: str):
+        raw = raw.replace('\a', '').rstrip('\r')
+        raw = raw[raw.rfind('\r') + 1:]  # A carriage return redraws the line, as on screen
+        parts = []
+        styles = []
+        length = 0
+        pos = 0
+        for match in self.CSI_PATTERN.finditer(raw):
+            chunk = raw[pos:match.start()]
+            parts.append(chunk)
+            length += len(chunk)
+            # Only colors are worth replaying; cursor movement and clears are dropped
+            if match.group().endswith('m') and length <= self.MAX_LINE:
+                styles.append((length, sys.intern(match.group())))
+            pos = match.end()
+        parts.append(raw[pos:])
+        slot = self.total % self.capacity
+        self.texts[slot] = ''.join(parts)[:self.MAX_LINE]
+        self.styles[slot] = tuple(styles) or None
+        self.total += 1
+
+    def slot(self, index: int) -> int:
+        return (self.total - len(self) + index) % self.capacity
+
+    def render(self, index: int) -> str:
+        """Line text with its styles re-applied"""
+        slot = self.slot(index)
+        text = self.texts[slot]
+        styles = self.styles[slot]
+        if not styles:
+            return text
+        parts = []
+        pos = 0
+        for offset, code in styles:
+            parts.append(text[pos:offset])
+            parts.append(code)
+            pos = offset
+        parts.append(text[pos:])
+        return ''.join(parts)
+
+    def index(self) -> Tuple[str, array]:
+        """All retained text joined by newlines plus each line's start offset, rebuilt only after new output"""
+        if self.joined[0] != self.total:
+            texts = [self.texts[self.slot(i)] for i in range(len(self))]
+            starts = array('I', itertools.accumulate((len(text) + 1 for text in texts), initial=0))
+            self.joined = (self.total, '\n'.join(texts), starts)
+        return self.joined[1], self.joined[2]
+
+    def search(self, pattern: re.Pattern) -> List[int]:
+        """Indexes of lines containing a match, oldest first, from one pass over the joined text"""
+        text, starts = self.index()
+        hits = []
+        for match in pattern.finditer(text):
+            line = bisect_right(starts, match.start()) - 1
+            if not hits or hits[-1] != line:
+                hits.append(line)
+        return hits
+
+class StatusBar:
+    """Status lines cached per segment, with sanity glitches overlaid on the cached text"""
+    SEPARATOR = ' │ '
+    
+    def __init__(self, *lines: Tuple[Tuple[Callable[[], Tuple[Any, ...]], Callable[..., str]], ...]):
+        # Each segment is (probe, render): probe reads the values shown, render formats them
+        self.lines = lines
+        self.segments: Dict[Tuple[int, int], Tuple[Tuple[Any, ...], str]] = {}
+        self.key: Any = None
+        # Per line, the text split into alternating plain runs and escape sequences
+        self.parts: List[List[str]] = []
+        self.mode = Colors.MODE
+        self.renders = 0
+
+    def refresh(self, key: Any):
+        """Re-probe when key (state versions) moves, re-rendering only segments whose values changed"""
+        if key == self.key:
+            return
+        self.key = key
+        if Colors.MODE != self.mode:
+            self.mode = Colors.MODE
+            self.segments.clear()
+        self.parts = []
+        for row, segments in enumerate(self.lines):
+            texts = []
+            for column, (probe, render) in enumerate(segments):
+                values = probe()
+                cached = self.segments.get((row, column))
+                if cached is None or cached[0] != values:
+                    cached = (values, render(*values))
+                    self.segments[(row, column)] = cached
+                    self.renders += 1
+                texts.append(cached[1])
+            self.parts.append(Scrollback.CSI_PATTERN_SPLIT.split(self.SEPARATOR.join(texts)))
+
+    def render(self, glitch_chance: float = 0.0, glyphs: Tuple[str, ...] = ()) -> List[str]:
+        return [self.glitch(parts, glitch_chance, glyphs) for parts in self.parts]
+
+    @staticmethod
+    def glitch(parts: List[str], chance: float, glyphs: Tuple[str, ...]) -> str:
+        """Swap random visible characters for glyphs, leaving escape sequences intact"""
+        if chance <= 0:
+            return ''.join(parts)
+        log_miss = math.log(1 - chance)
         
-        print(f"{Colors.CYAN}╚{'═' * 68}╝{Colors.END}")
+        def gap() -> int:
+            # Geometric gaps between hits: one random draw per glitch, not per character
+            return int(math.log(1.0 - random.random()) / log_miss)
+        
+        skip = gap()
+        out = []
+        style = ''
+        for i, part in enumerate(parts):
+            if i % 2:
+                style = part
+                out.append(part)
+                continue
+            if skip >= len(part):
+                skip -= len(part)
+                out.append(part)
+                continue
+            chars = list(part)
+            while skip < len(chars):
+                # Only single-column characters are swapped, so a glitched line keeps its width
+                if TextLayout.char_width(chars[skip]) == 1:
+                    chars[skip] = Colors.glitch() + random.choice(glyphs) + Colors.END + style
+                    skip += 1 + gap()
+                else:
+                    skip += 1
+            skip -= len(chars)
+            out.append(''.join(chars))
+        return ''.join(out)
+
+class OutputTee:
+    """File-like wrapper that copies everything written to a stream into a Scrollback"""
+    def __init__(self, stream, scrollback: Scrollback):
+        self.stream = stream
+        self.scrollback = scrollback
+
+    def write(self, data: str) -> int:
+        self.scrollback.feed(data)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+class RewindBuffer:
+    """Step history of flat state dicts stored as deltas between periodic full keyframes"""
+    KEYFRAME_INTERVAL = 32
+    GONE = object()
+    
+    def __init__(self, budget: int):
+        self.budget = budget
+        # (is keyframe, state or delta, approximate bytes)
+        self.entries: deque = deque()
+        self.keyframes: deque = deque()
+        self.first = 0
+        self.used = 0
+        self.head: Dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def last(self) -> int:
+        return self.first + len(self.entries) - 1
+
+    @staticmethod
+    def size_of(data: Dict[Any, Any]) -> int:
+        return sys.getsizeof(data) + sum(sys.getsizeof(value) for value in data.values())
+
+    def record(self, state: Dict[Any, Any]) -> bool:
+        """Append a step if anything changed since the last one"""
+        head, gone = self.head, self.GONE
+        if self.entries and self.last - self.keyframes[-1] < self.KEYFRAME_INTERVAL - 1:
+            delta = {key: value for key, value in state.items() if head.get(key, gone) != value}
+            delta.update((key, gone) for key in head.keys() - state.keys())
+            if not delta:
+                return False
+            entry = (False, delta, self.size_of(delta))
+        elif self.entries and state == head:
+            return False
+        else:
+            self.keyframes.append(self.last + 1)
+            entry = (True, state, self.size_of(state))
+        self.entries.append(entry)
+        self.used += entry[2]
+        self.head = state
+        self.evict()
+        return True
+
+    def evict(self):
+        """Drop whole keyframe groups, oldest first, until back under budget"""
+        while self.used > self.budget and len(self.keyframes) > 1:
+            self.keyframes.popleft()
+            while self.first < self.keyframes[0]:
+                self.used -= self.entries.popleft()[2]
+                self.first += 1
+
+    def state_at(self, step: int) -> Dict[Any, Any]:
+        """Rebuild a step by replaying deltas from the nearest keyframe at or before it"""
+        keyframe = self.keyframes[bisect_right(self.keyframes, step) - 1]
+        state = dict(self.entries[keyframe - self.first][1])
+        for index in range(keyframe + 1 - self.first, step + 1 - self.first):
+            for key, value in self.entries[index][1].items():
+                if value is self.GONE:
+                    del state[key]
+                else:
+                    state[key] = value
+        return state
+
+    def rewind(self, steps: int) -> Dict[Any, Any]:
+        """Discard the newest steps and return the state that is now the latest"""
+        target = self.last - steps
+        if steps < 1 or target < self.first:
+            raise ValueError(f"only {len(self.entries) - 1} steps recorded")
+        state = self.state_at(target)
+        while self.last > target:
+            self.used -= self.entries.pop()[2]
+        while self.keyframes[-1] > target:
+            self.keyframes.pop()
+        self.head = state
+        return state
+
+class Counter:
+    """Monotonically increasing total"""
+    kind = 'counter'
+    
+    def __init__(self):
+        self.value = 0.0
+
+    def update(self, amount: float):
+        self.value += amount
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        yield '', {}, self.value
+
+    def snapshot(self):
+        return self.value
+
+class Gauge(Counter):
+    """Last recorded level"""
+    kind = 'gauge'
+    
+    def update(self, value: float):
+        self.value = value
+
+class Histogram:
+    """Bucketed distribution of durations in seconds"""
+    kind = 'histogram'
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def update(self, value: float):
+        self.counts[bisect_left(self.BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        total = 0
+        for bound, count in zip(self.BUCKETS + (math.inf,), self.counts):
+            total += count
+            yield ('+Inf' if bound == math.inf else repr(bound)), total
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for bound, total in self.cumulative():
+            yield '_bucket', {'le': bound}, total
+        yield '_sum', {}, self.sum
+        yield '_count', {}, self.count
+
+    def snapshot(self):
+        return {'count': self.count, 'sum': self.sum, 'buckets': dict(self.cumulative())}
+
+class MetricsRegistry:
+    """In-process metrics, exported as JSON lines and Prometheus text files"""
+    KINDS = {'counter': Counter, 'gauge': Gauge, 'histogram': Histogram}
+    LABEL_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n'})
+    
+    def __init__(self, definitions: Dict[str, Tuple[str, str]], session: str):
+        self.definitions = definitions
+        self.session = session
+        self.series: Dict[str, Dict[Tuple[Tuple[str, str], ...], Any]] = {name: {} for name in definitions}
+        self.collectors: List[Callable[[], None]] = []
+
+    def record(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self.series[name]
+        metric = series.get(key)
+        if metric is None:
+            metric = series[key] = self.KINDS[self.definitions[name][0]]()
+        metric.update(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        self.record(name, amount, **labels)
+
+    def total(self, name: str) -> float:
+        return sum(metric.value for metric in self.series[name].values())
+
+    def format_labels(self, labels: Dict[str, str]) -> str:
+        pairs = ','.join(f'{key}="{str(value).translate(self.LABEL_ESCAPES)}"' for key, value in labels.items())
+        return '{' + pairs + '}'
+
+    def prometheus_text(self) -> str:
+        lines = []
+        for name, (kind, help_text) in self.definitions.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, metric in self.series[name].items():
+                for suffix, extra, value in metric.samples():
+                    labels = {'session': self.session, **dict(key), **extra}
+                    lines.append(f"{name}{suffix}{self.format_labels(labels)} {float(value)!r}")
+        return '\n'.join(lines) + '\n'
+
+    def json_record(self) -> dict:
+        return {
+            'time': round(time.time(), 3),
+            'session': self.session,
+            'metrics': {name: [{'labels': dict(key), 'value': metric.snapshot()} for key, metric in series.items()]
+                        for name, series in self.series.items() if series},
+        }
+
+    def export(self, directory: str):
+        """Append a JSON line and atomically replace the Prometheus textfile"""
+        import json
+        for collector in self.collectors:
+            collector()
+        os.makedirs(directory, exist_ok=True)
+        stem = os.path.join(directory, f"listener-{self.session}")
+        with open(stem + '.jsonl', 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.json_record()) + '\n')
+        # Textfile collectors only read *.prom, so the partial file is never scraped
+        with open(stem + '.prom.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(stem + '.prom.tmp', stem + '.prom')
+
+class SignalFingerprints:
+    """Seen-before check for transmissions: this session's submissions exactly, earlier ones in a fixed-size Bloom filter"""
+    BITS = 1 << 27          # 16 MiB; about 0.2% false positives after ten million signals
+    HASHES = 7
+    RECENT = 4096
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # Submissions still inside the rewind window; only older ones reach the Bloom bits
+        self.recent: deque = deque()
+        self.recent_counts: Dict[bytes, int] = {}
+        self.flushed = 0
+
+    @staticmethod
+    def fingerprint(signal: Signal) -> bytes:
+        """Digest of the content type and the transmission's words, whatever carrier it arrived on"""
+        import hashlib
+        words = ' '.join(re.findall(r'[a-z0-9]+', signal.decoded_content.lower()))
+        return hashlib.blake2b(f"{signal.content_type}\0{words}".encode('utf-8'), digest_size=16).digest()
+
+    @cached_property
+    def bits(self):
+        """The filter's bit array: a shared mapping of the history file, or plain memory without one"""
+        if self.path:
+            import mmap
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, 'a+b') as f:
+                    if os.fstat(f.fileno()).st_size != self.BITS // 8:
+                        f.truncate(0)
+                        f.truncate(self.BITS // 8)
+                    return mmap.mmap(f.fileno(), self.BITS // 8)
+            except (OSError, ValueError):
+                pass  # Unwritable data directory: remember this session only
+        return bytearray(self.BITS // 8)
+
+    def positions(self, fingerprint: bytes) -> Iterator[int]:
+        # Double hashing: two 64-bit halves of the digest stand in for k independent hashes
+        h1 = int.from_bytes(fingerprint[:8], 'little')
+        h2 = int.from_bytes(fingerprint[8:], 'little') | 1
+        mask = self.BITS - 1
+        for i in range(self.HASHES):
+            yield (h1 + i * h2) & mask
+
+    def seen(self, fingerprint: bytes) -> Optional[str]:
+        """'recent' for a submission this session, 'probable' for a Bloom filter hit, None if new"""
+        if fingerprint in self.recent_counts:
+            return 'recent'
+        bits = self.bits
+        if all(bits[p >> 3] & (1 << (p & 7)) for p in self.positions(fingerprint)):
+            return 'probable'
+        return None
+
+    def add(self, fingerprint: bytes):
+        self.recent.append(fingerprint)
+        self.recent_counts[fingerprint] = self.recent_counts.get(fingerprint, 0) + 1
+        if len(self.recent) > self.RECENT:
+            self.flush(1)
+
+    @property
+    def submitted(self) -> int:
+        """Submissions so far; rewind captures this and truncates back to it"""
+        return self.flushed + len(self.recent)
+
+    def truncate(self, submitted: int):
+        """Forget submissions past a rewound point, as far back as the unflushed ones go"""
+        while self.recent and self.submitted > submitted:
+            self.forget(self.recent.pop())
+
+    def forget(self, fingerprint: bytes):
+        count = self.recent_counts[fingerprint] - 1
+        if count:
+            self.recent_counts[fingerprint] = count
+        else:
+            del self.recent_counts[fingerprint]
+
+    def flush(self, count: Optional[int] = None):
+        """Write the oldest unflushed submissions, or all of them, into the Bloom bits"""
+        bits = self.bits
+        for _ in range(len(self.recent) if count is None else count):
+            fingerprint = self.recent.popleft()
+            self.forget(fingerprint)
+            for p in self.positions(fingerprint):
+                bits[p >> 3] |= 1 << (p & 7)
+            self.flushed += 1
+
+    def close(self):
+        if self.recent:
+            self.flush()
+        bits = self.__dict__.pop('bits', None)
+        if bits is not None and not isinstance(bits, bytearray):
+            bits.close()
+
+class RunHistory:
+    """Finished runs and their per-day summaries in a local SQLite database"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            seed INTEGER NOT NULL,
+            started REAL NOT NULL,
+            ended REAL NOT NULL,
+            days REAL NOT NULL,
+            credits INTEGER NOT NULL,
+            signals INTEGER NOT NULL,
+            cause TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_by_credits ON runs (credits DESC, days DESC);
+        CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed, days);
+        CREATE TABLE IF NOT EXISTS days (
+            run_id INTEGER NOT NULL REFERENCES runs (id),
+            day INTEGER NOT NULL,
+            credits INTEGER NOT NULL,
+            signals INTEGER NOT NULL,
+            sanity INTEGER NOT NULL,
+            power REAL NOT NULL,
+            oxygen REAL NOT NULL,
+            PRIMARY KEY (run_id, day)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS days_by_day ON days (day, credits);
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def default_path() -> str:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        return os.path.join(base, 'the_listener', 'runs.db')
+
+    @cached_property
+    def db(self):
+        import sqlite3
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(self.SCHEMA)
+        return db
+
+    def record(self, run: Dict[str, Any], days: List[Tuple[int, int, int, int, float, float]]) -> int:
+        """Write a run and all of its day summaries in a single transaction"""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (seed, started, ended, days, credits, signals, cause) "
+                "VALUES (:seed, :started, :ended, :days, :credits, :signals, :cause)", run)
+            run_id = cursor.lastrowid
+            self.db.executemany("INSERT OR REPLACE INTO days VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                [(run_id, *day) for day in days])
+        return run_id
+
+    def count(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def best(self, limit: int = 10) -> List[Tuple[Any, ...]]:
+        """Highest-earning runs, read straight off the credits index"""
+        return self.db.execute("SELECT credits, days, signals, seed, cause, ended FROM runs "
+                               "ORDER BY credits DESC, days DESC LIMIT ?", (limit,)).fetchall()
+
+    def seeds(self, limit: int = 10, seed: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """(seed, runs, average days, best days) for the longest-surviving seeds, or one seed"""
+        if seed is not None:
+            return self.db.execute("SELECT seed, COUNT(*), AVG(days), MAX(days) FROM runs WHERE seed = ?",
+                                   (seed,)).fetchall()
+        return self.db.execute("SELECT seed, COUNT(*), AVG(days), MAX(days) FROM runs GROUP BY seed "
+                               "ORDER BY AVG(days) DESC LIMIT ?", (limit,)).fetchall()
+
+    def trend(self, limit: int = 14) -> List[Tuple[Any, ...]]:
+        """(day, runs reaching it, average credits held) for the first days of every run"""
+        return self.db.execute("SELECT day, COUNT(*), AVG(credits) FROM days WHERE day <= ? "
+                               "GROUP BY day ORDER BY day", (limit,)).fetchall()
+
+    def close(self):
+        if 'db' in self.__dict__:
+            self.db.close()
+            del self.__dict__['db']
+
+class Game:
+    MINUTES_PER_DAY = 24 * 60
+    MAX_WAIT_HOURS = 72
+    SHIFT_START = 8 * 60
+    REST_MINUTES = 8 * 60
+    MEAN_MALFUNCTION_INTERVAL = 360
+    MAX_SCRIPT_DEPTH = 8
+    WALL_RGB = (60, 255, 110)
+    VIEW_DISTANCE = 8
+    STARTING_ENTITIES = {'drone': 4, 'item': 6}
+    SIGNAL_BACKLOG = 20
+    METRICS_INTERVAL = 15.0
+    REWIND_BUDGET = 256 * 1024
+    HISTORY_MATCHES = 50
+    METRICS = {
+        'listener_signals_scanned_total': ('counter', "Signals found by scans"),
+        'listener_signals_decoded_total': ('counter', "Signals decoded"),
+        'listener_signals_submitted_total': ('counter', "Signals submitted to central command"),
+        'listener_credits_earned_total': ('counter', "Credits earned from submissions"),
+        'listener_credits_per_day': ('gauge', "Credits earned per station day so far"),
+        'listener_credits': ('gauge', "Current credit balance"),
+        'listener_sanity_percent': ('gauge', "Operator sanity"),
+        'listener_resource_percent': ('gauge', "Life support level by resource"),
+        'listener_station_day': ('gauge', "Current station day"),
+        'listener_command_seconds': ('histogram', "Wall time spent in each command handler"),
+        'listener_frame_seconds': ('histogram', "Wall time to render one frame"),
+    }
+    TRANSMISSIONS = {
+        "data_stream": (
+            "Binary sequence detected: 01001000 01000101 01001100 01010000",
+            "Telemetry data from Sector 7-G. All systems nominal. Wait... additional data appended.",
+            "Scientific log entry #4782: The readings are impossible. We shouldn't be seeing this.",
+            "Astronomical data corrupted. Stars in wrong positions. Constellations altered.",
+            "Telemetry data from the relay buoy. All systems nominal. The buoy was decommissioned in 2091.",
+            "Scientific log entry #4790: The readings are getting stronger. The source is moving closer.",
+            "Binary sequence repeating: 01001000 01000101 01001100 01010000. The sequence spells HELP.",
+            "Sensor log from Sector 7-G. The readings are impossible. The source is inside the station.",
+            "Diagnostic dump: All systems nominal. Crew count: 4. Crew aboard: 1.",
+            "Telemetry data corrupted. Timestamps from tomorrow. Wait... the timestamps are still counting.",
+            "Scientific log entry #4801: We shouldn't be seeing this. The stars are in wrong positions again.",
+            "Sensor log from the lower deck. Temperature falling. Something is drawing power from the station.",
+            "Astronomical data appended. The source is moving closer. Impact estimate withheld.",
+            "Diagnostic dump: Crew count: 4. The fourth heartbeat is coming from the walls.",
+        ),
+        "voice": (
+            "[Static]... can you hear... [static]... they're coming... [signal lost]",
+            "Help us. We've been here so long. Don't let them find you.",
+            "Hello? Is anyone there? I'm trapped in... [interference]... observatory...",
+            "You shouldn't be listening. STOP. Turn it off. Turn it ALL off.",
+            "The void speaks to those who listen. Will you answer?",
+            "[Breathing sounds] ...behind you... [laughter] ...always watching...",
+            "Hello? Can you hear me? I'm still on the station. The lights went out days ago.",
+            "If you can hear this, don't answer. The void speaks to those who answer.",
+            "This is the relay crew. We've been here so long the clocks stopped. Can you hear us?",
+            "Is anyone there? The hull is knocking back. Don't let them in.",
+            "We tried to turn it off. The signal kept talking. It knows your name.",
+            "Help us. I'm trapped in the dark. Something is breathing behind the door.",
+            "You shouldn't be listening. It knows you are listening. [signal lost]",
+            "Can you hear me? Don't answer the voice on the night shift. It sounds like you.",
+        ),
+        "coordinates": (
+            "Coordinates: 23h 17m 12s, -45° 32' 18\". Location: Unknown Deep Space.",
+            "Star chart detected. WARNING: Constellations do not match any known patterns.",
+            "Navigation data: Destination coordinates lead to empty space. Or do they?",
+            "Orbital mechanics data. Calculating trajectory... Impact in [REDACTED] days.",
+            "Coordinates: 04h 51m 40s, +12° 06' 55\". Location: This station.",
+            "Navigation data: Destination coordinates match this station. Arrival in [REDACTED] days.",
+            "Star chart detected. The chart shows a star that was not there yesterday.",
+            "Orbital mechanics data. The station orbit is decaying. Or is something pulling?",
+            "Navigation data: Course plotted from empty space to this station. Or from this station to empty space?",
+            "Coordinates: 23h 17m 12s, -45° 32' 18\". The same coordinates as last night. Location: Closer.",
+            "Star chart detected. WARNING: Three stars have gone dark along the plotted course.",
+            "Orbital mechanics data. Calculating trajectory... Trajectory ends at your airlock.",
+            "Location: Unknown Deep Space. Distance shrinking by the hour.",
+            "Navigation data: Destination coordinates do not match any known patterns.",
+        ),
+        "blueprint": (
+            "Schematic decoded: Unknown device. Purpose unclear. Materials: Available on station.",
+            "Construction plans for... something. The design hurts to look at.",
+            "Blueprint fragments: Assembly instructions in unknown language.",
+            "Technical diagram: Device components already in your storage room.",
+            "Schematic decoded: Antenna array. Purpose unclear. The array points inward.",
+            "Construction plans for a door. The door opens from the other side.",
+            "Blueprint fragments: The design matches the station. One extra room.",
+            "Technical diagram: Device components wired into the station generator.",
+            "Schematic decoded: Unknown device. Power source: the operator.",
+            "Assembly instructions in unknown language. The diagrams show your hands.",
+            "Construction plans for the station. Dated forty years before it was built.",
+            "Technical diagram: The design hurts to look at. Materials: Available in your storage room.",
+            "Blueprint fragments: Purpose unclear. Assembly already in progress.",
+            "Schematic decoded: A receiver. The receiver is listening to you.",
+        ),
+        "warning": (
+            "ALERT: Containment breach detected at facility [COORDINATES DELETED]",
+            "EVACUATION NOTICE: All personnel must leave immediately. This is not a drill.",
+            "WARNING: Do not trust the signals. Do not trust the voices. Do not trust yourself.",
+            "EMERGENCY BROADCAST: If you receive this message, you are already dead.",
+            "ALERT: Containment breach detected on this station. Seal the lower deck.",
+            "EVACUATION NOTICE: All personnel must report to the airlock. Do not look back.",
+            "WARNING: Do not answer the signals. This is not a drill.",
+            "EMERGENCY BROADCAST: If you receive this message, seal the doors and turn off the receiver.",
+            "ALERT: Life support failure detected. All personnel must leave immediately.",
+            "WARNING: Do not trust the station AI. It is not the station AI.",
+            "EMERGENCY BROADCAST: Containment breach detected. If you receive this message, you are not alone.",
+            "EVACUATION NOTICE: The last shuttle left three days ago. This is not a drill.",
+            "WARNING: Do not trust the voices on the night shift. Do not trust yourself.",
+            "ALERT: Unidentified life signs detected at facility [COORDINATES DELETED]",
+        ),
+        "unknown": (
+            "[INCOMPREHENSIBLE SOUNDS] ...ṫ̶̻h̵͉̔e̶̝̾ ̸̣̈v̶̰̈́o̵̰̅i̵̳̐d̶̰̈́ ̷̣̈́l̶̰̾i̸̦̓s̶̰̈́t̷̰̊e̵̬̊n̵̢̛s̶̰̈́...",
+            "Signal structure unknown. Origin: Beyond observable universe.",
+            "Content cannot be parsed. Your mind cannot process this information safely.",
+            "̸̱͝W̷̘̾Ë̵́͜ ̴̰̾A̷̘̾R̷̘͝E̵̬͝ ̵̝̾C̵̱͠O̷̰͝M̶̙͝I̷̱̾N̵̰̾G̶̱͝",
+            "Signal structure shifting. Origin: Inside the receiver.",
+            "Content cannot be parsed. The pattern rearranges itself when observed.",
+            "[INCOMPREHENSIBLE SOUNDS] ...a voice counting backwards from a number that does not exist...",
+            "Signal structure unknown. The pattern repeats your last thought.",
+            "Your mind cannot process this information. Your mind is processing this information.",
+            "Origin: Beyond observable universe. Destination: You.",
+            "Content cannot be parsed. Content is parsing you.",
+            "[INCOMPREHENSIBLE SOUNDS] ...the pattern rearranges itself... ...it is almost a word...",
+            "Signal structure unknown. Origin: Here. Time of origin: Now.",
+            "The pattern repeats. The pattern repeats. The pattern is waiting for you to answer.",
+        ),
+    }
+    # Time a decode takes to stream its whole transmission
+    DECODE_SECONDS = 1.5
+    # Share of a signal's value paid for a repeat: exact matches this session, Bloom filter hits before it
+    REPEAT_VALUE = {'recent': 0.25, 'probable': 0.5}
+    REPEAT_NOTES = {'recent': "submitted earlier this session", 'probable': "probably submitted on an earlier shift"}
+    SANITY_LOSS = {
+        "data_stream": 1,
+        "voice": 3,
+        "coordinates": 2,
+        "blueprint": 2,
+        "warning": 5,
+        "unknown": 8
+    }
+    WATERFALL_RATE = 30
+    WATERFALL_RAMP = (' ', '░', '▒', '▓', '█')
+    BEACON_FREQUENCIES = (1420.4, 2800.0, 3300.5, 4500.2, 5200.8, 6100.3)
+    SWEEP_CHANNELS = 1024
+    SWEEP_SECONDS_PER_CHANNEL = 0.001
+    glitch_chars = ('░', '▒', '▓', '█', '▄', '▀', '■', '□', '▪', '▫', '§', '¶', '†', '‡', '∴', '∵', '◊', '○', '●', '◘', '◙')
+    corruption_chars = ('§', 'µ', '¿', '¶', '†', '‡', '∞', '≈', '∴', '∵', '◊')
+    zalgo_marks = ('̃', '̀', '́', '̂', '̄', '̆', '̇', '̈', '̊', '̋', '̌', '̐', '̒')
+    
+    def __init__(self):
+        self.player = Player(x=2, y=2, direction=Direction.NORTH, 
+                           credits=100, sanity=100, current_mode=GameMode.TERMINAL)
+        self.resources = Resources(power=100, oxygen=100, water_filters=10,
+                                  food_cartridges=10, repair_parts=5)
+        self.life_support = ResourceModel()
+        self.current_signal: Optional[Signal] = None
+        self.scanned_signals: List[Signal] = []
+        self.signal_backlog: deque = deque(maxlen=self.SIGNAL_BACKLOG)
+        self.decoded_signals: List[Signal] = []
+        self.game_time = float(self.SHIFT_START)
+        self.scheduler = EventScheduler(self.game_time)
+        self.running = True
+        self.discovered_signals = 0
+        self.lights_dimmed = False
+        self.max_history = 100000
+        self.terminal_history = Scrollback(self.max_history)
+        self.fast_mode = False
+        self.clock = Clock()
+        self.script_lines: deque = deque()
+        self.script_depth = 0
+        self.startup_profile = False
+        self.filters = FilterPipeline()
+        self.effects = EffectsPipeline([FlickerEffect(), CorruptionEffect(), ChromaticEffect(),
+                                        ZalgoEffect(), VignetteEffect()])
+        self.wav_library: Optional[WavLibrary] = None
+        self.corpus_dir: Optional[str] = None
+        self.metrics = MetricsRegistry(self.METRICS, session=str(os.getpid()))
+        self.metrics.collectors.append(self.collect_metrics)
+        self.metrics_dir: Optional[str] = None
+        self.metrics_exported = time.monotonic()
+        # Held by the main thread except while it waits at the prompt, when the exporter may take it
+        self.metrics_lock = None
+        self.metrics_stop = None
+        self.audio: Optional[AmbientAudio] = None
+        self.seed: Optional[int] = None
+        self.started = time.time()
+        self.outcome = 'ended'
+        self.day_summaries: List[Tuple[int, int, int, int, float, float]] = []
+        self.history: Optional[RunHistory] = None
+        self.fingerprint_path: Optional[str] = None
+        self.scanned_segments = set()
+        self.sweep_seed = random.getrandbits(32)
+        self._map_rows_mode: Optional[str] = None
+        self._map_rows: List[List[str]] = []
+        self._waterfall_palette_key: Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]] = None
+        self._waterfall_palette: Tuple[Tuple[str, str], ...] = ()
+        self.detections = DetectionIndex(ChannelSweep.CHANNELS)
+        self.schedule_station_events()
+        self.rewind = RewindBuffer(self.REWIND_BUDGET)
+        self.rewind.record(self.capture_state())
+    
+    @cached_property
+    def spectrum_analyzer(self) -> SpectrumAnalyzer:
+        return SpectrumAnalyzer()
+
+    @cached_property
+    def station(self) -> Station:
+        # Built on first use so it stays off the path to the first prompt
+        return Station()
+
+    @cached_property
+    def sweep(self) -> ChannelSweep:
+        # Its noise floor and occupancy tables wait for the first scan
+        return ChannelSweep(self.BEACON_FREQUENCIES, seed=self.sweep_seed)
+
+    @cached_property
+    def entities(self) -> EntityWorld:
+        # Needs the station, so it is populated on first use too
+        entities = EntityWorld(self.station)
+        for kind, count in self.STARTING_ENTITIES.items():
+            for _ in range(count):
+                entities.spawn(kind)
+        return entities
+
+    @cached_property
+    def lights(self) -> LightMap:
+        lights = LightMap(self.station, random.Random(random.getrandbits(32)))
+        lights.set_power(self.resources.power)
+        return lights
         
-        # Sanity impact based on content type
-        sanity_loss = {
-            "data_stream": 1,
-            "voice": 3,
-            "coordinates": 2,
-            "blueprint": 2,
-            "warning": 5,
-            "unknown": 8
+    @property
+    def day(self) -> int:
+        return int(self.game_time // self.MINUTES_PER_DAY) + 1
+
+    def station_clock(self) -> str:
+        minutes = int(self.game_time % self.MINUTES_PER_DAY)
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    def schedule_station_events(self):
+        """Seed the scheduler with malfunctions, ambient sounds and the nightly summary"""
+        self.schedule_malfunction()
+        self.schedule_ambient_sound()
+        self.scheduler.schedule_at(self.day * self.MINUTES_PER_DAY, 'day_summary', self.summarize_day,
+                                   interval=self.MINUTES_PER_DAY)
+
+    def summarize_day(self):
+        """Note how the day that just ended finished, for the run history"""
+        day = int(self.game_time // self.MINUTES_PER_DAY)
+        self.day_summaries.append((day, self.player.credits, self.discovered_signals, self.player.sanity,
+                                   round(self.resources.power, 1), round(self.resources.oxygen, 1)))
+
+    def advance_time(self, minutes: float, activity: str = 'idle'):
+        """Move the game clock forward, integrating life support between due events"""
+        if minutes <= 0:
+            return
+        target = self.game_time + minutes
+        for event in self.scheduler.pop_due(target):
+            self.life_support.advance(self.resources, event.due - self.game_time, activity)
+            self.game_time = event.due
+            event.action()
+        self.life_support.advance(self.resources, target - self.game_time, activity)
+        self.game_time = target
+        self.entities.tick()
+        self.lights.set_power(self.resources.power)
+
+    def format_duration(self, minutes: Optional[float]) -> str:
+        if minutes is None:
+            return "stable"
+        if minutes >= self.MINUTES_PER_DAY:
+            return f"{minutes / self.MINUTES_PER_DAY:.1f} days"
+        return f"{minutes / 60:.1f} hours"
+
+    def schedule_malfunction(self):
+        delay = random.expovariate(1 / self.MEAN_MALFUNCTION_INTERVAL)
+        self.scheduler.schedule(delay, 'malfunction', self.malfunction_event)
+
+    def malfunction_event(self):
+        self.trigger_random_event()
+        self.schedule_malfunction()
+
+    def schedule_ambient_sound(self):
+        # Lower sanity means the station gets noisier
+        mean_delay = 30 + self.player.sanity * 3
+        self.scheduler.schedule(random.expovariate(1 / mean_delay), 'ambient_sound', self.ambient_sound_event)
+
+    def ambient_sound_event(self):
+        anomalies = self.entities.of_kind('anomaly')
+        if self.player.sanity < 60:
+            self.trigger_sound_log()
+            # The lower sanity falls, the more of them there are
+            if len(anomalies) < (60 - self.player.sanity) // 10 + 1:
+                self.entities.spawn('anomaly')
+        elif anomalies:
+            self.entities.despawn(anomalies[0])
+        self.schedule_ambient_sound()
+
+    def schedule_aftershock(self, content_type: str):
+        """Queue the delayed consequence of having decoded a disturbing signal"""
+        aftershocks = {
+            "warning": (f"{Colors.YELLOW}⚠ The warning replays in your head. You can't stop hearing it.{Colors.END}", 2),
+            "unknown": (f"{Colors.MAGENTA}⚠ Something in the static answers back. It knows your name now.{Colors.END}", 4),
         }
+        if content_type not in aftershocks:
+            return
+        message, loss = aftershocks[content_type]
+        
+        def aftershock():
+            print(f"\n{message}")
+            self.player.sanity = max(0, self.player.sanity - loss)
+        
+        self.scheduler.schedule(random.uniform(60, 360), f'aftershock_{content_type}', aftershock)
+        
+    def clear_screen(self):
+        """Clear screen - now just used for special effects"""
+        # Home the cursor and erase in-process rather than spawning `clear`
+        if Colors.MODE == 'mono':
+            print(flush=True)  # No escapes at all: just start the next frame on a fresh line
+        else:
+            print('\033[H\033[2J', end='', flush=True)
+    
+    def get_terminal_size(self):
+        """Get terminal dimensions"""
+        # Same lookup order as shutil.get_terminal_size, without importing shutil
+        try:
+            columns = int(os.environ['COLUMNS'])
+            lines = int(os.environ['LINES'])
+            return columns, lines
+        except (KeyError, ValueError):
+            pass
+        try:
+            size = os.get_terminal_size(sys.__stdout__.fileno())
+            return size.columns or 80, size.lines or 24
+        except (AttributeError, ValueError, OSError):
+            return 80, 24
+
+    def print_separator(self, char="═"):
+        cols, _ = self.get_terminal_size()
+        width = min(cols, 100)
+        print(Colors.GRAY + char * width + Colors.END)
+
+    def print_box_header(self, text: str):
+        cols, _ = self.get_terminal_size()
+        width = min(cols - 4, 96)
+        text = TextLayout.truncate(text, width)
+        padding = (width - TextLayout.width(text)) // 2
+        print(Colors.CYAN + "╔" + "═" * width + "╗" + Colors.END)
+        print(Colors.CYAN + "║" + " " * padding + Colors.BOLD + text + Colors.END + Colors.CYAN + " " * (width - padding - TextLayout.width(text)) + "║" + Colors.END)
+        print(Colors.CYAN + "╚" + "═" * width + "╝" + Colors.END)
+
+    def glitch_text(self, text: str) -> str:
+        """Apply glitch effects to text based on sanity"""
+        if self.player.sanity >= 70:
+            return text
+        return StatusBar.glitch(Scrollback.CSI_PATTERN_SPLIT.split(text), self.glitch_chance, self.glitch_chars)
+
+    @property
+    def glitch_chance(self) -> float:
+        return (100 - self.player.sanity) / 200 if self.player.sanity < 70 else 0.0
+
+    def screen_flicker(self):
+        """Cause a brief visual glitch"""
+        if self.player.sanity < 40 and random.random() < 0.15:
+            self.clear_screen()
+            glitch_messages = [
+                "T̷H̴E̸Y̵ ̴A̶R̴E̷ ̸W̶A̶T̷C̸H̷I̶N̵G̴",
+                "░▒▓█ SIGNAL CORRUPTED █▓▒░",
+                "DO NOT TRUST THE CONSOLE",
+                "YOU ARE NOT ALONE",
+                "◊◊◊ LISTENING... LISTENING... ◊◊◊",
+                "ERROR: REALITY.SYS NOT FOUND"
+            ]
+            print("\n" * 10)
+            print(Colors.RED + Colors.BLINK + Colors.BOLD + TextLayout.center(random.choice(glitch_messages), 70) + Colors.END)
+            print("\a")  # Bell sound
+            self.pause(0.3)
+            self.clear_screen()
+
+    def print_status(self):
+        # Check for screen flicker before drawing UI
+        self.screen_flicker()
+        
+        self.status_bar.refresh((self.player.version, self.resources.version, int(self.game_time), Colors.MODE))
+        for line in self.status_bar.render(self.glitch_chance, self.glitch_chars):
+            print(line)
+        self.print_separator()
+
+    @cached_property
+    def status_bar(self) -> StatusBar:
+        player, resources = self.player, self.resources
+        label = lambda name: f"{Colors.BLUE}{name}{Colors.END} "
+        percent = lambda name, value: f"{label(name)}{Colors.sanity_color(value)}{value:.0f}%{Colors.END}"
+        return StatusBar(
+            ((lambda: (self.day, self.station_clock()),
+              lambda day, clock: f"{label('Day')}{Colors.YELLOW}{day}{Colors.END} {Colors.GRAY}{clock}{Colors.END}"),
+             (lambda: (player.credits,), lambda credits: f"{label('Credits')}{Colors.YELLOW}{credits}{Colors.END}"),
+             (lambda: (player.sanity,), lambda sanity: percent('Sanity', sanity)),
+             (lambda: (player.current_mode,), lambda mode: f"{label('Mode')}{Colors.CYAN}{mode.value}{Colors.END}")),
+            ((lambda: (round(resources.power),), lambda power: percent('Power', power)),
+             (lambda: (round(resources.oxygen),), lambda oxygen: percent('O2', oxygen)),
+             (lambda: (resources.water_filters, resources.food_cartridges, resources.repair_parts),
+              lambda water, food, parts: f"{label('Supplies')}{Colors.WHITE}W:{water} F:{food} R:{parts}{Colors.END}")),
+        )
+
+    @property
+    def credits(self):
+        return self.player.credits
+
+    def generate_signal(self, freq: float, strength: int, noise: int) -> Signal:
+        content_types = ["data_stream", "voice", "coordinates", "blueprint", "warning", "unknown"]
+        
+        ctype = random.choice(content_types)
+        seed = random.getrandbits(32)
+        
+        # Content comes from the signal's own seed so a transmission can be regenerated exactly
+        content = self.transmissions.generate(ctype, random.Random(seed))
+        value = self.signal_value(strength, noise)
+        
+        return Signal(freq, strength, noise, ctype, content, value, seed)
+
+    @cached_property
+    def fingerprints(self) -> SignalFingerprints:
+        return SignalFingerprints(self.fingerprint_path)
+
+    def repeat_of(self, signal: Signal) -> Optional[str]:
+        return self.fingerprints.seen(self.fingerprints.fingerprint(signal))
+
+    @cached_property
+    def transmissions(self) -> 'TransmissionModel':
+        corpora = {ctype: list(lines) for ctype, lines in self.TRANSMISSIONS.items()}
+        if self.corpus_dir:
+            for ctype, lines in corpora.items():
+                try:
+                    with open(os.path.join(self.corpus_dir, f"{ctype}.txt"), encoding='utf-8') as f:
+                        lines.extend(line.strip() for line in f if line.strip())
+                except OSError:
+                    pass  # Types without a corpus file keep the built-in transmissions
+        return TransmissionModel.load(corpora)
+
+    @staticmethod
+    def signal_value(strength: int, noise: int) -> int:
+        return max(10, strength - noise // 2)
+
+    @staticmethod
+    def estimated_snr(signal: Signal) -> float:
+        return 20 * math.log10(signal.strength / max(1, signal.noise_level))
+
+    def pause(self, seconds: float):
+        """Sleep for effect on the game's clock, skipped entirely while running scripts"""
+        if not self.fast_mode:
+            self.clock.sleep(seconds)
+
+    def animate_loading(self, text: str, duration: float = 1.0):
+        """Animated loading text"""
+        if self.fast_mode:
+            print(f"{Colors.CYAN}{text}...{Colors.END}")
+            return
+        steps = int(duration / 0.2)
+        for i in range(steps):
+            dots = "." * ((i % 3) + 1)
+            print(f"\r{Colors.CYAN}{text}{dots}   {Colors.END}", end='', flush=True)
+            self.clock.sleep(0.2)
+        print()
+
+    def waterfall_palette(self) -> Tuple[str, ...]:
+        """Pre-rendered color + glyph for each intensity level"""
+        colors = (Colors.END, Colors.BLUE, Colors.CYAN, Colors.YELLOW, Colors.RED + Colors.BOLD)
+        key = (colors, self.WATERFALL_RAMP)
+        if self._waterfall_palette_key != key:
+            self._waterfall_palette_key = key
+            self._waterfall_palette = tuple(zip(colors, self.WATERFALL_RAMP))
+        return self._waterfall_palette
+
+    def render_waterfall_row(self, row: List[float]) -> str:
+        """Map a row of dB values onto the glyph ramp, emitting color codes only on change"""
+        palette = self.waterfall_palette()
+        top = len(palette) - 1
+        floor = sorted(row)[len(row) // 2]
+        parts = []
+        current = None
+        for power in row:
+            level = min(top, max(0, int((power - floor) / 6)))
+            color, glyph = palette[level]
+            if color != current:
+                parts.append(color)
+                current = color
+            parts.append(glyph)
+        parts.append(Colors.END)
+        return ''.join(parts)
+
+    def waterfall_command(self, rows: Optional[int] = None):
+        """Scrolling spectrogram of the scan band"""
+        cols, lines = self.get_terminal_size()
+        width = min(cols, 100)
+        rows = rows if rows is not None else self.WATERFALL_RATE * 5
+        emitters = [(freq, 0.15) for freq in self.BEACON_FREQUENCIES]
+        emitters += [(sig.frequency, sig.strength / 100) for sig in self.scanned_signals]
+        noise = 0.25 + 0.5 * sum(sig.noise_level for sig in self.scanned_signals) / max(1, len(self.scanned_signals)) / 100
+        band = BandModel(width, emitters, noise, seed=random.getrandbits(32))
+        
+        self.print_box_header("SPECTRUM WATERFALL")
+        axis = [f"{band.column_mhz(0):.1f}", f"{band.column_mhz(width / 2):.1f}", f"{band.column_mhz(width):.1f} MHz"]
+        gap = width - sum(len(label) for label in axis)
+        print(Colors.GRAY + axis[0] + " " * (gap // 2) + axis[1] + " " * (gap - gap // 2) + axis[2] + Colors.END)
+        
+        print(f"{Colors.DIM}Ctrl-C to stop{Colors.END}")
+        
+        # Reserve space, then scroll only that region: each frame writes one new line
+        scroll_region = Colors.MODE != 'mono'
+        if scroll_region:
+            region = max(3, min(rows, lines - 8))
+            print("\n" * region, end='')
+            print(f"\033[{lines - region};{lines - 1}r\033[{lines - 1};1H", end='', flush=True)
+        
+        interval = 1 / self.WATERFALL_RATE
+        next_frame = self.clock.now()
+        drawn = 0
+        self.terminal_history.suspended += 1
+        try:
+            for row in band.rows():
+                if drawn >= rows:
+                    break
+                started = time.perf_counter()
+                sys.stdout.write("\n" + self.render_waterfall_row(row))
+                self.metrics.record('listener_frame_seconds', time.perf_counter() - started, view='waterfall')
+                sys.stdout.flush()
+                drawn += 1
+                if not self.fast_mode:
+                    next_frame += interval
+                    delay = next_frame - self.clock.now()
+                    if delay > 0:
+                        self.clock.sleep(delay)
+                    else:
+                        next_frame = self.clock.now()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.terminal_history.suspended -= 1
+            # Restore full-screen scrolling and park the cursor below the waterfall
+            print(f"\033[r\033[{lines};1H" if scroll_region else "")
+        print(f"{Colors.DIM}{drawn} rows at {self.WATERFALL_RATE} rows/sec target.{Colors.END}")
+
+    def capture_for(self, signal: Signal) -> WaveformSynth:
+        """Sample source for a signal: its recording if it has one, else a synthetic stream"""
+        return WavCapture(signal) if signal.source else WaveformSynth(signal)
+
+    def analyzer_for(self, capture: WaveformSynth) -> SpectrumAnalyzer:
+        if capture.SAMPLE_RATE == self.spectrum_analyzer.sample_rate:
+            return self.spectrum_analyzer
+        return SpectrumAnalyzer(sample_rate=capture.SAMPLE_RATE)
+
+    def use_wav_directory(self, directory: str) -> bool:
+        if self.wav_library and self.wav_library.directory == directory:
+            return True
+        if not os.path.isdir(directory):
+            print(f"{Colors.RED}No such recordings directory: {directory}{Colors.END}")
+            return False
+        self.wav_library = WavLibrary(directory)
+        self.scanned_segments = set()
+        return True
+
+    def signals_from_recordings(self, count: int) -> List[Signal]:
+        """Turn indexed recording segments into signals, preferring ones not yet scanned"""
+        read = self.wav_library.refresh()
+        if read:
+            print(f"{Colors.DIM}Indexed {read} new recording(s).{Colors.END}")
+        segments = list(self.wav_library.segments())
+        fresh = [item for item in segments if (item[0].path, item[0].start) not in self.scanned_segments]
+        picks = random.sample(fresh or segments, min(count, len(fresh or segments)))
+        signals = []
+        for segment, measured in picks:
+            self.scanned_segments.add((segment.path, segment.start))
+            signal = self.generate_signal(measured['frequency'], measured['strength'], measured['noise'])
+            signal.source = segment
+            signals.append(signal)
+        return signals
+
+    def scan_command(self, source: Optional[str] = None):
+        if source and not self.use_wav_directory(source):
+            return
+        
+        self.retire_scanned()
+        if self.wav_library:
+            print(f"\n{Colors.CYAN}[SCANNING RECORDINGS]{Colors.END}")
+            self.animate_loading("Scanning", 1.0)
+            detections = iter(self.signals_from_recordings(random.randint(1, 3)))
+        else:
+            low = self.sweep.channel_mhz(self.sweep.cursor)
+            high = self.sweep.channel_mhz((self.sweep.cursor + self.SWEEP_CHANNELS - 1) % self.sweep.CHANNELS)
+            print(f"\n{Colors.CYAN}[SWEEPING {low:.1f}–{high:.1f} MHz]{Colors.END} "
+                  f"{Colors.DIM}{self.SWEEP_CHANNELS} channels{Colors.END}")
+            detections = self.sweep_signals(self.SWEEP_CHANNELS)
+        
+        # Each detection is listed as soon as the sweep reaches it
+        for i, sig in enumerate(detections):
+            self.scanned_signals.append(sig)
+            self.detections.add(self.sweep.channel_of(sig.frequency), self.estimated_snr(sig), sig)
+            strength_col = Colors.GREEN if sig.strength > 60 else Colors.YELLOW if sig.strength > 30 else Colors.RED
+            noise_col = Colors.GREEN if sig.noise_level < 30 else Colors.YELLOW if sig.noise_level < 60 else Colors.RED
+            print(f"  {Colors.BOLD}[{i}]{Colors.END} Freq: {Colors.CYAN}{sig.frequency}{Colors.END} MHz │ "
+                  f"Strength: {strength_col}{sig.strength}%{Colors.END} │ "
+                  f"Noise: {noise_col}{sig.noise_level}%{Colors.END} │ "
+                  f"SNR: {self.estimated_snr(sig):+.1f} dB")
+        self.metrics.inc('listener_signals_scanned_total', len(self.scanned_signals))
+        
+        if self.scanned_signals:
+            print(f"\n{Colors.GREEN}✓ Found {len(self.scanned_signals)} signal(s).{Colors.END} "
+                  f"{Colors.DIM}{len(self.detections)} channel(s) indexed.{Colors.END}")
+        else:
+            print(f"\n{Colors.YELLOW}Nothing above the noise floor.{Colors.END} "
+                  f"{Colors.DIM}{len(self.detections)} channel(s) indexed.{Colors.END}")
+        print(f"\n{Colors.DIM}Use 'analyze <index>', 'analyze best' or 'analyze band <lo> <hi>' to examine a signal.{Colors.END}")
+
+    def sweep_signals(self, channels: int) -> Iterator[Signal]:
+        """Signals from the next stretch of the band, paced by how far the sweep has moved"""
+        last = self.sweep.cursor
+        for channel, strength, noise in self.sweep.sweep(channels):
+            self.pause((channel - last) % self.sweep.CHANNELS * self.SWEEP_SECONDS_PER_CHANNEL)
+            last = channel
+            yield self.generate_signal(round(self.sweep.channel_mhz(channel), 1), strength, noise)
+
+    def pick_signal(self, target: str, bounds: List[float]) -> Optional[Signal]:
+        """Resolve an analyze target: a scan index, 'best', or 'band' with MHz bounds"""
+        if target == 'best':
+            signal = self.detections.best()
+            if signal is None:
+                print(f"{Colors.RED}No undecoded detections indexed. Use 'scan' first.{Colors.END}")
+            return signal
+        if target == 'band':
+            if len(bounds) != 2:
+                print(f"{Colors.RED}Usage: analyze band <low MHz> <high MHz>{Colors.END}")
+                return None
+            low, high = sorted(bounds)
+            signal = self.detections.best(self.sweep.channel_of(low), self.sweep.channel_of(high))
+            if signal is None:
+                print(f"{Colors.RED}No undecoded detections between {low} and {high} MHz.{Colors.END}")
+            return signal
+        try:
+            idx = int(target)
+        except ValueError:
+            print(f"{Colors.RED}Invalid target. Use a signal index, 'best' or 'band <lo> <hi>'.{Colors.END}")
+            return None
+        if idx < 0 or idx >= len(self.scanned_signals):
+            print(f"{Colors.RED}Invalid signal index. Available: 0-{len(self.scanned_signals)-1}{Colors.END}")
+            return None
+        return self.scanned_signals[idx]
+
+    def analyze_command(self, target: str, bounds: Optional[List[float]] = None):
+        signal = self.pick_signal(target.lower(), bounds or [])
+        if signal is None:
+            return
+        
+        self.current_signal = signal
+        label = f"SIGNAL {target}" if target.isdigit() else f"{signal.frequency} MHz"
+        print(f"\n{Colors.CYAN}[ANALYZING {label}]{Colors.END}")
+        self.animate_loading("Analyzing", 1.0)
+        
+        print(f"\n{Colors.BLUE}Frequency:{Colors.END} {Colors.CYAN}{self.current_signal.frequency}{Colors.END} MHz")
+        
+        strength_col = Colors.GREEN if self.current_signal.strength > 60 else Colors.YELLOW if self.current_signal.strength > 30 else Colors.RED
+        print(f"{Colors.BLUE}Signal Strength:{Colors.END} {strength_col}{self.current_signal.strength}%{Colors.END}")
+        
+        noise_col = Colors.GREEN if self.current_signal.noise_level < 30 else Colors.YELLOW if self.current_signal.noise_level < 60 else Colors.RED
+        print(f"{Colors.BLUE}Noise Level:{Colors.END} {noise_col}{self.current_signal.noise_level}%{Colors.END}")
+        
+        type_col = Colors.YELLOW if self.current_signal.content_type in ["warning", "unknown"] else Colors.WHITE
+        print(f"{Colors.BLUE}Content Type:{Colors.END} {type_col}{self.current_signal.content_type.upper()}{Colors.END}")
+        
+        repeat = self.repeat_of(self.current_signal)
+        if repeat:
+            print(f"{Colors.BLUE}Fingerprint:{Colors.END} {Colors.YELLOW}REPEAT{Colors.END} {Colors.DIM}"
+                  f"({self.REPEAT_NOTES[repeat]}; pays {self.REPEAT_VALUE[repeat]:.0%}){Colors.END}")
+        
+        synth = self.capture_for(self.current_signal)
+        try:
+            report = self.analyzer_for(synth).measure(synth.chunks())
+        except WavCapture.read_errors() as e:
+            self.discard_unreadable(self.current_signal, e)
+            return
+        snr_col = Colors.GREEN if report.snr_db > 0 else Colors.YELLOW if report.snr_db > -10 else Colors.RED
+        print(f"\n{Colors.BLUE}Measured Carrier:{Colors.END} {Colors.CYAN}{synth.frequency_mhz(report.peak_hz):.1f}{Colors.END} MHz")
+        print(f"{Colors.BLUE}Measured SNR:{Colors.END} {snr_col}{report.snr_db:+.1f} dB{Colors.END} "
+              f"{Colors.DIM}({report.frames} frames, floor {report.noise_floor_db:.1f} dB){Colors.END}")
+        
+        if self.filters:
+            try:
+                self.apply_filters(self.current_signal, synth, report)
+            except WavCapture.read_errors() as e:
+                self.discard_unreadable(self.current_signal, e)
+                return
+        
+        noise = self.current_signal.working_noise
+        quality = 'CLEAN' if noise < 30 else 'MODERATE' if noise < 60 else 'POOR'
+        quality_col = Colors.GREEN if quality == 'CLEAN' else Colors.YELLOW if quality == 'MODERATE' else Colors.RED
+        print(f"\n{Colors.BLUE}Quality:{Colors.END} {quality_col}{quality}{Colors.END}")
+        
+        print(f"\n{Colors.DIM}Use 'decode' to extract the signal content.{Colors.END}")
+
+    def apply_filters(self, signal: Signal, synth: WaveformSynth, raw: SpectrumReport):
+        """Re-measure the signal through the filter pipeline and rate its cleaned-up noise"""
+        filtered = self.analyzer_for(synth).measure(self.filters.run(synth.chunks(), synth))
+        gain = filtered.snr_db - raw.snr_db
+        # Every 6 dB of SNR gained halves the noise the decoder has to fight
+        signal.effective_noise = max(0, min(100, round(signal.noise_level * 10 ** (-gain / 20))))
+        old_value = signal.value
+        signal.value = self.signal_value(signal.strength, signal.effective_noise)
+        
+        gain_col = Colors.GREEN if gain > 0 else Colors.RED
+        print(f"{Colors.BLUE}Filtered SNR:{Colors.END} {gain_col}{filtered.snr_db:+.1f} dB ({gain:+.1f} dB){Colors.END} "
+              f"{Colors.DIM}through {len(self.filters)} stage(s){Colors.END}")
+        print(f"{Colors.BLUE}Effective Noise:{Colors.END} {signal.noise_level}% → {signal.effective_noise}% │ "
+              f"{Colors.BLUE}Value:{Colors.END} {old_value} → {Colors.YELLOW}{signal.value}{Colors.END}")
+
+    def filter_command(self, action: Optional[str] = None, args: Optional[List[str]] = None):
+        """Configure the receiver's filter pipeline"""
+        args = args or []
+        if action in (None, 'list'):
+            if not self.filters:
+                print(f"{Colors.DIM}No filters. Try: filter add bandpass <MHz> <width MHz>{Colors.END}")
+                return
+            print(f"\n{Colors.BOLD}{Colors.CYAN}Filter Pipeline:{Colors.END}")
+            for i, stage in enumerate(self.filters.stages):
+                cost = f"{stage.cost_ns():.0f} ns/sample over {stage.samples} samples" if stage.samples else "not run yet"
+                print(f"  {Colors.BOLD}[{i}]{Colors.END} {Colors.YELLOW}{stage.describe()}{Colors.END} {Colors.DIM}│ {cost}{Colors.END}")
+        elif action == 'add':
+            if not args or args[0] not in FilterPipeline.STAGE_TYPES:
+                print(f"{Colors.YELLOW}Usage: filter add <{'|'.join(FilterPipeline.STAGE_TYPES)}> [params...]{Colors.END}")
+                print(f"{Colors.DIM}bandpass/notch <MHz> <width MHz> │ average [taps] │ agc [target]{Colors.END}")
+                return
+            try:
+                stage = self.filters.add(args[0], *(float(arg) for arg in args[1:]))
+            except TypeError:
+                print(f"{Colors.RED}Wrong number of parameters for {args[0]}.{Colors.END}")
+                print(f"{Colors.DIM}bandpass/notch <MHz> <width MHz> │ average [taps] │ agc [target]{Colors.END}")
+                return
+            except ValueError as e:
+                print(f"{Colors.RED}Invalid {args[0]} parameters: {e}{Colors.END}")
+                return
+            print(f"{Colors.GREEN}✓ Added [{len(self.filters) - 1}] {stage.describe()}{Colors.END}")
+        elif action == 'remove':
+            try:
+                stage = self.filters.stages.pop(int(args[0]))
+            except (IndexError, ValueError):
+                print(f"{Colors.RED}Usage: filter remove <index>{Colors.END}")
+                return
+            print(f"{Colors.GREEN}✓ Removed {stage.describe()}{Colors.END}")
+        elif action == 'clear':
+            self.filters.stages.clear()
+            print(f"{Colors.GREEN}✓ Filter pipeline cleared{Colors.END}")
+
+    def retire_scanned(self):
+        """Move undecoded signals from the last scan into the backlog"""
+        self.signal_backlog.extend(sig for sig in self.scanned_signals if not sig.decoded)
+        self.scanned_signals = []
+
+    def decode_command(self, target: Optional[str] = None):
+        if target == 'all':
+            self.decode_all()
+            return
+        if not self.current_signal:
+            print(f"{Colors.RED}No signal selected. Use 'analyze <index>' first.{Colors.END}")
+            return
+        
+        signal = self.current_signal
+        max_width = 66
+        lines = TextLayout.wrap(signal.decoded_content, max_width)
+        resumed = signal.lines_read
+        verb = "RESUMING DECODE" if 0 < resumed < len(lines) else "DECODING SIGNAL"
+        print(f"\n{Colors.CYAN}[{verb}]{Colors.END}")
+        
+        print(f"\n{Colors.CYAN}╔{'═' * 68}╗{Colors.END}")
+        title = TextLayout.pad(f"{Colors.BOLD}DECODED CONTENT{Colors.END}", max_width)
+        print(f"{Colors.CYAN}║{Colors.END} {title} {Colors.CYAN}║{Colors.END}")
+        print(f"{Colors.CYAN}╠{'═' * 68}╣{Colors.END}")
+        
+        # Lines stream out as they decode; Ctrl-C stops the stream and keeps what was read
+        interval = self.DECODE_SECONDS / max(1, len(lines))
+        next_line = self.clock.now()
+        read = 0
+        try:
+            for read, row in enumerate(self.decode_stream(signal, lines, max_width), 1):
+                print(row, flush=True)
+                if read > resumed and not self.fast_mode:
+                    next_line += interval
+                    delay = next_line - self.clock.now()
+                    if delay > 0:
+                        self.clock.sleep(delay)
+                    else:
+                        next_line = self.clock.now()
+                else:
+                    next_line = self.clock.now()
+        except KeyboardInterrupt:
+            pass
+        print(f"{Colors.CYAN}╚{'═' * 68}╝{Colors.END}")
         
-        loss = sanity_loss.get(self.current_signal.content_type, 2)
-        self.player.sanity = max(0, self.player.sanity - loss)
+        read = max(read, resumed)
+        loss = self.charge_decode(signal, read, len(lines))
         
         if loss > 3:
             print(f"\n{Colors.RED}[Your hands are shaking... -{loss} sanity]{Colors.END}")
             print("\a")  # Bell sound for high sanity loss
         
-        # Add creepy sounds at low sanity
-        if self.player.sanity < 50 and random.random() < 0.3:
-            self.trigger_sound_log()
+        if read < len(lines):
+            print(f"\n{Colors.YELLOW}[DECODE INTERRUPTED at line {read} of {len(lines)}]{Colors.END}")
+            print(f"{Colors.DIM}Use 'decode' again to resume where it stopped.{Colors.END}")
+            return
+        
+        if resumed < read:
+            self.schedule_aftershock(signal.content_type)
+        self.mark_decoded(signal)
         
         print(f"\n{Colors.DIM}Use 'submit' to send this signal for analysis and earn credits.{Colors.END}")
-        self.resources.power -= 3
+
+    def decode_stream(self, signal: Signal, lines: Tuple[str, ...], width: int) -> Iterator[str]:
+        """Box rows for a signal's wrapped content, glitched one line at a time as it is read"""
+        content_col = Colors.content(signal.content_type)
+        for line in lines:
+            line = TextLayout.pad(self.glitch_text(line).replace(Colors.END, Colors.END + content_col), width)
+            yield f"{Colors.CYAN}║{Colors.END} {content_col}{line}{Colors.END} {Colors.CYAN}║{Colors.END}"
+
+    def charge_decode(self, signal: Signal, read: int, total: int) -> int:
+        """Take the sanity owed for reading up to line read of total; what was already paid is not charged again"""
+        loss = self.SANITY_LOSS.get(signal.content_type, 2)
+        owed = round(loss * read / total) - round(loss * signal.lines_read / total)
+        signal.lines_read = read
+        self.player.sanity = max(0, self.player.sanity - owed)
+        return owed
+
+    def mark_decoded(self, signal: Signal):
+        if not signal.decoded:
+            signal.decoded = True
+            self.decoded_signals.append(signal)
+            self.metrics.inc('listener_signals_decoded_total')
+        if signal in self.signal_backlog:
+            self.signal_backlog.remove(signal)
+
+    def decode_executor(self, jobs: int):
+        """Processes whenever there is more than one core to use, threads otherwise"""
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        workers = max(1, min(jobs, os.cpu_count() or 1))
+        # NumPy only speeds up the FFT: synthesizing samples and unpacking PCM stay per-sample
+        # Python loops that hold the GIL, so threads would run a batch on one core
+        if workers > 1:
+            try:
+                return ProcessPoolExecutor(max_workers=workers)
+            except (OSError, NotImplementedError):
+                pass  # No process support (some sandboxes); threads still overlap file reads
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def decode_all(self):
+        """Decode every scanned and backlogged signal in parallel, applying results in order"""
+        pending = [sig for sig in self.scanned_signals if not sig.decoded]
+        pending += [sig for sig in self.signal_backlog if sig not in pending]
+        if not pending:
+            print(f"{Colors.RED}Nothing to decode. Use 'scan' first.{Colors.END}")
+            return
+        
+        print(f"\n{Colors.CYAN}[BATCH DECODING {len(pending)} SIGNAL(S)]{Colors.END}")
+        from concurrent.futures import as_completed
+        reports: List[Optional[SpectrumReport]] = [None] * len(pending)
+        failures: Dict[int, Exception] = {}
+        with self.decode_executor(len(pending)) as pool:
+            futures = {pool.submit(measure_signal, sig): i for i, sig in enumerate(pending)}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    reports[futures[future]] = future.result()
+                except WavCapture.read_errors() as e:
+                    failures[futures[future]] = e
+                bar = '█' * (20 * done // len(pending))
+                print(f"\r{Colors.CYAN}Decoding [{bar:<20}] {done}/{len(pending)}{Colors.END}", end='', flush=True)
+        print()
+        
+        for i, e in failures.items():
+            self.discard_unreadable(pending[i], e)
+        total_loss = 0
+        for sig, report in zip(pending, reports):
+            if report is None:
+                continue
+            content_col = Colors.content(sig.content_type)
+            preview = TextLayout.truncate(self.glitch_text(sig.decoded_content).replace('\n', ' '), 44)
+            print(f"  {sig.frequency:>7.1f} MHz {report.snr_db:+6.1f} dB "
+                  f"{content_col}{sig.content_type.upper():<12}{Colors.END} {preview}")
+            total = len(TextLayout.wrap(sig.decoded_content, 66))
+            total_loss += self.charge_decode(sig, total, total)
+            self.schedule_aftershock(sig.content_type)
+            self.mark_decoded(sig)
+        
+        if total_loss > 3:
+            print(f"\n{Colors.RED}[Your hands are shaking... -{total_loss} sanity]{Colors.END}")
+            print("\a")
+        
+        # The command itself pays for the first signal
+        self.advance_time(30 * (len(pending) - 1), 'terminal')
+        print(f"\n{Colors.DIM}Use 'submit all' to send the decoded batch for credits.{Colors.END}")
+
+    def discard_unreadable(self, signal: Signal, error: Exception):
+        """Report a recording that can no longer be read and drop its signal"""
+        name = os.path.basename(signal.source.path) if signal.source else f"{signal.frequency} MHz"
+        print(f"{Colors.YELLOW}⚠ Cannot read {name}: {str(error) or type(error).__name__}; signal dropped.{Colors.END}")
+        if signal is self.current_signal:
+            self.current_signal = None
+        if signal in self.scanned_signals:
+            self.scanned_signals.remove(signal)
+        if signal in self.signal_backlog:
+            self.signal_backlog.remove(signal)
 
     def trigger_sound_log(self):
         """Generate creepy auditory descriptions"""
@@ -451,29 +3477,52 @@ class Game:
         print(f"\n{random.choice(sounds)}")
         if random.random() < 0.5:
             print("\a")  # Occasional beep
+            if self.audio:
+                self.audio.cue()
 
-    def submit_command(self):
-        if not self.current_signal:
+    def submit_command(self, target: Optional[str] = None):
+        if target == 'all':
+            batch = self.decoded_signals
+        elif self.current_signal:
+            batch = [self.current_signal]
+        else:
+            batch = []
+        if not batch:
             print(f"{Colors.RED}No decoded signal to submit.{Colors.END}")
             return
         
         print(f"\n{Colors.CYAN}[SUBMITTING TO CENTRAL COMMAND]{Colors.END}")
         self.animate_loading("Transmitting", 1.0)
         
-        credits_earned = self.current_signal.value
+        credits_earned = repeats = 0
+        for sig in batch:
+            fingerprint = self.fingerprints.fingerprint(sig)
+            repeat = self.fingerprints.seen(fingerprint)
+            if repeat:
+                repeats += 1
+                credits_earned += round(sig.value * self.REPEAT_VALUE[repeat])
+                if len(batch) == 1:
+                    print(f"{Colors.YELLOW}Central Command already has this transmission "
+                          f"({self.REPEAT_NOTES[repeat]}).{Colors.END}")
+            else:
+                credits_earned += sig.value
+            self.fingerprints.add(fingerprint)
         self.player.credits += credits_earned
-        self.discovered_signals += 1
+        self.discovered_signals += len(batch)
+        self.metrics.inc('listener_signals_submitted_total', len(batch))
+        self.metrics.inc('listener_credits_earned_total', credits_earned)
         
-        print(f"\n{Colors.GREEN}✓ Signal submitted successfully!{Colors.END}")
+        noun = "Signal" if len(batch) == 1 else f"{len(batch)} signals"
+        print(f"\n{Colors.GREEN}✓ {noun} submitted successfully!{Colors.END}")
         print(f"{Colors.BLUE}Credits earned:{Colors.END} {Colors.YELLOW}+{credits_earned}{Colors.END}")
+        if repeats and len(batch) > 1:
+            print(f"{Colors.DIM}{repeats} of them repeated transmissions already on file and paid less.{Colors.END}")
         print(f"{Colors.BLUE}Total credits:{Colors.END} {Colors.YELLOW}{self.player.credits}{Colors.END}")
         
+        self.decoded_signals = [sig for sig in self.decoded_signals if sig not in batch]
+        self.signal_backlog = deque((sig for sig in self.signal_backlog if sig not in batch), maxlen=self.SIGNAL_BACKLOG)
         self.current_signal = None
-        self.scanned_signals = []
-        
-        # Random event chance
-        if random.random() < 0.2:
-            self.trigger_random_event()
+        self.retire_scanned()
 
     def trigger_random_event(self):
         events = [
@@ -503,10 +3552,14 @@ class Game:
         
         print(f"\n{Colors.BOLD}{Colors.CYAN}Life Support:{Colors.END}")
         power_col = Colors.sanity_color(self.resources.power)
-        print(f"  {Colors.BLUE}Power:{Colors.END} {power_col}{self.resources.power}%{Colors.END}")
+        print(f"  {Colors.BLUE}Power:{Colors.END} {power_col}{self.resources.power:.0f}%{Colors.END}")
         
         o2_col = Colors.sanity_color(self.resources.oxygen)
-        print(f"  {Colors.BLUE}Oxygen:{Colors.END} {o2_col}{self.resources.oxygen}%{Colors.END}")
+        print(f"  {Colors.BLUE}Oxygen:{Colors.END} {o2_col}{self.resources.oxygen:.0f}%{Colors.END}")
+        
+        power_left, oxygen_left = self.life_support.time_until_depleted(self.resources)
+        print(f"  {Colors.BLUE}Power Reserve:{Colors.END} {Colors.WHITE}{self.format_duration(power_left)}{Colors.END}")
+        print(f"  {Colors.BLUE}Oxygen Reserve:{Colors.END} {Colors.WHITE}{self.format_duration(oxygen_left)}{Colors.END}")
         
         print(f"\n{Colors.BOLD}{Colors.CYAN}Supplies:{Colors.END}")
         print(f"  {Colors.BLUE}Water Filters:{Colors.END} {Colors.WHITE}{self.resources.water_filters}{Colors.END}")
@@ -514,63 +3567,107 @@ class Game:
         print(f"  {Colors.BLUE}Repair Parts:{Colors.END} {Colors.WHITE}{self.resources.repair_parts}{Colors.END}")
         
         print(f"\n{Colors.BLUE}Current Day:{Colors.END} {Colors.YELLOW}{self.day}{Colors.END}")
+        print(f"{Colors.BLUE}Station Time:{Colors.END} {Colors.YELLOW}{self.station_clock()}{Colors.END}")
 
     def explore_command(self):
-        # Check if player is at a terminal
-        current_tile = self.station.get_tile(self.player.x, self.player.y)
-        if current_tile != 3:
-            print(f"\n{Colors.RED}You must be at a Terminal (T) to access the command interface.{Colors.END}")
-            print(f"{Colors.DIM}Use 'explore' to navigate the station, or 'map' to see terminal locations.{Colors.END}")
+        # Exploration can be accessed from anywhere
+        if self.player.current_mode != GameMode.TERMINAL:
             return
         
         print(f"\n{Colors.CYAN}[ENTERING EXPLORATION MODE]{Colors.END}")
-        print(f"{Colors.DIM}Use WASD to move, Q to return to terminal{Colors.END}")
-        time.sleep(1)
+        print(f"{Colors.DIM}Navigate to terminals to access commands{Colors.END}")
+        self.pause(1)
         self.player.current_mode = GameMode.EXPLORATION
         self.render_exploration()
+        self.handle_exploration_input()
 
-    def apply_corruption(self, char: str) -> str:
-        """Apply corruption effects to characters based on sanity"""
-        if self.player.sanity >= 70:
-            return char
-        
-        corruption_chance = (100 - self.player.sanity) / 400
-        
-        if random.random() < corruption_chance:
-            corrupted = random.choice(self.corruption_chars)
-            # Add zalgo marks for severe corruption
-            if self.player.sanity < 30 and random.random() < 0.3:
-                corrupted += random.choice(self.zalgo_marks)
-            return Colors.RED + corrupted + Colors.END
-        
-        return char
-    
     def render_exploration(self):
+        """Draw one exploration frame, timed and kept out of the scrollback"""
+        started = time.perf_counter()
+        self.terminal_history.suspended += 1
+        try:
+            self.draw_exploration()
+        finally:
+            self.terminal_history.suspended -= 1
+        self.metrics.record('listener_frame_seconds', time.perf_counter() - started, view='exploration')
+
+    def draw_exploration(self):
         """Render full-screen ASCII FPS-style exploration view with true 3D perspective"""
         cols, lines = self.get_terminal_size()
-        view_distance = 8
-        dx, dy = self.get_direction_vector()
         
         self.clear_screen()
         
-        # Light flicker simulation
-        self.light_flicker_frame = (self.light_flicker_frame + 1) % 10
-        is_light_on = self.light_flicker_frame < 7 or self.player.sanity > 60
-        light_intensity = 1.0 if is_light_on else 0.3
+        # Failing ceiling lights stutter more as sanity slips
+        went_out = self.lights.flicker(0.05 + (100 - self.player.sanity) / 400, random)
+        self.lights_dimmed = any(abs(light.x - self.player.x) + abs(light.y - self.player.y) <= self.VIEW_DISTANCE
+                                 for light in went_out)
+        
+        # The base view is drawn clean; every sanity effect is a separate pass over the grid
+        grid = self.render_view(cols, lines - 4)
+        self.draw_entities(grid)
+        self.effects.run(grid, self)
+        
+        for line in grid.lines():
+            print(line)
+        
+        # Status bar with retro terminal aesthetic
+        print(Colors.GREEN + "─" * cols + Colors.END)
+        
+        current_tile = self.station.get_tile(self.player.x, self.player.y)
+        location_text = ""
+        location_hint = ""
+        
+        if current_tile == 3:
+            location_text = f"{Colors.GREEN}{Colors.BOLD}[TERMINAL]{Colors.END}"
+            location_hint = f"{Colors.GREEN}Press Q to access terminal interface{Colors.END}"
+        elif current_tile == 4:
+            location_text = f"{Colors.RED}{Colors.BOLD}[GENERATOR]{Colors.END}"
+            location_hint = f"{Colors.YELLOW}Power hums through the machinery{Colors.END}"
+        elif current_tile == 5:
+            location_text = f"{Colors.MAGENTA}{Colors.BOLD}[STORAGE]{Colors.END}"
+            location_hint = f"{Colors.CYAN}Supplies stored here{Colors.END}"
+        else:
+            location_text = f"{Colors.WHITE}[CORRIDOR]{Colors.END}"
+            location_hint = ""
+        
+        status = f"{Colors.GREEN}> {location_text} {Colors.DIM}│{Colors.END} "
+        status += f"{Colors.GREEN}POS:{Colors.END}{self.player.x:02d},{self.player.y:02d} {Colors.DIM}│{Colors.END} "
+        status += f"{Colors.GREEN}DIR:{Colors.END}{self.player.direction.name[0]} {Colors.DIM}│{Colors.END} "
+        status += f"{Colors.GREEN}O2:{Colors.END}{self.resources.oxygen:.0f}%"
+        
+        print(status)
+        
+        if location_hint:
+            print(location_hint)
+        
+        # Sanity effects
+        if any(entity.kind == 'anomaly' for entity in self.entities.index.near(self.player.x, self.player.y, 3)):
+            print(f"\n{Colors.RED}...{random.choice(self.corruption_chars)}...something moved...{Colors.END}")
+        elif self.player.sanity < 40 and random.random() < 0.2:
+            messages = [
+                f"{Colors.RED}...the walls breathe...{Colors.END}",
+                f"{Colors.RED}...{random.choice(self.corruption_chars)}...you hear whispers...{Colors.END}",
+                f"{Colors.RED}...you are not alone...{random.choice(self.corruption_chars)}{Colors.END}"
+            ]
+            print(f"\n{random.choice(messages)}")
         
-        # Calculate available space for rendering
-        view_lines = lines - 4
+        print(f"\n{Colors.DIM}[W]FWD [S]BACK [A]LEFT [D]RIGHT [M]MAP [Q]TERM{Colors.END}")
+
+    def render_view(self, cols: int, view_lines: int) -> CellGrid:
+        """Ceiling, walls and floor as plain cells, before any sanity effects"""
+        view_distance = self.VIEW_DISTANCE
+        dx, dy = self.get_direction_vector()
+        grid = CellGrid(cols)
+        blank = (' ', '', CellGrid.EMPTY)
         
         # Split screen into ceiling, walls, and floor
         ceiling_lines = view_lines // 3
         wall_lines = view_lines // 3
         floor_lines = view_lines - ceiling_lines - wall_lines
         
-        output_lines = []
-        
         # RENDER CEILING (looking up perspective)
         for i in range(ceiling_lines):
-            line_chars = []
+            cells = []
             
             # Ceiling gets darker towards edges
             depth = i / ceiling_lines
@@ -580,35 +3677,22 @@ class Game:
                 for x in range(cols):
                     edge_dist = min(x, cols - x) / cols
                     if random.random() < 0.02 and edge_dist > 0.1:
-                        line_chars.append(Colors.DIM + random.choice(['-', '|', '·', '.']) + Colors.END)
+                        cells.append((random.choice(['-', '|', '·', '.']), Colors.DIM, CellGrid.EMPTY))
                     else:
-                        line_chars.append(Colors.DIM + '.' + Colors.END)
+                        cells.append(('.', Colors.DIM, CellGrid.EMPTY))
             else:
                 # Farther ceiling
                 for x in range(cols):
-                    if random.random() < 0.005:
-                        line_chars.append(Colors.DIM + '.' + Colors.END)
-                    else:
-                        line_chars.append(' ')
+                    cells.append(('.', Colors.DIM, CellGrid.EMPTY) if random.random() < 0.005 else blank)
             
-            # Add corruption at edges for low sanity
-            if self.player.sanity < 50 and random.random() < 0.05:
-                if len(line_chars) > 0:
-                    line_chars[0] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
-                if len(line_chars) > 1:
-                    line_chars[-1] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
-            
-            output_lines.append(''.join(line_chars))
+            grid.add_row(cells)
         
         # RENDER WALLS (main 3D perspective view)
         for i in range(wall_lines):
             # Calculate which distance slice we're looking at
             # Middle of screen = closest, edges = farthest
             view_progress = i / wall_lines
-            dist = int(view_distance * (1 - view_progress)) + 1
-            
-            if dist > view_distance:
-                dist = view_distance
+            dist = min(view_distance, int(view_distance * (1 - view_progress)) + 1)
             
             look_x = self.player.x + dx * dist
             look_y = self.player.y + dy * dist
@@ -628,242 +3712,24 @@ class Game:
                 center_gap = 10
                 wall_width = (cols - center_gap) // 2
             
-            # Distance-based lighting
-            distance_fade = 1.0 - (dist / view_distance)
-            brightness = distance_fade * light_intensity
-            
-            line_chars = []
-            
-            # LEFT WALL - rendered with depth
-            if left_tile == 1:
-                for w in range(wall_width):
-                    # Create depth gradient from edge to center
-                    depth_factor = w / wall_width
-                    
-                    if brightness > 0.7:
-                        if depth_factor < 0.3:
-                            wall_char = '█'
-                        elif depth_factor < 0.6:
-                            wall_char = '▓'
-                        else:
-                            wall_char = '▒'
-                    elif brightness > 0.4:
-                        if depth_factor < 0.5:
-                            wall_char = '▓'
-                        else:
-                            wall_char = '▒'
-                    elif brightness > 0.2:
-                        wall_char = '▒'
-                    else:
-                        wall_char = '░'
-                    
-                    # Add structural details
-                    if random.random() < 0.08 and depth_factor > 0.4:
-                        wall_char = random.choice(['|', ':', '║'])
-                    
-                    wall_color = Colors.GREEN if self.player.sanity > 50 else Colors.glitch()
-                    line_chars.append(self.apply_corruption(wall_color + wall_char + Colors.END))
-            else:
-                # Empty space - show darkness gradient
-                for w in range(wall_width):
-                    depth_factor = w / wall_width
-                    if depth_factor > 0.7 and random.random() < 0.02:
-                        line_chars.append(Colors.DIM + '░' + Colors.END)
-                    else:
-                        line_chars.append(' ')
-            
-            # CENTER - what's ahead
-            center_chars = []
-            
-            if center_tile == 1:  # Wall ahead - render with texture
-                wall_color = Colors.GREEN if self.player.sanity > 50 else Colors.glitch()
-                
-                for c in range(center_gap):
-                    # Create texture based on position
-                    horizontal_pos = c / center_gap
-                    
-                    # Add depth and texture
-                    if brightness > 0.8:
-                        # Close wall - high detail
-                        if (c + i) % 4 == 0:
-                            fill_char = '#'
-                        elif random.random() < 0.15:
-                            fill_char = random.choice(['#', '▓', '|', '-'])
-                        else:
-                            fill_char = '█'
-                    elif brightness > 0.5:
-                        fill_char = '▓' if random.random() < 0.7 else '#'
-                    elif brightness > 0.3:
-                        fill_char = '▒'
-                    else:
-                        fill_char = '░'
-                    
-                    center_chars.append(self.apply_corruption(wall_color + fill_char + Colors.END))
-                    
-            elif center_tile == 2:  # Door - render with perspective
-                door_width = int(center_gap * perspective_factor * 0.5)
-                door_width = max(4, min(door_width, center_gap - 4))
-                side_space = (center_gap - door_width) // 2
-                
-                # Left wall section
-                wall_color = Colors.GREEN if self.player.sanity > 50 else Colors.glitch()
-                for _ in range(side_space):
-                    center_chars.append(wall_color + '#' + Colors.END)
-                
-                # Door itself
-                if dist <= 2:
-                    # Close door - show detail
-                    center_chars.append(Colors.CYAN + Colors.BOLD + '╔' + Colors.END)
-                    for d in range(door_width - 2):
-                        if d == door_width // 2:
-                            center_chars.append(Colors.CYAN + '█' + Colors.END)  # Handle
-                        else:
-                            center_chars.append(Colors.CYAN + '║' + Colors.END)
-                    center_chars.append(Colors.CYAN + Colors.BOLD + '╗' + Colors.END)
-                elif dist <= 4:
-                    # Medium distance
-                    for _ in range(door_width):
-                        center_chars.append(Colors.CYAN + '▓' + Colors.END)
-                else:
-                    # Far door
-                    for _ in range(door_width):
-                        center_chars.append(Colors.CYAN + '▒' + Colors.END)
-                
-                # Right wall section
-                for _ in range(center_gap - side_space - door_width):
-                    center_chars.append(wall_color + '#' + Colors.END)
-                    
-            elif center_tile == 3:  # Terminal
-                if dist <= 4:
-                    term_width = int(center_gap * perspective_factor * 0.4)
-                    term_width = max(6, min(term_width, center_gap - 4))
-                    side_space = (center_gap - term_width) // 2
-                    
-                    for _ in range(side_space):
-                        center_chars.append(' ')
-                    
-                    # Terminal display
-                    if dist <= 2:
-                        center_chars.append(Colors.GREEN + Colors.BOLD + '[' + Colors.END)
-                        for t in range(term_width - 2):
-                            if t % 3 == 0:
-                                center_chars.append(Colors.GREEN + Colors.BOLD + 'T' + Colors.END)
-                            else:
-                                center_chars.append(Colors.GREEN + '▓' + Colors.END)
-                        center_chars.append(Colors.GREEN + Colors.BOLD + ']' + Colors.END)
-                    else:
-                        for _ in range(term_width):
-                            center_chars.append(Colors.GREEN + '▓' + Colors.END)
-                    
-                    for _ in range(center_gap - side_space - term_width):
-                        center_chars.append(' ')
-                else:
-                    for _ in range(center_gap):
-                        center_chars.append(Colors.GREEN + '░' + Colors.END)
-                        
-            elif center_tile == 4:  # Generator - with glowing effect
-                if dist <= 4:
-                    gen_width = int(center_gap * perspective_factor * 0.5)
-                    gen_width = max(8, min(gen_width, center_gap - 4))
-                    side_space = (center_gap - gen_width) // 2
-                    
-                    for _ in range(side_space):
-                        center_chars.append(' ')
-                    
-                    # Generator core
-                    if dist <= 2:
-                        center_chars.append(Colors.RED + Colors.BOLD + '◄' + Colors.END)
-                        for g in range(gen_width - 2):
-                            if random.random() < 0.4:
-                                glow = random.choice(['█', '▓', '▒'])
-                            else:
-                                glow = '▓'
-                            center_chars.append(Colors.RED + glow + Colors.END)
-                        center_chars.append(Colors.RED + Colors.BOLD + '►' + Colors.END)
-                    else:
-                        for _ in range(gen_width):
-                            center_chars.append(Colors.RED + '▓' + Colors.END)
-                    
-                    for _ in range(center_gap - side_space - gen_width):
-                        center_chars.append(' ')
-                else:
-                    for _ in range(center_gap):
-                        center_chars.append(Colors.RED + '░' + Colors.END)
-                        
-            elif center_tile == 5:  # Storage
-                if dist <= 4:
-                    stor_width = int(center_gap * perspective_factor * 0.4)
-                    stor_width = max(6, min(stor_width, center_gap - 4))
-                    side_space = (center_gap - stor_width) // 2
-                    
-                    for _ in range(side_space):
-                        center_chars.append(' ')
-                    
-                    for _ in range(stor_width):
-                        center_chars.append(Colors.MAGENTA + random.choice(['▓', '▒', '█']) + Colors.END)
-                    
-                    for _ in range(center_gap - side_space - stor_width):
-                        center_chars.append(' ')
-                else:
-                    for _ in range(center_gap):
-                        center_chars.append(Colors.MAGENTA + '░' + Colors.END)
-            else:
-                # Empty corridor
-                for _ in range(center_gap):
-                    center_chars.append(' ')
-            
-            line_chars.extend(center_chars)
-            
-            # RIGHT WALL - mirror of left with depth
-            if right_tile == 1:
-                for w in range(wall_width):
-                    # Create depth gradient from center to edge
-                    depth_factor = (wall_width - w) / wall_width
-                    
-                    if brightness > 0.7:
-                        if depth_factor < 0.3:
-                            wall_char = '█'
-                        elif depth_factor < 0.6:
-                            wall_char = '▓'
-                        else:
-                            wall_char = '▒'
-                    elif brightness > 0.4:
-                        if depth_factor < 0.5:
-                            wall_char = '▓'
-                        else:
-                            wall_char = '▒'
-                    elif brightness > 0.2:
-                        wall_char = '▒'
-                    else:
-                        wall_char = '░'
-                    
-                    # Add structural details
-                    if random.random() < 0.08 and depth_factor > 0.4:
-                        wall_char = random.choice(['|', ':', '║'])
-                    
-                    wall_color = Colors.GREEN if self.player.sanity > 50 else Colors.glitch()
-                    line_chars.append(self.apply_corruption(wall_color + wall_char + Colors.END))
-            else:
-                # Empty space - darkness gradient
-                for w in range(wall_width):
-                    depth_factor = (wall_width - w) / wall_width
-                    if depth_factor > 0.7 and random.random() < 0.02:
-                        line_chars.append(Colors.DIM + '░' + Colors.END)
-                    else:
-                        line_chars.append(' ')
+            # Distance fade times the precomputed light on each tile
+            fade = 1.0 - (dist / view_distance)
+            lit = (fade * self.lights.level(look_x + perp_dx, look_y + perp_dy),
+                   fade * self.lights.level(look_x, look_y),
+                   fade * self.lights.level(look_x - perp_dx, look_y - perp_dy))
             
-            # Add screen edge corruption at low sanity
-            if self.player.sanity < 50:
-                if len(line_chars) > 0 and random.random() < 0.1:
-                    line_chars[0] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
-                if len(line_chars) > 1 and random.random() < 0.1:
-                    line_chars[-1] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
+            # Walls fade with distance in truecolor; 16-color keeps the flat green
+            left_style, center_style, right_style = (Colors.shade(Colors.GREEN, self.WALL_RGB, 0.3 + 0.7 * b) for b in lit)
             
-            output_lines.append(''.join(line_chars[:cols]))
+            grid.slices.append((grid.rows, dist, wall_width, center_gap, perspective_factor))
+            cells = self.side_wall_cells(left_tile, wall_width, lit[0], left_style, mirrored=False)
+            cells += self.center_cells(center_tile, center_gap, dist, perspective_factor, lit[1], i, center_style)
+            cells += self.side_wall_cells(right_tile, wall_width, lit[2], right_style, mirrored=True)
+            grid.add_row(cells)
         
         # RENDER FLOOR (looking down perspective)
         for i in range(floor_lines):
-            line_chars = []
+            cells = []
             
             # Floor gets closer to center as we go down
             depth = i / floor_lines
@@ -872,97 +3738,216 @@ class Game:
             
             # Left darkness
             for _ in range(side_margin):
-                if random.random() < 0.01:
-                    line_chars.append(Colors.DIM + '░' + Colors.END)
-                else:
-                    line_chars.append(' ')
+                cells.append(('░', Colors.DIM, CellGrid.EMPTY) if random.random() < 0.01 else blank)
             
             # Floor tiles
             for f in range(floor_width):
-                horizontal_pos = f / floor_width
-                
                 if depth > 0.7:
                     # Close floor
                     if (f + i) % 5 == 0:
-                        line_chars.append(Colors.DIM + ',' + Colors.END)
+                        cells.append((',', Colors.DIM, CellGrid.EMPTY))
                     elif random.random() < 0.05:
-                        line_chars.append(Colors.DIM + '.' + Colors.END)
+                        cells.append(('.', Colors.DIM, CellGrid.EMPTY))
                     else:
-                        line_chars.append(Colors.DIM + ' ' + Colors.END)
+                        cells.append((' ', Colors.DIM, CellGrid.EMPTY))
                 elif depth > 0.4:
                     # Medium floor
-                    if random.random() < 0.03:
-                        line_chars.append(Colors.DIM + '.' + Colors.END)
-                    else:
-                        line_chars.append(' ')
+                    cells.append(('.', Colors.DIM, CellGrid.EMPTY) if random.random() < 0.03 else blank)
                 else:
                     # Far floor
-                    if random.random() < 0.01:
-                        line_chars.append(Colors.DIM + '·' + Colors.END)
-                    else:
-                        line_chars.append(' ')
+                    cells.append(('·', Colors.DIM, CellGrid.EMPTY) if random.random() < 0.01 else blank)
             
             # Right darkness
             for _ in range(cols - side_margin - floor_width):
-                if random.random() < 0.01:
-                    line_chars.append(Colors.DIM + '░' + Colors.END)
+                cells.append(('░', Colors.DIM, CellGrid.EMPTY) if random.random() < 0.01 else blank)
+            
+            grid.add_row(cells)
+        
+        return grid
+
+    def draw_entities(self, grid: CellGrid):
+        """Project entities ahead onto the wall band, nearest first, with a per-column depth buffer"""
+        if not grid.slices:
+            return
+        dx, dy = self.get_direction_vector()
+        # Nothing is visible past the first wall or door straight ahead
+        occluder = next((d for d in range(1, self.VIEW_DISTANCE + 1)
+                         if self.station.get_tile(self.player.x + dx * d, self.player.y + dy * d) in (1, 2)),
+                        self.VIEW_DISTANCE + 1)
+        depth = array('f', [occluder]) * grid.cols
+        top, bottom = grid.slices[0][0], grid.slices[-1][0]
+        for forward, lateral, entity in self.entities.in_view(self.player.x, self.player.y, dx, dy, self.VIEW_DISTANCE):
+            if forward >= occluder:
+                break
+            row, _, wall_width, center_gap, perspective = min(grid.slices, key=lambda s: abs(s[1] - forward))
+            if lateral == 0:
+                low, high = wall_width, wall_width + center_gap
+            elif lateral > 0:
+                low, high = 0, wall_width
+            else:
+                low, high = wall_width + center_gap, grid.cols
+            width = min(high - low, max(1, round(6 * perspective)))
+            height = max(1, round(3 * perspective))
+            first_row = max(top, row - height // 2)
+            rows = range(first_row, min(bottom, first_row + height - 1) + 1)
+            glyph, color, _ = EntityWorld.KINDS[entity.kind]
+            style = getattr(Colors, color)
+            for x in range(low + (high - low - width) // 2, low + (high - low - width) // 2 + width):
+                # Nearer sprites were drawn first and claimed their columns
+                if forward < depth[x]:
+                    depth[x] = forward
+                    for y in rows:
+                        grid.chars[y][x] = glyph
+                        grid.styles[y][x] = style
+                        grid.kinds[y][x] = CellGrid.ENTITY
+
+    @staticmethod
+    def side_wall_cells(tile: int, wall_width: int, brightness: float, wall_style: str,
+                        mirrored: bool) -> List[Tuple[str, str, int]]:
+        """One row of the left or right wall, shaded from the screen edge inwards"""
+        cells = []
+        for w in range(wall_width):
+            # Create depth gradient from edge to center
+            depth_factor = (wall_width - w) / wall_width if mirrored else w / wall_width
+            
+            if tile != 1:
+                # Empty space - show darkness gradient
+                if depth_factor > 0.7 and random.random() < 0.02:
+                    cells.append(('░', Colors.DIM, CellGrid.EMPTY))
+                else:
+                    cells.append((' ', '', CellGrid.EMPTY))
+                continue
+            
+            if brightness > 0.7:
+                if depth_factor < 0.3:
+                    wall_char = '█'
+                elif depth_factor < 0.6:
+                    wall_char = '▓'
+                else:
+                    wall_char = '▒'
+            elif brightness > 0.4:
+                if depth_factor < 0.5:
+                    wall_char = '▓'
                 else:
-                    line_chars.append(' ')
+                    wall_char = '▒'
+            elif brightness > 0.2:
+                wall_char = '▒'
+            else:
+                wall_char = '░'
             
-            # Corruption at edges
-            if self.player.sanity < 50 and random.random() < 0.05:
-                if len(line_chars) > 0:
-                    line_chars[0] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
-                if len(line_chars) > 1:
-                    line_chars[-1] = Colors.RED + random.choice(self.corruption_chars) + Colors.END
+            # Add structural details
+            if random.random() < 0.08 and depth_factor > 0.4:
+                wall_char = random.choice(['|', ':', '║'])
             
-            output_lines.append(''.join(line_chars))
-        
-        # Print all lines
-        for line in output_lines:
-            print(line)
+            cells.append((wall_char, wall_style, CellGrid.WALL))
+        return cells
+
+    @staticmethod
+    def center_cells(tile: int, center_gap: int, dist: int, perspective_factor: float,
+                     brightness: float, row: int, wall_style: str) -> List[Tuple[str, str, int]]:
+        """One row of whatever lies straight ahead"""
+        wall, feature, blank = CellGrid.WALL, CellGrid.FEATURE, (' ', '', CellGrid.EMPTY)
+        cells = []
         
-        # Status bar with retro terminal aesthetic
-        print(Colors.GREEN + "─" * cols + Colors.END)
+        if tile == 1:  # Wall ahead - render with texture
+            for c in range(center_gap):
+                # Add depth and texture
+                if brightness > 0.8:
+                    # Close wall - high detail
+                    if (c + row) % 4 == 0:
+                        fill_char = '#'
+                    elif random.random() < 0.15:
+                        fill_char = random.choice(['#', '▓', '|', '-'])
+                    else:
+                        fill_char = '█'
+                elif brightness > 0.5:
+                    fill_char = '▓' if random.random() < 0.7 else '#'
+                elif brightness > 0.3:
+                    fill_char = '▒'
+                else:
+                    fill_char = '░'
+                cells.append((fill_char, wall_style, wall))
         
-        current_tile = self.station.get_tile(self.player.x, self.player.y)
-        location_text = ""
-        location_hint = ""
+        elif tile == 2:  # Door - render with perspective
+            door_width = int(center_gap * perspective_factor * 0.5)
+            door_width = max(4, min(door_width, center_gap - 4))
+            side_space = (center_gap - door_width) // 2
+            
+            # Left wall section
+            cells += [('#', wall_style, wall)] * side_space
+            
+            # Door itself
+            if dist <= 2:
+                # Close door - show detail
+                cells.append(('╔', Colors.CYAN + Colors.BOLD, feature))
+                for d in range(door_width - 2):
+                    # Handle
+                    cells.append(('█' if d == door_width // 2 else '║', Colors.CYAN, feature))
+                cells.append(('╗', Colors.CYAN + Colors.BOLD, feature))
+            else:
+                # Medium or far distance
+                cells += [('▓' if dist <= 4 else '▒', Colors.CYAN, feature)] * door_width
+            
+            # Right wall section
+            cells += [('#', wall_style, wall)] * (center_gap - side_space - door_width)
         
-        if current_tile == 3:
-            location_text = f"{Colors.GREEN}{Colors.BOLD}[TERMINAL]{Colors.END}"
-            location_hint = f"{Colors.GREEN}Press Q to access terminal interface{Colors.END}"
-        elif current_tile == 4:
-            location_text = f"{Colors.RED}{Colors.BOLD}[GENERATOR]{Colors.END}"
-            location_hint = f"{Colors.YELLOW}Power hums through the machinery{Colors.END}"
-        elif current_tile == 5:
-            location_text = f"{Colors.MAGENTA}{Colors.BOLD}[STORAGE]{Colors.END}"
-            location_hint = f"{Colors.CYAN}Supplies stored here{Colors.END}"
-        else:
-            location_text = f"{Colors.WHITE}[CORRIDOR]{Colors.END}"
-            location_hint = ""
+        elif tile in (3, 4, 5) and dist > 4:
+            # Terminal, generator or storage too far away to make out
+            style = {3: Colors.GREEN, 4: Colors.RED, 5: Colors.MAGENTA}[tile]
+            cells += [('░', style, feature)] * center_gap
         
-        status = f"{Colors.GREEN}> {location_text} {Colors.DIM}│{Colors.END} "
-        status += f"{Colors.GREEN}POS:{Colors.END}{self.player.x:02d},{self.player.y:02d} {Colors.DIM}│{Colors.END} "
-        status += f"{Colors.GREEN}DIR:{Colors.END}{self.player.direction.name[0]} {Colors.DIM}│{Colors.END} "
-        status += f"{Colors.GREEN}O2:{Colors.END}{self.resources.oxygen}%"
+        elif tile == 3:  # Terminal
+            term_width = int(center_gap * perspective_factor * 0.4)
+            term_width = max(6, min(term_width, center_gap - 4))
+            side_space = (center_gap - term_width) // 2
+            cells += [blank] * side_space
+            
+            # Terminal display
+            if dist <= 2:
+                cells.append(('[', Colors.GREEN + Colors.BOLD, feature))
+                for t in range(term_width - 2):
+                    if t % 3 == 0:
+                        cells.append(('T', Colors.GREEN + Colors.BOLD, feature))
+                    else:
+                        cells.append(('▓', Colors.GREEN, feature))
+                cells.append((']', Colors.GREEN + Colors.BOLD, feature))
+            else:
+                cells += [('▓', Colors.GREEN, feature)] * term_width
+            
+            cells += [blank] * (center_gap - side_space - term_width)
         
-        print(status)
+        elif tile == 4:  # Generator - with glowing effect
+            gen_width = int(center_gap * perspective_factor * 0.5)
+            gen_width = max(8, min(gen_width, center_gap - 4))
+            side_space = (center_gap - gen_width) // 2
+            cells += [blank] * side_space
+            
+            # Generator core
+            if dist <= 2:
+                cells.append(('◄', Colors.RED + Colors.BOLD, feature))
+                for _ in range(gen_width - 2):
+                    glow = random.choice(['█', '▓', '▒']) if random.random() < 0.4 else '▓'
+                    cells.append((glow, Colors.RED, feature))
+                cells.append(('►', Colors.RED + Colors.BOLD, feature))
+            else:
+                cells += [('▓', Colors.RED, feature)] * gen_width
+            
+            cells += [blank] * (center_gap - side_space - gen_width)
         
-        if location_hint:
-            print(location_hint)
+        elif tile == 5:  # Storage
+            stor_width = int(center_gap * perspective_factor * 0.4)
+            stor_width = max(6, min(stor_width, center_gap - 4))
+            side_space = (center_gap - stor_width) // 2
+            cells += [blank] * side_space
+            for _ in range(stor_width):
+                cells.append((random.choice(['▓', '▒', '█']), Colors.MAGENTA, feature))
+            cells += [blank] * (center_gap - side_space - stor_width)
         
-        # Sanity effects
-        if self.player.sanity < 40 and random.random() < 0.2:
-            messages = [
-                f"{Colors.RED}...{random.choice(self.corruption_chars)}...something moved...{Colors.END}",
-                f"{Colors.RED}...the walls breathe...{Colors.END}",
-                f"{Colors.RED}...{random.choice(self.corruption_chars)}...you hear whispers...{Colors.END}",
-                f"{Colors.RED}...you are not alone...{random.choice(self.corruption_chars)}{Colors.END}"
-            ]
-            print(f"\n{random.choice(messages)}")
+        else:
+            # Empty corridor
+            cells += [blank] * center_gap
         
-        print(f"\n{Colors.DIM}[W]FWD [S]BACK [A]LEFT [D]RIGHT [M]MAP [Q]TERM{Colors.END}")
+        return cells
 
     def get_direction_vector(self) -> Tuple[int, int]:
         vectors = {
@@ -984,14 +3969,20 @@ class Game:
         if self.station.is_walkable(new_x, new_y):
             self.player.x = new_x
             self.player.y = new_y
-            self.resources.oxygen -= 1
-            
-            # Random sounds while exploring
-            if self.player.sanity < 60 and random.random() < 0.1:
-                self.trigger_sound_log()
+            self.advance_time(2, 'moving')
+            self.pick_up_items()
         else:
             print(f"\n{Colors.RED}> You can't move that way!{Colors.END}")
-            time.sleep(0.5)
+            self.pause(0.5)
+
+    def pick_up_items(self):
+        supplies = {'water_filters': "water filter", 'food_cartridges': "food cartridge", 'repair_parts': "repair part"}
+        for item in [e for e in self.entities.index.near(self.player.x, self.player.y, 0) if e.kind == 'item']:
+            self.entities.despawn(item)
+            supply = random.choice(list(supplies))
+            setattr(self.resources, supply, getattr(self.resources, supply) + 1)
+            print(f"\n{Colors.YELLOW}> Picked up a dropped {supplies[supply]}.{Colors.END}")
+            self.pause(0.5)
 
     def turn_player(self, clockwise: bool = True):
         direction_order = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
@@ -1008,7 +3999,12 @@ class Game:
         while self.player.current_mode == GameMode.EXPLORATION:
             self.render_exploration()
             
-            cmd = input(f"\n{Colors.CYAN}>{Colors.END} ").strip().lower()
+            try:
+                cmd = self.read_input(f"\n{Colors.CYAN}>{Colors.END} ").strip().lower()
+            except EOFError:
+                # A script ended mid-walk; drop back to the terminal prompt
+                self.player.current_mode = GameMode.TERMINAL
+                return
             
             if cmd == 'w':
                 self.move_player(forward=True)
@@ -1020,67 +4016,143 @@ class Game:
                 self.turn_player(clockwise=True)
             elif cmd == 'm':
                 self.map_command()
-                input(f"\n{Colors.DIM}Press Enter to continue...{Colors.END}")
+                self.wait_for_enter()
             elif cmd == 'q':
                 # Check if at terminal
                 current_tile = self.station.get_tile(self.player.x, self.player.y)
                 if current_tile == 3:
                     self.player.current_mode = GameMode.TERMINAL
                     print(f"\n{Colors.GREEN}[ACCESSING TERMINAL INTERFACE]{Colors.END}")
-                    time.sleep(0.8)
+                    self.pause(0.8)
                     return
                 else:
                     print(f"\n{Colors.RED}> No terminal access from this location. Find a Terminal (T) first.{Colors.END}")
-                    time.sleep(1)
+                    self.pause(1)
             elif cmd == 'help':
                 print(f"\n{Colors.YELLOW}W=Forward, S=Backward, A=Turn Left, D=Turn Right, M=Map, Q=Terminal{Colors.END}")
-                input(f"\n{Colors.DIM}Press Enter to continue...{Colors.END}")
+                self.wait_for_enter()
             else:
                 print(f"\n{Colors.RED}> Invalid command. Use 'help' for controls.{Colors.END}")
-                time.sleep(0.5)
+                self.pause(0.5)
 
     def help_command(self):
         self.print_box_header("AVAILABLE COMMANDS")
         
-        print(f"\n{Colors.BOLD}{Colors.CYAN}Terminal Operations:{Colors.END}")
-        print(f"  {Colors.YELLOW}scan{Colors.END}          - Scan for signals")
-        print(f"  {Colors.YELLOW}analyze <n>{Colors.END}   - Analyze signal at index n")
-        print(f"  {Colors.YELLOW}decode{Colors.END}        - Decode current signal")
-        print(f"  {Colors.YELLOW}submit{Colors.END}        - Submit decoded signal for credits")
-        print(f"  {Colors.YELLOW}status{Colors.END}        - Show detailed status")
-        print(f"  {Colors.YELLOW}clear{Colors.END}         - Clear terminal history")
-        
-        print(f"\n{Colors.BOLD}{Colors.CYAN}Station Management:{Colors.END}")
-        print(f"  {Colors.YELLOW}repair <sys>{Colors.END}  - Repair system (power/oxygen)")
-        print(f"  {Colors.YELLOW}rest{Colors.END}          - Rest to restore sanity")
-        print(f"  {Colors.YELLOW}inventory{Colors.END}     - Show inventory and supplies")
-        
-        print(f"\n{Colors.BOLD}{Colors.CYAN}Navigation:{Colors.END}")
-        print(f"  {Colors.YELLOW}explore{Colors.END}       - Enter exploration mode")
-        print(f"  {Colors.YELLOW}map{Colors.END}           - Show station map")
-        
-        print(f"\n{Colors.BOLD}{Colors.CYAN}System:{Colors.END}")
-        print(f"  {Colors.YELLOW}help{Colors.END}          - Show this help")
-        print(f"  {Colors.YELLOW}exit/quit{Colors.END}     - Exit the game")
+        section = None
+        for spec in self.command_specs:
+            if spec.section != section:
+                section = spec.section
+                print(f"\n{Colors.BOLD}{Colors.CYAN}{section}:{Colors.END}")
+            usage = TextLayout.pad(spec.usage(), 22)
+            print(f"  {Colors.YELLOW}{usage}{Colors.END} - {spec.summary}")
+        
+        print(f"\n{Colors.DIM}Commands may be abbreviated to any unique prefix. Press Tab to complete.{Colors.END}")
     
+    def effects_command(self, name: Optional[str] = None, state: Optional[str] = None):
+        """List exploration screen effects, or switch one on or off"""
+        if name is None:
+            print(f"\n{Colors.BOLD}{Colors.CYAN}Screen Effects (applied in order):{Colors.END}")
+            for effect in self.effects.effects.values():
+                status = f"{Colors.GREEN}on {Colors.END}" if effect.enabled else f"{Colors.RED}off{Colors.END}"
+                if effect.runs:
+                    cost = f"{effect.cost_ms:.2f} ms avg of {effect.budget_ms:.1f} ms budget, {effect.skipped} frame(s) skipped"
+                else:
+                    cost = f"not run yet, {effect.budget_ms:.1f} ms budget"
+                print(f"  {Colors.YELLOW}{effect.name:<11}{Colors.END}{status} {Colors.DIM}│ {cost}{Colors.END}")
+            return
+        effect = self.effects.effects[name]
+        effect.enabled = state == 'on' if state else not effect.enabled
+        print(f"{Colors.GREEN}✓ {effect.name} {'on' if effect.enabled else 'off'}{Colors.END}")
+
+    def history_command(self, pattern: Optional[List[str]] = None):
+        """Page through captured output, or list the lines matching a regex"""
+        history = self.terminal_history
+        if not len(history):
+            print(f"{Colors.DIM}No terminal history yet.{Colors.END}")
+            return
+        if not pattern:
+            self.page_history()
+            return
+        try:
+            regex = re.compile(' '.join(pattern), re.MULTILINE)
+        except re.error as e:
+            print(f"{Colors.RED}Bad pattern: {e}{Colors.END}")
+            return
+        hits = history.search(regex)
+        shown = hits[-self.HISTORY_MATCHES:]
+        history.suspended += 1
+        try:
+            for i in shown:
+                print(f"{Colors.DIM}{i + 1:>6}{Colors.END} {self.highlight(history, i, regex)}")
+        finally:
+            history.suspended -= 1
+        more = f", showing the last {len(shown)}" if len(shown) < len(hits) else ""
+        print(f"{Colors.DIM}{len(hits)} matching line(s) of {len(history)}{more}.{Colors.END}")
+
+    @staticmethod
+    def highlight(history: Scrollback, index: int, regex: Optional[re.Pattern]) -> str:
+        """A history line in its original colors, or in reverse video where it matches"""
+        text = history.texts[history.slot(index)]
+        if regex is None or not regex.search(text):
+            return history.render(index) + Colors.END
+        return regex.sub(lambda m: f"{Colors.INVERT}{m.group()}{Colors.END}", text)
+
+    def page_history(self):
+        """Interactive pager: Enter for older, f for newer, /regex to search back, n for the next match"""
+        history = self.terminal_history
+        _, lines = self.get_terminal_size()
+        height = max(5, lines - 3)
+        top = max(0, len(history) - height)
+        regex = None
+        history.suspended += 1
+        try:
+            while True:
+                bottom = min(top + height, len(history))
+                for i in range(top, bottom):
+                    print(f"{Colors.DIM}{i + 1:>6}{Colors.END} {self.highlight(history, i, regex)}")
+                print(f"{Colors.DIM}-- lines {top + 1}-{bottom} of {len(history)} -- "
+                      f"[Enter] older  [f] newer  [/regex] search  [n] next  [q] quit{Colors.END}")
+                try:
+                    key = self.read_input(":").strip()
+                except EOFError:
+                    break
+                if key == 'q':
+                    break
+                if key == 'f':
+                    top = min(top + height, max(0, len(history) - height))
+                elif key.startswith('/') or key == 'n':
+                    if key.startswith('/'):
+                        try:
+                            regex = re.compile(key[1:], re.MULTILINE)
+                        except re.error as e:
+                            print(f"{Colors.RED}Bad pattern: {e}{Colors.END}")
+                            continue
+                    if regex is None:
+                        continue
+                    hits = history.search(regex)
+                    earlier = bisect_left(hits, top) - 1
+                    if earlier < 0:
+                        print(f"{Colors.YELLOW}No earlier match.{Colors.END}")
+                    else:
+                        top = hits[earlier]
+                else:
+                    top = max(0, top - height)
+        finally:
+            history.suspended -= 1
+
     def clear_command(self):
         """Clear terminal history"""
-        self.terminal_history = []
+        self.terminal_history.clear()
         self.clear_screen()
         print(f"{Colors.GREEN}Terminal history cleared.{Colors.END}\n")
     
-    def repair_command(self, args: List[str]):
+    def repair_command(self, system: Optional[str] = None):
         """Repair station systems"""
-        if not args:
+        if system is None:
             print(f"{Colors.YELLOW}Usage: repair <power|oxygen>{Colors.END}")
             print(f"{Colors.DIM}Repair parts available: {self.resources.repair_parts}{Colors.END}")
             return
         
-        system = args[0].lower()
-        if system not in ['power', 'oxygen']:
-            print(f"{Colors.RED}Invalid system. Use: power or oxygen{Colors.END}")
-            return
-        
         if self.resources.repair_parts < 1:
             print(f"{Colors.RED}Not enough repair parts!{Colors.END}")
             return
@@ -1092,13 +4164,13 @@ class Game:
             self.resources.power = min(100, self.resources.power + 30)
             print(f"\n{Colors.CYAN}[REPAIRING POWER SYSTEM]{Colors.END}")
             self.animate_loading("Repairing", 1.5)
-            print(f"{Colors.GREEN}✓ Power restored: {old_power}% → {self.resources.power}%{Colors.END}")
+            print(f"{Colors.GREEN}✓ Power restored: {old_power:.0f}% → {self.resources.power:.0f}%{Colors.END}")
         else:
             old_oxygen = self.resources.oxygen
             self.resources.oxygen = min(100, self.resources.oxygen + 30)
             print(f"\n{Colors.CYAN}[REPAIRING OXYGEN SYSTEM]{Colors.END}")
             self.animate_loading("Repairing", 1.5)
-            print(f"{Colors.GREEN}✓ Oxygen restored: {old_oxygen}% → {self.resources.oxygen}%{Colors.END}")
+            print(f"{Colors.GREEN}✓ Oxygen restored: {old_oxygen:.0f}% → {self.resources.oxygen:.0f}%{Colors.END}")
     
     def rest_command(self):
         """Rest to restore sanity"""
@@ -1118,9 +4190,21 @@ class Game:
         print(f"{Colors.GREEN}✓ You feel more stable{Colors.END}")
         print(f"{Colors.BLUE}Sanity restored: {old_sanity}% → {self.player.sanity}%{Colors.END}")
         
-        self.day += 1
-        self.resources.power = max(0, self.resources.power - 5)
-        self.resources.oxygen = max(0, self.resources.oxygen - 5)
+        # Station systems keep running (and failing) while you sleep
+        self.advance_time(self.REST_MINUTES, 'resting')
+    
+    def wait_command(self, hours: float):
+        """Let station time pass without doing anything"""
+        if not math.isfinite(hours) or hours <= 0:
+            print(f"{Colors.RED}Duration must be a positive number of hours.{Colors.END}")
+            return
+        if hours > self.MAX_WAIT_HOURS:
+            print(f"{Colors.RED}You can wait at most {self.MAX_WAIT_HOURS} hours at a time.{Colors.END}")
+            return
+        
+        print(f"\n{Colors.CYAN}[WAITING {hours:g} HOURS]{Colors.END}")
+        self.advance_time(hours * 60)
+        print(f"{Colors.BLUE}Station time:{Colors.END} Day {self.day} {self.station_clock()}")
     
     def inventory_command(self):
         """Show detailed inventory"""
@@ -1138,90 +4222,397 @@ class Game:
         print(f"  {Colors.BLUE}Signals Discovered:{Colors.END} {self.discovered_signals}")
         print(f"  {Colors.BLUE}Days Survived:{Colors.END} {self.day}")
     
+    def map_rows(self) -> List[List[str]]:
+        """Colored station tiles, rendered once per color mode"""
+        if self._map_rows_mode != Colors.MODE:
+            colors = {1: Colors.GRAY, 2: Colors.CYAN, 3: Colors.GREEN, 4: Colors.RED, 5: Colors.MAGENTA}
+            self._map_rows_mode = Colors.MODE
+            self._map_rows = [[colors.get(tile, Colors.DIM) + self.station.tiles[tile] + Colors.END for tile in row]
+                              for row in self.station.layout]
+        return self._map_rows
+
     def map_command(self):
         """Display station map"""
         self.print_box_header("STATION MAP")
         
-        print(f"\n{Colors.DIM}Legend: @ = You, # = Wall, . = Floor, D = Door, T = Terminal, G = Generator, S = Storage{Colors.END}\n")
+        print(f"\n{Colors.DIM}Legend: @ = You, # = Wall, . = Floor, D = Door, T = Terminal, G = Generator, S = Storage, ¤ = Drone, * = Item{Colors.END}\n")
         
-        for y, row in enumerate(self.station.layout):
-            line = ""
-            for x, tile in enumerate(row):
-                if x == self.player.x and y == self.player.y:
-                    line += Colors.YELLOW + "@" + Colors.END
-                else:
-                    tile_char = self.station.tiles[tile]
-                    if tile == 1:
-                        line += Colors.GRAY + tile_char + Colors.END
-                    elif tile == 2:
-                        line += Colors.CYAN + tile_char + Colors.END
-                    elif tile == 3:
-                        line += Colors.GREEN + tile_char + Colors.END
-                    elif tile == 4:
-                        line += Colors.RED + tile_char + Colors.END
-                    elif tile == 5:
-                        line += Colors.MAGENTA + tile_char + Colors.END
-                    else:
-                        line += Colors.DIM + tile_char + Colors.END
-            print("  " + line)
+        # Drones and dropped items show up on the station sensors; anomalies never do
+        markers = {(e.x, e.y): getattr(Colors, EntityWorld.KINDS[e.kind][1]) + EntityWorld.KINDS[e.kind][0] + Colors.END
+                   for bucket in self.entities.index.buckets.values() for e in bucket if e.kind != 'anomaly'}
+        markers[(self.player.x, self.player.y)] = Colors.YELLOW + "@" + Colors.END
+        
+        # Only rows with something on them are copied; the rest print straight from the cache
+        marked = {y for _, y in markers}
+        for y, cells in enumerate(self.map_rows()):
+            if y in marked:
+                cells = [markers.get((x, y), cell) for x, cell in enumerate(cells)]
+            print("  " + ''.join(cells))
         
         print(f"\n{Colors.BLUE}Position:{Colors.END} ({self.player.x}, {self.player.y})")
 
+    @cached_property
+    def command_specs(self) -> List[CommandSpec]:
+        """The command table, built once on the first command"""
+        return [
+            CommandSpec('scan', self.scan_command, "Scan for signals, optionally from a WAV directory", "Terminal Operations",
+                        params=(CommandParam('dir', optional=True),), terminal_only=True, minutes=20, activity='terminal'),
+            CommandSpec('analyze', self.analyze_command, "Analyze signal n, the 'best' indexed, or best in 'band <lo> <hi>'", "Terminal Operations",
+                        params=(CommandParam('target'), CommandParam('bounds', float, optional=True, variadic=True)), terminal_only=True, minutes=15, activity='terminal'),
+            CommandSpec('decode', self.decode_command, "Decode current signal, or 'all' pending", "Terminal Operations",
+                        params=(CommandParam('target', optional=True, choices=('all',)),),
+                        terminal_only=True, minutes=30, activity='terminal'),
+            CommandSpec('submit', self.submit_command, "Submit decoded signal, or 'all' decoded, for credits", "Terminal Operations",
+                        params=(CommandParam('target', optional=True, choices=('all',)),),
+                        terminal_only=True, minutes=10),
+            CommandSpec('filter', self.filter_command, "Configure filters (add/list/remove/clear)", "Terminal Operations",
+                        params=(CommandParam('action', optional=True, choices=('add', 'list', 'remove', 'clear')),
+                                CommandParam('params', optional=True, variadic=True)),
+                        terminal_only=True, minutes=2),
+            CommandSpec('waterfall', self.waterfall_command, "Scrolling spectrogram of the band", "Terminal Operations",
+                        params=(CommandParam('rows', int, optional=True),), terminal_only=True, minutes=5, activity='terminal'),
+            CommandSpec('status', self.status_command, "Show detailed status", "Terminal Operations",
+                        terminal_only=True, minutes=2),
+            CommandSpec('clear', self.clear_command, "Clear terminal history", "Terminal Operations"),
+            CommandSpec('history', self.history_command, "Page through output, or search it by regex", "Terminal Operations",
+                        params=(CommandParam('pattern', optional=True, variadic=True),)),
+            CommandSpec('repair', self.repair_command, "Repair system", "Station Management",
+                        params=(CommandParam('system', optional=True, choices=('power', 'oxygen')),),
+                        terminal_only=True, minutes=45),
+            CommandSpec('rest', self.rest_command, "Rest to restore sanity", "Station Management",
+                        terminal_only=True),
+            CommandSpec('wait', self.wait_command, "Let station time pass", "Station Management",
+                        params=(CommandParam('hours', float),), terminal_only=True),
+            CommandSpec('inventory', self.inventory_command, "Show inventory and supplies", "Station Management",
+                        terminal_only=True, minutes=2),
+            CommandSpec('explore', self.explore_command, "Enter exploration mode", "Navigation"),
+            CommandSpec('effects', self.effects_command, "List or toggle exploration screen effects", "Navigation",
+                        params=(CommandParam('name', optional=True, choices=tuple(self.effects.effects)),
+                                CommandParam('state', optional=True, choices=('on', 'off')))),
+            CommandSpec('map', self.map_command, "Show station map", "Navigation"),
+            CommandSpec('rewind', self.rewind_command, "Undo the last n state-changing commands (default 1)", "System",
+                        params=(CommandParam('n', int, optional=True),), aliases=('undo',), recorded=False),
+            CommandSpec('records', self.records_command, "Best runs, survival by seed, or credits-per-day trend", "System",
+                        params=(CommandParam('view', optional=True, choices=('best', 'seeds', 'trend')),
+                                CommandParam('seed', int, optional=True)), recorded=False),
+            CommandSpec('run', self.run_command, "Run commands from a script file", "System",
+                        params=(CommandParam('file'),)),
+            CommandSpec('help', self.help_command, "Show this help", "System"),
+            CommandSpec('exit', self.exit_command, "Exit the game", "System", aliases=('quit',)),
+        ]
+
+    @cached_property
+    def commands(self) -> Dict[str, CommandSpec]:
+        return {name: spec for spec in self.command_specs for name in (spec.name,) + spec.aliases}
+
+    @cached_property
+    def command_trie(self) -> CommandTrie:
+        trie = CommandTrie()
+        for name in self.commands:
+            trie.insert(name)
+        return trie
+
+    def resolve_command(self, word: str) -> Optional[CommandSpec]:
+        """Look up a command by exact name or unique prefix"""
+        if word in self.commands:
+            return self.commands[word]
+        matches = self.command_trie.complete(word)
+        specs = {self.commands[name].name: self.commands[name] for name in matches}
+        if len(specs) == 1:
+            return next(iter(specs.values()))
+        if specs:
+            print(f"{Colors.YELLOW}Ambiguous command '{word}': {', '.join(sorted(specs))}{Colors.END}")
+        else:
+            print(f"{Colors.RED}Unknown command: {word}. Type 'help' for available commands.{Colors.END}")
+        return None
+
+    def complete(self, text: str, state: int) -> Optional[str]:
+        """Readline completer for command names and fixed argument choices"""
+        import readline  # Already loaded by install_completion
+        buffer = readline.get_line_buffer()[:readline.get_endidx()]
+        words = buffer.split()
+        if not words or (len(words) == 1 and not buffer.endswith(' ')):
+            options = self.command_trie.complete(text)
+        else:
+            spec = self.commands.get(words[0])
+            arg_index = len(words) - 1 if buffer.endswith(' ') else len(words) - 2
+            options = []
+            if spec and arg_index < len(spec.params) and spec.params[arg_index].choices:
+                options = [c for c in spec.params[arg_index].choices if c.startswith(text)]
+        if state < len(options):
+            return options[state] + ' '
+        return None
+
+    def install_completion(self):
+        try:
+            import readline
+        except ImportError:  # Not available on every platform; tab completion is optional
+            return
+        readline.set_completer(self.complete)
+        readline.set_completer_delims(' ')
+        readline.parse_and_bind('tab: complete')
+
+    def read_input(self, prompt: str) -> str:
+        """Read the next line from the active script, or from the operator"""
+        if time.monotonic() - self.metrics_exported >= self.METRICS_INTERVAL:
+            self.export_metrics()
+        if self.script_lines:
+            line = self.script_lines.popleft()
+            print(f"{prompt}{line}")
+            return line
+        if self.script_depth:
+            raise EOFError
+        return self.operator_input(prompt)
+
+    def operator_input(self, prompt: str) -> str:
+        """input() with the prompt and typed reply recorded as one scrollback line"""
+        self.terminal_history.suspended += 1
+        lock = self.metrics_lock
+        if lock:
+            lock.release()
+        try:
+            line = input(prompt)
+        finally:
+            if lock:
+                lock.acquire()
+            self.terminal_history.suspended -= 1
+        self.terminal_history.feed(f"{prompt}{line}\n")
+        return line
+
+    def wait_for_enter(self):
+        if not self.fast_mode:
+            self.operator_input(f"\n{Colors.DIM}Press Enter to continue...{Colors.END}")
+
     def process_command(self, cmd: str):
-        parts = cmd.strip().lower().split()
+        parts = cmd.strip().split()
         if not parts:
             return
         
-        command = parts[0]
-        args = parts[1:]
+        spec = self.resolve_command(parts[0].lower())
+        if spec is None:
+            return
         
         # Check if at terminal for most commands
-        current_tile = self.station.get_tile(self.player.x, self.player.y)
-        terminal_only_commands = ['scan', 'analyze', 'decode', 'submit', 'status', 'repair', 'rest', 'inventory']
-        
-        if command in terminal_only_commands and current_tile != 3:
+        if spec.terminal_only and self.station.get_tile(self.player.x, self.player.y) != 3:
             print(f"\n{Colors.RED}⚠ ERROR: Terminal access required{Colors.END}")
             print(f"{Colors.YELLOW}You must be at a Terminal location to use this command.{Colors.END}")
             print(f"{Colors.DIM}Use 'explore' to navigate to a terminal, or 'map' to see locations.{Colors.END}")
             return
         
-        if command in ['exit', 'quit']:
-            self.running = False
-            print(f"\n{Colors.CYAN}[SHUTTING DOWN SYSTEMS...]{Colors.END}")
-            print(f"{Colors.YELLOW}Stay safe out there, operator.{Colors.END}")
-        elif command == 'scan':
-            self.scan_command()
-        elif command == 'analyze':
-            self.analyze_command(args)
-        elif command == 'decode':
-            self.decode_command()
-        elif command == 'submit':
-            self.submit_command()
-        elif command == 'status':
-            self.status_command()
-        elif command == 'clear':
-            self.clear_command()
-        elif command == 'repair':
-            self.repair_command(args)
-        elif command == 'rest':
-            self.rest_command()
-        elif command == 'inventory':
-            self.inventory_command()
-        elif command == 'map':
-            self.map_command()
-        elif command == 'explore':
-            # Exploration can be accessed from anywhere
-            if self.player.current_mode == GameMode.TERMINAL:
-                print(f"\n{Colors.CYAN}[ENTERING EXPLORATION MODE]{Colors.END}")
-                print(f"{Colors.DIM}Navigate to terminals to access commands{Colors.END}")
-                time.sleep(1)
-                self.player.current_mode = GameMode.EXPLORATION
-                self.render_exploration()
-                self.handle_exploration_input()
-        elif command == 'help':
-            self.help_command()
+        try:
+            args = spec.parse(parts[1:])
+        except CommandError as e:
+            print(f"{Colors.RED}{e}{Colors.END}")
+            print(f"{Colors.YELLOW}Usage: {spec.usage()}{Colors.END}")
+            return
+        
+        started = time.perf_counter()
+        spec.handler(*args)
+        self.metrics.record('listener_command_seconds', time.perf_counter() - started, command=spec.name)
+        self.advance_time(spec.minutes, spec.activity)
+        if spec.recorded:
+            self.rewind.record(self.capture_state())
+
+    def capture_state(self) -> Dict[Tuple[Any, ...], Any]:
+        """Flat snapshot of what rewind restores: player, resources, clock, pending events and signals"""
+        state = {('player', f.name): getattr(self.player, f.name) for f in fields(self.player)}
+        state.update((('resources', f.name), getattr(self.resources, f.name)) for f in fields(self.resources))
+        state[('game', 'game_time')] = self.game_time
+        state[('game', 'discovered_signals')] = self.discovered_signals
+        state[('game', 'current_signal')] = self.current_signal
+        state[('game', 'day_summaries')] = tuple(self.day_summaries)
+        state[('scheduler', 'queue')] = self.scheduler.snapshot()
+        # Only the submission count: later fingerprints are dropped again on restore
+        fingerprints = self.__dict__.get('fingerprints')
+        state[('fingerprints', 'submitted')] = fingerprints.submitted if fingerprints else 0
+        signals = {id(sig): sig for sig in itertools.chain(self.scanned_signals, self.signal_backlog, self.decoded_signals)}
+        if self.current_signal is not None:
+            signals[id(self.current_signal)] = self.current_signal
+        # Lists hold references; the fields decoding mutates are captured per signal
+        state[('signals', 'scanned_signals')] = tuple(self.scanned_signals)
+        state[('signals', 'signal_backlog')] = tuple(self.signal_backlog)
+        state[('signals', 'decoded_signals')] = tuple(self.decoded_signals)
+        for key, sig in signals.items():
+            state[('signal', key)] = (sig, sig.decoded, sig.decoded_content, sig.effective_noise, sig.lines_read)
+        return state
+
+    def restore_state(self, state: Dict[Tuple[Any, ...], Any]):
+        for (group, name), value in state.items():
+            if group == 'player':
+                setattr(self.player, name, value)
+            elif group == 'resources':
+                setattr(self.resources, name, value)
+            elif group == 'game':
+                setattr(self, name, value)
+            elif group == 'signal':
+                sig, sig.decoded, sig.decoded_content, sig.effective_noise, sig.lines_read = value
+        self.scanned_signals = list(state[('signals', 'scanned_signals')])
+        self.decoded_signals = list(state[('signals', 'decoded_signals')])
+        self.signal_backlog.clear()
+        self.signal_backlog.extend(state[('signals', 'signal_backlog')])
+        self.day_summaries = list(self.day_summaries)
+        self.scheduler.restore(state[('scheduler', 'queue')])
+        if 'fingerprints' in self.__dict__:
+            self.fingerprints.truncate(state[('fingerprints', 'submitted')])
+        self.scheduler.now = self.game_time
+
+    def rewind_command(self, steps: Optional[int] = None):
+        steps = 1 if steps is None else steps
+        available = len(self.rewind) - 1
+        if not 1 <= steps <= available:
+            limit = f"at most {available}" if available else "nothing"
+            print(f"{Colors.RED}Cannot rewind {steps} step(s); {limit} recorded.{Colors.END}")
+            return
+        self.restore_state(self.rewind.rewind(steps))
+        print(f"{Colors.GREEN}✓ Rewound {steps} step(s) to day {self.day}, {self.station_clock()}{Colors.END}")
+
+    def collect_metrics(self):
+        """Refresh gauges just before an export"""
+        record = self.metrics.record
+        record('listener_credits', self.player.credits)
+        record('listener_credits_per_day', self.metrics.total('listener_credits_earned_total') / self.day)
+        record('listener_sanity_percent', self.player.sanity)
+        record('listener_resource_percent', self.resources.power, resource='power')
+        record('listener_resource_percent', self.resources.oxygen, resource='oxygen')
+        record('listener_station_day', self.day)
+
+    def start_audio(self, path: str):
+        """Stream station ambience to a WAV file or named pipe for the rest of the session"""
+        audio = AmbientAudio(lambda: (self.resources.power, self.current_signal), seed=random.getrandbits(32))
+        try:
+            audio.open(path)
+        except OSError as e:
+            print(f"{Colors.YELLOW}⚠ Cannot stream audio to {path} ({e.strerror}); running silent.{Colors.END}")
+            return
+        audio.start()
+        self.audio = audio
+
+    def stop_audio(self):
+        if self.audio:
+            self.audio.close()
+            self.audio = None
+
+    def start_metrics(self):
+        """Keep exporting every METRICS_INTERVAL from a daemon thread, even while the prompt sits idle"""
+        import threading
+        self.metrics_lock = threading.Lock()
+        self.metrics_lock.acquire()
+        self.metrics_stop = threading.Event()
+        threading.Thread(target=self.metrics_exporter, name='metrics-export', daemon=True).start()
+
+    def metrics_exporter(self):
+        lock, stop = self.metrics_lock, self.metrics_stop
+        while not stop.wait(self.METRICS_INTERVAL):
+            # Only runs while the main thread is blocked in input(), so game state holds still
+            with lock:
+                if not stop.is_set() and time.monotonic() - self.metrics_exported >= self.METRICS_INTERVAL:
+                    self.export_metrics()
+
+    def stop_metrics(self):
+        if self.metrics_stop:
+            self.metrics_stop.set()
+
+    def export_metrics(self):
+        self.metrics_exported = time.monotonic()
+        if not self.metrics_dir:
+            return
+        try:
+            self.metrics.export(self.metrics_dir)
+        except OSError as e:
+            print(f"{Colors.YELLOW}⚠ Metrics export to {self.metrics_dir} failed ({e.strerror}); disabled.{Colors.END}")
+            self.metrics_dir = None
+
+    def exit_command(self):
+        self.running = False
+        self.outcome = 'quit'
+        print(f"\n{Colors.CYAN}[SHUTTING DOWN SYSTEMS...]{Colors.END}")
+        print(f"{Colors.YELLOW}Stay safe out there, operator.{Colors.END}")
+
+    def record_run(self):
+        """Store this run's outcome and day summaries in the run history"""
+        if self.history is None:
+            return
+        import sqlite3
+        days = self.day_summaries + [(self.day, self.player.credits, self.discovered_signals, self.player.sanity,
+                                      round(self.resources.power, 1), round(self.resources.oxygen, 1))]
+        run = {'seed': self.seed, 'started': self.started, 'ended': time.time(),
+               'days': round((self.game_time - self.SHIFT_START) / self.MINUTES_PER_DAY, 3),
+               'credits': self.player.credits, 'signals': self.discovered_signals, 'cause': self.outcome}
+        try:
+            self.history.record(run, days)
+        except (sqlite3.Error, OSError) as e:
+            print(f"{Colors.YELLOW}⚠ Could not save this run to {self.history.path} ({e}).{Colors.END}")
+        finally:
+            self.history.close()
+
+    def records_command(self, view: Optional[str] = None, seed: Optional[int] = None):
+        """Aggregate queries over every recorded run"""
+        if self.history is None:
+            print(f"{Colors.DIM}Run history is disabled.{Colors.END}")
+            return
+        import sqlite3
+        try:
+            self.show_records(view or 'best', seed)
+        except (sqlite3.Error, OSError) as e:
+            print(f"{Colors.RED}Cannot read run history {self.history.path}: {e}{Colors.END}")
+
+    def show_records(self, view: str, seed: Optional[int]):
+        history = self.history
+        print(f"\n{Colors.BOLD}{Colors.CYAN}Run History{Colors.END} {Colors.DIM}│ {history.count()} run(s) in "
+              f"{history.path}; this run is seed {self.seed}{Colors.END}")
+        if view == 'best':
+            print(f"\n  {Colors.BLUE}{'Credits':>8} {'Days':>7} {'Signals':>8} {'Seed':>11}  Ended by{Colors.END}")
+            for credits, days, signals, run_seed, cause, _ in history.best():
+                print(f"  {Colors.YELLOW}{credits:>8}{Colors.END} {days:>7.2f} {signals:>8} {run_seed:>11}  {cause}")
+        elif view == 'seeds':
+            print(f"\n  {Colors.BLUE}{'Seed':>11} {'Runs':>6} {'Avg days':>9} {'Best':>7}{Colors.END}")
+            for run_seed, runs, average, best in history.seeds(seed=seed):
+                if runs:
+                    print(f"  {run_seed:>11} {runs:>6} {Colors.YELLOW}{average:>9.2f}{Colors.END} {best:>7.2f}")
         else:
-            print(f"{Colors.RED}Unknown command: {command}. Type 'help' for available commands.{Colors.END}")
+            rows = history.trend()
+            peak = max((average for _, _, average in rows), default=0) or 1
+            print(f"\n  {Colors.BLUE}{'Day':>4} {'Runs':>7} {'Avg credits':>12}{Colors.END}")
+            for day, runs, average in rows:
+                bar = '█' * round(20 * average / peak)
+                print(f"  {day:>4} {runs:>7} {average:>12.0f} {Colors.GREEN}{bar}{Colors.END}")
+
+    def load_script(self, path: str) -> Optional[List[str]]:
+        """Read a command script, skipping blank lines and # comments"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                lines = [line.strip() for line in f]
+        except OSError as e:
+            print(f"{Colors.RED}Cannot read script {path}: {e.strerror}{Colors.END}")
+            return None
+        return [line for line in lines if line and not line.startswith('#')]
+
+    def run_command(self, path: str):
+        """Execute a command script at full speed"""
+        if self.script_depth >= self.MAX_SCRIPT_DEPTH:
+            print(f"{Colors.RED}Script nesting too deep. Refusing to run {path}.{Colors.END}")
+            return
+        lines = self.load_script(path)
+        if lines is not None:
+            self.execute_script(lines)
+
+    def execute_script(self, lines: List[str]):
+        """Run lines as commands with animations and pauses disabled"""
+        previous_fast_mode = self.fast_mode
+        self.fast_mode = True
+        self.script_depth += 1
+        # Nested scripts run before whatever is left of the outer one
+        self.script_lines.extendleft(reversed(lines))
+        try:
+            while self.running and self.script_lines:
+                line = self.script_lines.popleft()
+                print(f"{Colors.CYAN}>{Colors.END} {line}")
+                self.process_command(line)
+                if self.check_game_over():
+                    self.running = False
+        finally:
+            self.script_depth -= 1
+            self.fast_mode = previous_fast_mode
 
     def show_title_screen(self):
         """Display ASCII art title screen"""
@@ -1250,10 +4641,34 @@ class Game:
         print(f"{Colors.GRAY}Strange things are happening. The signals... they're changing you.{Colors.END}")
         print(f"\n{Colors.YELLOW}Type 'help' for available commands.{Colors.END}")
         print(f"\n{Colors.RED}{Colors.DIM}⚠ Warning: Contains flashing text effects and bell sounds{Colors.END}")
+        startup_mark("title screen")
+        if self.startup_profile:
+            print(startup_report(), file=sys.stderr)
         input(f"\n{Colors.GREEN}Press Enter to begin...{Colors.END}")
 
+    def check_game_over(self) -> bool:
+        """Print the ending and return True if the operator can't go on"""
+        if self.player.sanity <= 0:
+            self.outcome = 'sanity'
+            print(f"\n{Colors.RED}{Colors.BOLD}[YOUR MIND SHATTERS]{Colors.END}")
+            print(f"\n{Colors.MAGENTA}The voices win. You are one with the void now.{Colors.END}")
+        elif self.resources.oxygen <= 0:
+            self.outcome = 'oxygen'
+            print(f"\n{Colors.RED}{Colors.BOLD}[OXYGEN DEPLETED]{Colors.END}")
+            print(f"\n{Colors.GRAY}You gasp for air that isn't there...{Colors.END}")
+        elif self.resources.power <= 0:
+            self.outcome = 'power'
+            print(f"\n{Colors.RED}{Colors.BOLD}[TOTAL POWER FAILURE]{Colors.END}")
+            print(f"\n{Colors.GRAY}The lights go out. Something moves in the darkness.{Colors.END}")
+        else:
+            return False
+        print(f"\n{Colors.RED}{'═' * 25} GAME OVER {'═' * 25}{Colors.END}")
+        print("\a\a\a")
+        return True
+
     def run(self):
         self.show_title_screen()
+        self.install_completion()
         
         while self.running:
             # Don't clear screen - let it scroll like Linux terminal
@@ -1261,41 +4676,109 @@ class Game:
             self.print_status()
             
             # Check game over conditions
-            if self.player.sanity <= 0:
-                print(f"\n{Colors.RED}{Colors.BOLD}[YOUR MIND SHATTERS]{Colors.END}")
-                print(f"\n{Colors.MAGENTA}The voices win. You are one with the void now.{Colors.END}")
-                print(f"\n{Colors.RED}{'═' * 25} GAME OVER {'═' * 25}{Colors.END}")
-                print("\a\a\a")
-                break
-            
-            if self.resources.oxygen <= 0:
-                print(f"\n{Colors.RED}{Colors.BOLD}[OXYGEN DEPLETED]{Colors.END}")
-                print(f"\n{Colors.GRAY}You gasp for air that isn't there...{Colors.END}")
-                print(f"\n{Colors.RED}{'═' * 25} GAME OVER {'═' * 25}{Colors.END}")
-                print("\a\a\a")
-                break
-            
-            if self.resources.power <= 0:
-                print(f"\n{Colors.RED}{Colors.BOLD}[TOTAL POWER FAILURE]{Colors.END}")
-                print(f"\n{Colors.GRAY}The lights go out. Something moves in the darkness.{Colors.END}")
-                print(f"\n{Colors.RED}{'═' * 25} GAME OVER {'═' * 25}{Colors.END}")
-                print("\a\a\a")
+            if self.check_game_over():
                 break
             
             print(f"\n{Colors.GREEN}TERMINAL READY{Colors.END}")
-            cmd = input(f"{Colors.CYAN}>{Colors.END} ").strip()
+            cmd = self.read_input(f"{Colors.CYAN}>{Colors.END} ").strip()
             
             if cmd:
                 self.process_command(cmd)
-                
-                # Daily resource consumption
-                if random.random() < 0.1:
-                    self.resources.power = max(0, self.resources.power - 1)
-                    self.resources.oxygen = max(0, self.resources.oxygen - 1)
+
+    def run_script(self, path: str) -> int:
+        """Run a script non-interactively and return a process exit code"""
+        lines = self.load_script(path)
+        if lines is None:
+            return 1
+        if not self.check_game_over():
+            self.execute_script(lines)
+        self.fast_mode = True
+        self.print_status()
+        return 0
+
+# (flags, argparse keyword arguments) for every command-line option
+COMMAND_LINE_OPTIONS = [
+    (('--script',), dict(metavar='FILE', default=None,
+                         help="run commands from FILE non-interactively, without animations, then exit")),
+    (('--wav-dir',), dict(metavar='DIR', default=None,
+                          help="scan recorded WAV files in DIR instead of synthetic signals")),
+    (('--corpus-dir',), dict(metavar='DIR', default=None,
+                             help="extend transmissions with DIR/<content type>.txt, one per line")),
+    (('--metrics-dir',), dict(metavar='DIR', default=None,
+                              help="write JSON-lines and Prometheus metrics for this session to DIR")),
+    (('--color',), dict(choices=('auto', 'truecolor', '16', 'mono'), default='auto',
+                        help="color output: detect from the terminal (default), 24-bit, 16-color or none")),
+    (('--rewind-budget',), dict(metavar='KB', type=int, default=Game.REWIND_BUDGET // 1024,
+                                help="memory kept for undo/rewind history (default %(default)s KB)")),
+    (('--audio',), dict(metavar='PATH', default=None,
+                        help="stream station ambience as 8 kHz WAV to PATH, a file or a named pipe")),
+    (('--seed',), dict(type=int, default=None,
+                       help="seed the station's randomness to replay a run")),
+    (('--history-db',), dict(metavar='PATH', default=RunHistory.default_path(),
+                             help="SQLite run history database, kept beside the signal fingerprints "
+                                  "(default %(default)s); 'none' or '' keeps neither")),
+    (('--no-history',), dict(action='store_true', default=False,
+                             help="keep no run history or signal fingerprints on disk")),
+    (('--clock',), dict(metavar='SPEED', default='real',
+                        help="animation and pause timing: real (default), instant, or a speed-up like 10x")),
+    (('--startup-profile',), dict(action='store_true', default=False,
+                                  help="print an import and initialization timing breakdown to stderr")),
+]
+
+def parse_args(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        # Plain launches skip importing argparse entirely
+        from types import SimpleNamespace
+        return SimpleNamespace(**{flags[0].lstrip('-').replace('-', '_'): options['default']
+                                  for flags, options in COMMAND_LINE_OPTIONS})
+    import argparse
+    parser = argparse.ArgumentParser(description="The Listener - A cosmic horror survival game")
+    for flags, options in COMMAND_LINE_OPTIONS:
+        parser.add_argument(*flags, **options)
+    return parser.parse_args(argv)
+
+startup_mark("module definitions")
 
 def main():
+    args = parse_args()
+    seed = args.seed if args.seed is not None else random.getrandbits(32)
+    random.seed(seed)
+    try:
+        clock = Clock.named(args.clock)
+    except ValueError as e:
+        sys.exit(f"the_listener: {e}")
+    Colors.configure(Colors.detect() if args.color == 'auto' else args.color)
+    startup_mark("argument parsing")
     game = Game()
-    game.run()
+    game.startup_profile = args.startup_profile
+    game.seed = seed
+    if not args.no_history and args.history_db not in ('', 'none'):
+        game.history = RunHistory(args.history_db)
+        game.fingerprint_path = os.path.join(os.path.dirname(args.history_db), 'fingerprints.bloom')
+    game.clock = clock
+    if args.wav_dir:
+        game.use_wav_directory(args.wav_dir)
+    game.corpus_dir = args.corpus_dir
+    game.metrics_dir = args.metrics_dir
+    game.rewind.budget = args.rewind_budget * 1024
+    sys.stdout = OutputTee(sys.stdout, game.terminal_history)
+    startup_mark("game init")
+    if args.audio:
+        game.start_audio(args.audio)
+    if game.metrics_dir:
+        game.start_metrics()
+    try:
+        if args.script:
+            sys.exit(game.run_script(args.script))
+        game.run()
+    finally:
+        game.stop_audio()
+        game.stop_metrics()
+        game.export_metrics()
+        game.record_run()
+        if 'fingerprints' in game.__dict__:
+            game.fingerprints.close()
 
 if __name__ == "__main__":
     main()